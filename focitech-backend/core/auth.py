@@ -1,5 +1,6 @@
 from fastapi import Request, HTTPException, Depends, status
-from core.config import supabase
+from core.tokens import TokenVerificationError
+from core.session_cache import resolve_user
 from typing import Annotated
 import logging
 
@@ -36,25 +37,26 @@ async def get_current_user(request: Request):
             detail=f"Malformed Authorization header: {str(e)}",
         )
     
-    # 3. Validation with Supabase Auth Server
+    # 3. Signature, expiry and audience checks (local JWT / JWKS, remote only as fallback)
     try:
-        # This call verifies the JWT signature and expiration
-        response = supabase.auth.get_user(token)
-        
-        if not response or not response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User session is invalid or has expired."
-            )
+        user = await resolve_user(token)
         
         # Log successful admin actions for security audit
         if request.method in ["POST", "PUT", "DELETE"]:
-            logger.info(f"Admin Action: {request.method} by {response.user.email}")
+            logger.info(f"Admin Action: {request.method} by {user.email}")
             
-        return response.user
+        return user
         
+    except HTTPException:
+        raise
+    except TokenVerificationError as e:
+        logger.error(f"Token Verification Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User session is invalid or has expired."
+        )
     except Exception as e:
-        # Specific handling for Supabase Auth errors
+        # Specific handling for Supabase Auth errors (remote fallback)
         error_msg = str(e)
         logger.error(f"Supabase Auth Error: {error_msg}")
         
@@ -0,0 +1,30 @@
+# core/bulk.py
+"""
+Helpers for the bulk admin endpoints (status changes and deletes by id list).
+
+A batch runs as ONE PostgREST request filtered with `id=in.(...)` that
+echoes back only the ids it touched, and the per-id outcome is worked out
+from that echo: ids that came back succeeded, the rest did not exist.
+"""
+from typing import Any, Dict, Iterable, List
+
+from core.repository import Query
+
+
+def unique_ids(ids: Iterable[int]) -> List[int]:
+    """Request order, duplicates dropped."""
+    return list(dict.fromkeys(ids))
+
+
+def bulk_query(query: Query, ids: List[int]) -> Query:
+    """Scope an update/delete to `ids` and only return their ids."""
+    return query.in_("id", ids).returning("id")
+
+
+def bulk_outcome(ids: List[int], rows: Any) -> Dict[str, Any]:
+    done = {row["id"] for row in rows or []}
+    return {
+        "requested": len(ids),
+        "succeeded": [i for i in ids if i in done],
+        "not_found": [i for i in ids if i not in done],
+    }
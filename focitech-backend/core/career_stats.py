@@ -0,0 +1,157 @@
+# core/career_stats.py
+"""
+HR dashboard aggregates for GET /careers/stats.
+
+Counting happens in Postgres: the `career_stats()` RPC (sql/003) reads the
+trigger-maintained `application_rollup` table, so the response costs
+O(departments + statuses + jobs) no matter how many applications exist.
+On top of that the last result is kept in-process for CAREER_STATS_TTL
+seconds and patched as applications come in, so dashboard refreshes are
+usually served without touching the database. Status changes drop the
+snapshot (the previous status is not known without a read).
+
+If the RPC has not been deployed yet, the legacy row scan is used instead.
+"""
+import copy
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from core.repository import db
+
+logger = logging.getLogger("focitech_api")
+
+
+class CareerStatsRollup:
+    """TTL snapshot of the dashboard stats with incremental updates."""
+
+    def __init__(self, ttl: int, top_n: int):
+        self.ttl = ttl
+        self.top_n = top_n
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.source: Optional[str] = None
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._loaded_at > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(self._snapshot)
+
+    def load(self, stats: Dict[str, Any], source: str):
+        with self._lock:
+            self._snapshot = copy.deepcopy(stats)
+            self._loaded_at = time.monotonic()
+            self.source = source
+
+    def record_application(self, job_id: int, job_title: str, department: Optional[str]):
+        """Patch the snapshot for one new `pending` application."""
+        with self._lock:
+            if self._snapshot is None:
+                return
+            snap = self._snapshot
+            snap["total_applications"] += 1
+            by_status = snap["applications_by_status"]
+            by_status["pending"] = by_status.get("pending", 0) + 1
+
+            top = snap["top_performing_jobs"]
+            entry = next((j for j in top if j.get("job_id") == job_id), None)
+            if entry is not None:
+                entry["applications"] += 1
+            elif len(top) < self.top_n and department is not None:
+                top.append({"job_id": job_id, "title": job_title, "department": department,
+                            "applications": 1, "hired": 0})
+            # Jobs outside the current top list (or of unknown department) catch up on the next reload
+            top.sort(key=lambda j: (-j["applications"], j["job_id"]))
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            age = time.monotonic() - self._loaded_at if self._snapshot is not None else None
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "source": self.source,
+                "snapshot_age_seconds": round(age, 1) if age is not None else None,
+                "ttl": self.ttl,
+            }
+
+
+career_stats_rollup = CareerStatsRollup(settings.CAREER_STATS_TTL, settings.CAREER_STATS_TOP_JOBS)
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.replace(tzinfo=None)
+
+
+async def legacy_career_stats() -> Dict[str, Any]:
+    """Pre-rollup path: pull the rows and count in Python (O(applications))."""
+    jobs_res = await db.table("jobs").select("id, title, department").eq("is_active", True).execute()
+    apps_res = await db.table("job_applications").select(
+        "job_id, job_title, status, applied_at, status_updated_at"
+    ).execute()
+    jobs_data = jobs_res.data or []
+    apps_data = apps_res.data or []
+    departments = {j["id"]: j["department"] for j in jobs_data}
+
+    dept_dist: Dict[str, int] = {}
+    for j in jobs_data:
+        dept_dist[j["department"]] = dept_dist.get(j["department"], 0) + 1
+
+    status_dist: Dict[str, int] = {}
+    per_job: Dict[int, Dict[str, Any]] = {}
+    hire_days: List[float] = []
+    for a in apps_data:
+        s = a.get("status") or "pending"
+        status_dist[s] = status_dist.get(s, 0) + 1
+        job = per_job.setdefault(a["job_id"], {
+            "job_id": a["job_id"], "title": a.get("job_title"), "department": departments.get(a["job_id"]),
+            "applications": 0, "hired": 0
+        })
+        job["applications"] += 1
+        if s == "hired":
+            job["hired"] += 1
+            applied, decided = _parse_ts(a.get("applied_at")), _parse_ts(a.get("status_updated_at"))
+            if applied and decided:
+                hire_days.append(max((decided - applied).total_seconds(), 0) / 86400)
+
+    top = sorted(per_job.values(), key=lambda j: (-j["applications"], j["job_id"]))[:settings.CAREER_STATS_TOP_JOBS]
+    return {
+        "total_active_jobs": len(jobs_data),
+        "total_applications": len(apps_data),
+        "applications_by_status": status_dist,
+        "department_distribution": dept_dist,
+        "average_time_to_hire": round(sum(hire_days) / len(hire_days), 2) if hire_days else None,
+        "top_performing_jobs": top,
+    }
+
+
+async def get_career_stats() -> Dict[str, Any]:
+    """Snapshot -> `career_stats()` RPC -> legacy scan, in that order."""
+    cached = career_stats_rollup.get()
+    if cached is not None:
+        return cached
+
+    try:
+        result = await db.rpc("career_stats", {"top_n": settings.CAREER_STATS_TOP_JOBS})
+        stats, source = result.data, "rpc"
+    except Exception as e:
+        logger.warning(f"career_stats() RPC unavailable ({str(e)}), falling back to row scan")
+        stats, source = await legacy_career_stats(), "scan"
+
+    career_stats_rollup.load(stats, source)
+    return stats
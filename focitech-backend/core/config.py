@@ -1,7 +1,6 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from supabase import create_client, Client
 from pydantic_settings import BaseSettings
 
 # 1. Setup paths and load .env file
@@ -20,8 +19,154 @@ class Settings(BaseSettings):
     # Render environment variables se direct fetch karega
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
-    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "") 
-    
+    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
+
+    # --- Auth Verification ---
+    # "local" verifies JWTs in-process (HS256 secret or cached JWKS keys),
+    # "remote" asks Supabase Auth for every request (legacy behaviour)
+    AUTH_VERIFICATION_MODE: str = os.getenv("AUTH_VERIFICATION_MODE", "local")
+    # Opt-in: fall back to Supabase Auth when a token cannot be checked locally
+    AUTH_REMOTE_FALLBACK: bool = os.getenv("AUTH_REMOTE_FALLBACK", "False").lower() == "true"
+    SUPABASE_JWT_AUDIENCE: str = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+    # Defaults to <SUPABASE_URL>/auth/v1/.well-known/jwks.json when empty
+    SUPABASE_JWKS_URL: str = os.getenv("SUPABASE_JWKS_URL", "")
+    JWKS_CACHE_TTL: int = int(os.getenv("JWKS_CACHE_TTL", 600))
+    JWT_LEEWAY_SECONDS: int = int(os.getenv("JWT_LEEWAY_SECONDS", 10))
+
+    # --- Verified Session Cache ---
+    SESSION_CACHE_MAX_ENTRIES: int = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", 2048))
+    # Entries are dropped this many seconds before the token's `exp`
+    SESSION_CACHE_EXPIRY_SKEW: int = int(os.getenv("SESSION_CACHE_EXPIRY_SKEW", 30))
+    # Upper bound for tokens without `exp` (and for revocation entries)
+    SESSION_CACHE_DEFAULT_TTL: int = int(os.getenv("SESSION_CACHE_DEFAULT_TTL", 300))
+
+    # --- Supabase HTTP Pools (see core/supabase.py) ---
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "True").lower() == "true"
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+    # Per-upstream read timeouts (seconds)
+    POSTGREST_TIMEOUT: float = float(os.getenv("POSTGREST_TIMEOUT", 10))
+    STORAGE_TIMEOUT: float = float(os.getenv("STORAGE_TIMEOUT", 30))
+    AUTH_TIMEOUT: float = float(os.getenv("AUTH_TIMEOUT", 5))
+
+    # --- Data Access ---
+    # "async" talks to PostgREST/Storage via httpx, "threadpool" runs the sync
+    # supabase-py client on the bulkheads below
+    DATA_BACKEND: str = os.getenv("DATA_BACKEND", "async")
+    # Where /careers/openings reads per-job application counts from:
+    # "embedded" = PostgREST `job_applications(count)` in the same request,
+    # "column" = jobs.applications_count kept current by sql/002 trigger
+    APPLICATION_COUNT_SOURCE: str = os.getenv("APPLICATION_COUNT_SOURCE", "embedded")
+
+    # --- Query Cache (see core/query_cache.py) ---
+    QUERY_CACHE_ENABLED: bool = os.getenv("QUERY_CACHE_ENABLED", "True").lower() == "true"
+    QUERY_CACHE_TTL: int = int(os.getenv("QUERY_CACHE_TTL", 60))
+    QUERY_CACHE_MAX_ENTRIES: int = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", 512))
+    QUERY_CACHE_MAX_BYTES: int = int(os.getenv("QUERY_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+    # --- Pagination ---
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", 100))
+    ADMIN_PAGE_SIZE: int = int(os.getenv("ADMIN_PAGE_SIZE", 50))
+    # Upper bound on ids per bulk admin request (see core/bulk.py)
+    BULK_MAX_IDS: int = int(os.getenv("BULK_MAX_IDS", 200))
+
+    # --- Uploads (see core/uploads.py) ---
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", 5 * 1024 * 1024))
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+    # Whole-request cap: from Content-Length, or counted as a chunked body arrives
+    MAX_REQUEST_BYTES: int = int(os.getenv("MAX_REQUEST_BYTES", 6 * 1024 * 1024))
+    # "sync" uploads the resume before answering; "async" spools it, answers 202
+    # and uploads in the background (see core/resume_pipeline.py)
+    RESUME_UPLOAD_MODE: str = os.getenv("RESUME_UPLOAD_MODE", "sync")
+    RESUME_SPOOL_DIR: str = os.getenv("RESUME_SPOOL_DIR", str(BASE_DIR / "uploads" / "spool"))
+    RESUME_UPLOAD_WORKERS: int = int(os.getenv("RESUME_UPLOAD_WORKERS", 2))
+    RESUME_UPLOAD_MAX_ATTEMPTS: int = int(os.getenv("RESUME_UPLOAD_MAX_ATTEMPTS", 6))
+    RESUME_UPLOAD_BACKOFF: float = float(os.getenv("RESUME_UPLOAD_BACKOFF", 2))
+    RESUME_UPLOAD_BACKOFF_MAX: float = float(os.getenv("RESUME_UPLOAD_BACKOFF_MAX", 60))
+
+    # --- Idempotent form posts (see core/idempotency.py) ---
+    IDEMPOTENCY_TTL: int = int(os.getenv("IDEMPOTENCY_TTL", 24 * 3600))
+    IDEMPOTENCY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 10000))
+    # Requests without a key are replayed for this long after the original (seconds)
+    IDEMPOTENCY_WINDOW: int = int(os.getenv("IDEMPOTENCY_WINDOW", 600))
+    IDEMPOTENCY_WAIT_SECONDS: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 30))
+
+    # --- Contact form spam filter (see core/spam.py) ---
+    SPAM_FILTER_ENABLED: bool = os.getenv("SPAM_FILTER_ENABLED", "True").lower() == "true"
+    # Scores from here are stored with status "spam"
+    SPAM_TAG_SCORE: float = float(os.getenv("SPAM_TAG_SCORE", 0.5))
+    # Scores from here are never written; "quarantine" holds them in memory, "reject" answers 400
+    SPAM_BLOCK_SCORE: float = float(os.getenv("SPAM_BLOCK_SCORE", 1.0))
+    SPAM_BLOCK_ACTION: str = os.getenv("SPAM_BLOCK_ACTION", "quarantine")
+    SPAM_VELOCITY_WINDOW: int = int(os.getenv("SPAM_VELOCITY_WINDOW", 600))
+    SPAM_IP_LIMIT: int = int(os.getenv("SPAM_IP_LIMIT", 5))
+    SPAM_EMAIL_LIMIT: int = int(os.getenv("SPAM_EMAIL_LIMIT", 3))
+    SPAM_DUPLICATE_WINDOW: int = int(os.getenv("SPAM_DUPLICATE_WINDOW", 3600))
+    SPAM_DUPLICATE_LIMIT: int = int(os.getenv("SPAM_DUPLICATE_LIMIT", 2))
+    SPAM_TRACKED_KEYS: int = int(os.getenv("SPAM_TRACKED_KEYS", 20000))
+    SPAM_QUARANTINE_SIZE: int = int(os.getenv("SPAM_QUARANTINE_SIZE", 500))
+
+    # --- Task queue (see core/task_queue.py) ---
+    TASK_QUEUE_BACKEND: str = os.getenv("TASK_QUEUE_BACKEND", "sqlite")
+    TASK_QUEUE_PATH: str = os.getenv("TASK_QUEUE_PATH", str(BASE_DIR / "var" / "tasks.sqlite3"))
+    # Run the worker inside the API process; set false when `python worker.py` runs separately
+    TASK_WORKER_EMBEDDED: bool = os.getenv("TASK_WORKER_EMBEDDED", "True").lower() == "true"
+    TASK_WORKER_CONCURRENCY: int = int(os.getenv("TASK_WORKER_CONCURRENCY", 4))
+    TASK_MAX_ATTEMPTS: int = int(os.getenv("TASK_MAX_ATTEMPTS", 5))
+    TASK_RETRY_BACKOFF: float = float(os.getenv("TASK_RETRY_BACKOFF", 5))
+    TASK_RETRY_BACKOFF_MAX: float = float(os.getenv("TASK_RETRY_BACKOFF_MAX", 600))
+    TASK_POLL_INTERVAL: float = float(os.getenv("TASK_POLL_INTERVAL", 1))
+    # A claimed job not finished within the lease is assumed lost and re-run
+    TASK_LEASE_SECONDS: float = float(os.getenv("TASK_LEASE_SECONDS", 300))
+    TASK_DRAIN_SECONDS: float = float(os.getenv("TASK_DRAIN_SECONDS", 20))
+
+    # --- Email notifications (see core/mailer.py, core/notifications.py) ---
+    # Empty SMTP_HOST = log notifications instead of sending them
+    SMTP_HOST: str = os.getenv("SMTP_HOST", "")
+    SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
+    SMTP_USERNAME: str = os.getenv("SMTP_USERNAME", "")
+    SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "True").lower() == "true"
+    SMTP_SSL: bool = os.getenv("SMTP_SSL", "False").lower() == "true"
+    SMTP_TIMEOUT: float = float(os.getenv("SMTP_TIMEOUT", 10))
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", 2))
+    SMTP_IDLE_SECONDS: float = float(os.getenv("SMTP_IDLE_SECONDS", 60))
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", 100))
+    MAIL_FROM: str = os.getenv("MAIL_FROM", "Focitech <no-reply@focitech.in>")
+    # Comma-separated staff addresses for new inquiry / application alerts
+    NOTIFY_ADMIN_EMAILS: str = os.getenv("NOTIFY_ADMIN_EMAILS", "")
+    # > 0: one digest mail per this many seconds instead of one mail per event
+    NOTIFY_DIGEST_SECONDS: float = float(os.getenv("NOTIFY_DIGEST_SECONDS", 0))
+    # Pipeline stages that email the applicant
+    APPLICANT_STATUS_EMAILS: str = os.getenv("APPLICANT_STATUS_EMAILS", "shortlisted,rejected,hired")
+
+    # --- Exports ---
+    # Rows per keyset page in streaming exports (see core/export.py)
+    EXPORT_PAGE_SIZE: int = int(os.getenv("EXPORT_PAGE_SIZE", 500))
+
+    # --- HTTP Caching (public GETs, see core/http_cache.py) ---
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", 60))
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", 300))
+
+    # --- Careers Dashboard (see core/career_stats.py) ---
+    CAREER_STATS_TTL: int = int(os.getenv("CAREER_STATS_TTL", 60))
+    CAREER_STATS_TOP_JOBS: int = int(os.getenv("CAREER_STATS_TOP_JOBS", 5))
+    # Full reload interval for the job facet index (see core/facets.py)
+    FACET_REFRESH_SECONDS: int = int(os.getenv("FACET_REFRESH_SECONDS", 300))
+    # Type-ahead indexes for /suggest (see core/suggest.py)
+    SUGGEST_REFRESH_SECONDS: int = int(os.getenv("SUGGEST_REFRESH_SECONDS", 300))
+    SUGGEST_MAX_RESULTS: int = int(os.getenv("SUGGEST_MAX_RESULTS", 20))
+
+    # --- Bulkheads (per-upstream thread pools for the sync client) ---
+    BULKHEAD_POSTGREST_WORKERS: int = int(os.getenv("BULKHEAD_POSTGREST_WORKERS", 8))
+    BULKHEAD_POSTGREST_QUEUE: int = int(os.getenv("BULKHEAD_POSTGREST_QUEUE", 64))
+    BULKHEAD_STORAGE_WORKERS: int = int(os.getenv("BULKHEAD_STORAGE_WORKERS", 4))
+    BULKHEAD_STORAGE_QUEUE: int = int(os.getenv("BULKHEAD_STORAGE_QUEUE", 16))
+    BULKHEAD_AUTH_WORKERS: int = int(os.getenv("BULKHEAD_AUTH_WORKERS", 4))
+    BULKHEAD_AUTH_QUEUE: int = int(os.getenv("BULKHEAD_AUTH_QUEUE", 32))
+
     # --- Server Settings ---
     # Render automatically sets PORT variable
     PORT: int = int(os.getenv("PORT", 8000))
@@ -42,25 +187,3 @@ class Settings(BaseSettings):
 
 # Settings initialize karein
 settings = Settings()
-
-# --- Global Supabase Client Initialization ---
-def init_supabase() -> Client:
-    """Safely connect to Supabase without crashing the app build."""
-    try:
-        url = settings.SUPABASE_URL
-        key = settings.SUPABASE_KEY
-        
-        if not url or not key:
-            print("⚠️ Warning: SUPABASE_URL or SUPABASE_KEY missing in Environment!")
-            return None
-            
-        client = create_client(url, key)
-        print(f"✅ {settings.PROJECT_NAME} connected to Supabase.")
-        return client
-    except Exception as e:
-        # Build ke waqt error handle karein taaki Render deploy reject na kare
-        print(f"❌ Supabase Connection Error: {str(e)}")
-        return None
-
-# Global client object
-supabase = init_supabase()
\ No newline at end of file
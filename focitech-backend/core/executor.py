@@ -0,0 +1,115 @@
+# core/executor.py
+"""
+Bounded thread pools (bulkheads) for the synchronous Supabase client.
+
+supabase-py only ships blocking calls. Anything that still goes through it
+(auth, and every table/storage call when DATA_BACKEND=threadpool) runs on a
+dedicated, size-limited pool per upstream so that, for example, a storm of
+resume uploads cannot starve PostgREST reads. When a pool's queue is full
+the call fails fast with 503 instead of piling up latency.
+"""
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+
+logger = logging.getLogger("focitech_api")
+
+
+class Bulkhead:
+    """A ThreadPoolExecutor with an admission limit and wait-time accounting."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"bulkhead-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                logger.warning(f"⛔ Bulkhead '{self.name}' saturated ({self.queued} queued), shedding load")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Upstream '{self.name}' is busy. Please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self.queued += 1
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        future = self._executor.submit(task)
+
+        def release_if_cancelled(f):
+            # A future cancelled before it started never ran task(), so it still counts as queued
+            if f.cancelled():
+                with self._lock:
+                    self.queued -= 1
+
+        future.add_done_callback(release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queued,
+                "active_workers": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait / self.completed * 1000, 3) if self.completed else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+bulkheads: Dict[str, Bulkhead] = {
+    "postgrest": Bulkhead("postgrest", settings.BULKHEAD_POSTGREST_WORKERS, settings.BULKHEAD_POSTGREST_QUEUE),
+    "storage": Bulkhead("storage", settings.BULKHEAD_STORAGE_WORKERS, settings.BULKHEAD_STORAGE_QUEUE),
+    "auth": Bulkhead("auth", settings.BULKHEAD_AUTH_WORKERS, settings.BULKHEAD_AUTH_QUEUE),
+}
+
+
+async def run_in_bulkhead(upstream: str, fn: Callable, *args, **kwargs):
+    """Run a blocking Supabase call on the pool reserved for `upstream`."""
+    return await bulkheads[upstream].run(fn, *args, **kwargs)
+
+
+def bulkhead_stats() -> dict:
+    return {name: pool.stats() for name, pool in bulkheads.items()}
+
+
+def shutdown_bulkheads():
+    for pool in bulkheads.values():
+        pool.shutdown()
@@ -0,0 +1,98 @@
+# core/export.py
+"""
+Streaming admin exports (JSON array, NDJSON or CSV).
+
+Rows are read in keyset pages of EXPORT_PAGE_SIZE on (sort_column, id) and
+each page is encoded and yielded before the next one is fetched, so memory
+stays at one page however large the table is. GZipMiddleware compresses
+the chunks as they go out. The first page is fetched before the response
+starts so a database failure is still a proper 500. A failure on a later
+page aborts the chunked body: the JSON array is never closed and no
+further CSV rows are written, so a partial export cannot pass for a
+complete one.
+"""
+import io
+import csv
+import json
+import logging
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from core.pagination import encode_cursor, keyset
+from core.repository import Query
+
+logger = logging.getLogger("focitech_api")
+
+EXPORT_FORMATS = ("json", "ndjson", "csv")
+MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def _csv_cell(value: Any) -> Any:
+    # Arrays / objects (e.g. tech_stack) stay machine-readable inside one cell
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+async def _pages(build: Callable[[], Query], column: str, page_size: int,
+                 first: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    rows = first
+    while True:
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if rows:
+            yield rows
+        if not more:
+            return
+        cursor = encode_cursor(rows[-1][column], rows[-1]["id"])
+        rows = (await keyset(build(), column, cursor, page_size).execute()).data or []
+
+
+async def _encode(fmt: str, pages: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    header: List[str] = []
+    started = False
+    try:
+        async for rows in pages:
+            if fmt == "csv":
+                buffer = io.StringIO()
+                if not header:
+                    header = list(rows[0].keys())
+                    csv.writer(buffer).writerow(header)
+                writer = csv.DictWriter(buffer, fieldnames=header, extrasaction="ignore")
+                writer.writerows({k: _csv_cell(v) for k, v in row.items()} for row in rows)
+                yield buffer.getvalue()
+            elif fmt == "ndjson":
+                yield "".join(json.dumps(row, default=_json_default) + "\n" for row in rows)
+            else:
+                chunk = ",\n".join(json.dumps(row, default=_json_default) for row in rows)
+                yield ("[\n" if not started else ",\n") + chunk
+            started = True
+    except Exception as e:
+        # Headers are already out. Re-raising makes the server drop the
+        # connection without the final chunk, so the client sees a failed
+        # download instead of a well-formed but truncated file.
+        logger.error(f"❌ Export aborted mid-stream: {str(e)}")
+        raise
+    if fmt == "json":
+        yield "\n]\n" if started else "[]\n"
+
+
+async def stream_export(build: Callable[[], Query], column: str, fmt: str, filename: str) -> StreamingResponse:
+    """
+    Stream every row of `build()` newest-first on (column, id).
+    `build` must return a fresh select query (filters only, no order/limit).
+    """
+    page_size = settings.EXPORT_PAGE_SIZE
+    first = (await keyset(build(), column, None, page_size).execute()).data or []
+    return StreamingResponse(
+        _encode(fmt, _pages(build, column, page_size, first)),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{fmt}"},
+    )
@@ -0,0 +1,114 @@
+# core/facets.py
+"""
+In-memory facet indexes for the Careers filters and portfolio tech chips.
+
+Keeps, for every document, the values it contributes to each facet and a
+running count per value, so `/careers/facets` (and the older
+`/careers/departments` / `/careers/locations`) and `/portfolio/tech` are
+answered from memory. Array columns such as `tech_stack` count once per
+element (an in-process unnest). Admin writes update the index
+incrementally; a periodic reload every FACET_REFRESH_SECONDS picks up edits
+made directly in Supabase.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.config import settings
+from core.reloadable_index import ReloadableIndex
+
+JOB_FACETS = ("department", "location", "job_type", "work_mode")
+PROJECT_FACETS = ("tech_stack",)
+
+
+def _facet_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = getattr(value, "value", value)
+    text = str(value).strip()
+    return text or None
+
+
+def _facet_values(value: Any) -> Tuple[str, ...]:
+    """Distinct facet values of a cell; arrays contribute one value per element."""
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    return tuple(dict.fromkeys(v for v in map(_facet_value, values) if v is not None))
+
+
+class FacetIndex(ReloadableIndex):
+    """Distinct values with counts, maintained per document."""
+
+    label = "Facet index"
+    emoji = "🗂️"
+
+    def __init__(self, table: str, fields: Iterable[str], refresh_seconds: int, active_only: bool = True):
+        super().__init__(table, fields, refresh_seconds, active_only)
+        self.fields = self.columns
+        self._docs: Dict[Any, Dict[str, Tuple[str, ...]]] = {}
+        self._counts: Dict[str, Counter] = {f: Counter() for f in self.fields}
+
+    # --- Maintenance ---
+    def _add(self, doc_id, row: Dict[str, Any]):
+        values = {}
+        for f in self.fields:
+            cell = _facet_values(row.get(f))
+            if cell:
+                values[f] = cell
+                self._counts[f].update(cell)
+        self._docs[doc_id] = values
+
+    def _discard(self, doc_id):
+        values = self._docs.pop(doc_id, None)
+        if not values:
+            return
+        for f, cell in values.items():
+            for v in cell:
+                self._counts[f][v] -= 1
+                if self._counts[f][v] <= 0:
+                    del self._counts[f][v]
+
+    def _clear(self):
+        self._counts = {f: Counter() for f in self.fields}
+
+    # --- Reads ---
+    def value(self, doc_id, field: str) -> Optional[str]:
+        """First indexed value of `field` for one document; None when unknown."""
+        with self._lock:
+            cell = self._docs.get(doc_id, {}).get(field)
+            return cell[0] if cell else None
+
+    def values(self, field: str) -> List[str]:
+        with self._lock:
+            return sorted(self._counts[field])
+
+    def ranked(self, field: str) -> List[Dict[str, Any]]:
+        """Values of one facet, most common first (ties alphabetical)."""
+        with self._lock:
+            items = sorted(self._counts[field].items(), key=lambda kv: (-kv[1], kv[0].casefold()))
+            return [{"value": v, "count": n} for v, n in items]
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            return {
+                f: [{"value": v, "count": n} for v, n in sorted(self._counts[f].items())]
+                for f in self.fields
+            }
+
+    def _extra_stats(self) -> Dict[str, Any]:
+        return {"values": {f: len(c) for f, c in self._counts.items()}}
+
+
+job_facets = FacetIndex("jobs", JOB_FACETS, settings.FACET_REFRESH_SECONDS)
+project_facets = FacetIndex("projects", PROJECT_FACETS, settings.FACET_REFRESH_SECONDS, active_only=False)
+
+
+async def ensure_facets(index: FacetIndex) -> FacetIndex:
+    """Reload `index` from its table when it is empty or older than the refresh window."""
+    return await index.ensure()
+
+
+async def ensure_job_facets() -> FacetIndex:
+    return await ensure_facets(job_facets)
+
+
+async def ensure_project_facets() -> FacetIndex:
+    return await ensure_facets(project_facets)
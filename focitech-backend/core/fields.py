@@ -0,0 +1,81 @@
+# core/fields.py
+"""
+Sparse fieldsets (`?fields=id,title,image_url`) for list endpoints.
+
+Each resource declares a FieldSet over its Read model. The allow-list is
+that model's fields. The requested subset is validated, pushed into the
+PostgREST `select`, and used to build a trimmed response model on the fly,
+so card views transfer, validate and serialize only what they render.
+Without `fields` the route behaves exactly as before.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
+
+
+class FieldSet:
+    """Allow-listed column projection for one resource."""
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        always: Iterable[str] = ("id",),
+        virtual: Optional[Dict[str, Union[str, Callable[[], Optional[str]]]]] = None,
+    ):
+        self.model = model
+        self.allowed = frozenset(model.model_fields)
+        self.always = tuple(always)
+        # Response fields that are not plain columns (e.g. embedded counts)
+        self.virtual = virtual or {}
+        self._trimmed = lru_cache(maxsize=64)(self._build_model)
+
+    def parse(self, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """Validate a comma list against the allow-list; None means 'all fields'."""
+        if not fields:
+            return None
+        requested = []
+        for name in (f.strip() for f in fields.split(",")):
+            if name and name not in requested:
+                requested.append(name)
+        unknown = [name for name in requested if name not in self.allowed]
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(unknown) or '(none)'}. Allowed: {', '.join(sorted(self.allowed))}",
+            )
+        for name in self.always:
+            if name in self.allowed and name not in requested:
+                requested.insert(0, name)
+        return tuple(requested)
+
+    def columns(self, fields: Optional[Tuple[str, ...]], default: str = "*", extra: Iterable[str] = ()) -> str:
+        """PostgREST select list for `fields`; `extra` are columns the handler needs (sort keys)."""
+        if fields is None:
+            return default
+        select: List[str] = []
+        for name in (*fields, *extra):
+            column = self.virtual.get(name, name)
+            if callable(column):
+                column = column()
+            if column and column not in select:
+                select.append(column)
+        return ",".join(select)
+
+    def _build_model(self, fields: Tuple[str, ...]) -> Type[BaseModel]:
+        definitions: Dict[str, Any] = {
+            name: (self.model.model_fields[name].annotation, self.model.model_fields[name])
+            for name in fields
+        }
+        return create_model(f"{self.model.__name__}Fields", **definitions)
+
+    def response_model(self, fields: Tuple[str, ...]) -> Type[BaseModel]:
+        return self._trimmed(fields)
+
+    def respond(self, rows: List[Dict[str, Any]], fields: Tuple[str, ...], response: Response) -> JSONResponse:
+        """Validate rows against the trimmed model and return them with the handler's headers."""
+        model = self.response_model(fields)
+        content = [model.model_validate(row).model_dump(mode="json") for row in rows]
+        return JSONResponse(content=content, headers=dict(response.headers))
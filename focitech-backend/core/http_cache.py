@@ -0,0 +1,63 @@
+# core/http_cache.py
+"""
+Conditional GET support for the public catalog routes.
+
+Handlers compute a strong ETag from the data they are about to return.
+For reads served by the query cache this is the digest memoized on the
+cache entry, so it costs nothing extra. If the client's If-None-Match
+matches, a bodyless 304 is raised before the response model is built.
+When the read was a cache hit, such a request never touches Supabase and
+never serializes JSON. Cache-Control lets browsers and CDNs reuse the body
+for HTTP_CACHE_MAX_AGE seconds and then serve it stale while they
+revalidate in the background.
+"""
+import json
+import hashlib
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from core.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the API version plus the given bytes/str/JSON-able parts."""
+    h = hashlib.blake2b(settings.PROJECT_VERSION.encode("utf-8"), digest_size=16)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+        h.update(part)
+        h.update(b"\0")
+    return f'"{h.hexdigest()}"'
+
+
+def result_etag(result, *extra: Any) -> str:
+    """ETag for a repository QueryResult, reusing the query cache's digest when present."""
+    return make_etag(result.etag or result.data, *extra)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    ours = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == ours for tag in if_none_match.split(","))
+
+
+def cache_control() -> str:
+    return (
+        f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+        f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+    )
+
+
+def check_not_modified(request: Request, response: Response, etag: str):
+    """Set validator headers; raise 304 when the client already holds this version."""
+    headers = {"ETag": etag, "Cache-Control": cache_control()}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
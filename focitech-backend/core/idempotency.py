@@ -0,0 +1,144 @@
+# core/idempotency.py
+"""
+Idempotent public form submissions (POST /contact, POST /careers/apply).
+
+Browsers and the frontend's axios retries resend the same form on flaky
+mobile networks. A submission is keyed by its `Idempotency-Key` header or,
+when the client sends none, by a digest of the submission itself (email,
+job id or subject, and for the contact form the message body). The first
+request runs and its successful response is stored. Replays get that same
+response back (marked `Idempotent-Replayed`) without re-uploading or
+re-inserting anything: for IDEMPOTENCY_TTL with a client key, and for
+IDEMPOTENCY_WINDOW seconds after the original without one. The window
+starts at the original submission, not at a fixed clock slot, so a retry
+is caught however close the original was to a slot boundary.
+
+A replay that arrives while the original is still running waits for it
+(up to IDEMPOTENCY_WAIT_SECONDS) instead of racing it. Failed attempts are
+forgotten so the client can retry them. The store is per process: with
+several workers a retry landing on another worker is not deduplicated.
+"""
+import time
+import json
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+from core.config import settings
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+class _Entry:
+    __slots__ = ("done", "status_code", "body", "expires")
+
+    def __init__(self, expires: float):
+        self.done = asyncio.Event()
+        self.status_code: Optional[int] = None
+        self.body: Optional[bytes] = None
+        self.expires = expires
+
+
+@dataclass(frozen=True)
+class IdempotencyKey:
+    digest: str
+    # How long the first response is replayed for this key
+    ttl: int
+
+
+def idempotency_key(request: Request, scope: str, *fingerprint: Any) -> IdempotencyKey:
+    """Client key when sent, otherwise a digest of the submission (replayed for IDEMPOTENCY_WINDOW)."""
+    supplied = request.headers.get(IDEMPOTENCY_HEADER, "").strip()
+    if supplied:
+        if len(supplied) > 255:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{IDEMPOTENCY_HEADER} is too long.")
+        raw, ttl = f"{scope}|key|{supplied}", settings.IDEMPOTENCY_TTL
+    else:
+        # Each part hashed on its own so a '|' inside a message cannot shift the boundaries
+        parts = "|".join(
+            hashlib.sha256(" ".join(str(p).lower().split()).encode("utf-8")).hexdigest() for p in fingerprint
+        )
+        raw, ttl = f"{scope}|auto|{parts}", settings.IDEMPOTENCY_WINDOW
+    return IdempotencyKey(hashlib.sha256(raw.encode("utf-8")).hexdigest(), ttl)
+
+
+class IdempotencyStore:
+    """Bounded LRU of key -> first successful response, with TTL."""
+
+    def __init__(self, max_entries: int, wait_seconds: float):
+        self.max_entries = max_entries
+        self.wait_seconds = wait_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.replays = 0
+        self.conflicts = 0
+
+    def _live(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= time.time():
+            del self._entries[key]
+            return None
+        return entry
+
+    def _replay(self, entry: _Entry) -> Response:
+        self.replays += 1
+        return Response(
+            content=entry.body, status_code=entry.status_code,
+            media_type="application/json", headers={REPLAY_HEADER: "true"},
+        )
+
+    async def run(self, idempotency: IdempotencyKey, work: Callable[[], Awaitable[Any]], status_code: int) -> Any:
+        """Run `work` once per key; later calls within the key's ttl get the stored response."""
+        key = idempotency.digest
+        entry = self._live(key)
+        if entry is not None:
+            if not entry.done.is_set():
+                try:
+                    await asyncio.wait_for(asyncio.shield(entry.done.wait()), self.wait_seconds)
+                except asyncio.TimeoutError:
+                    self.conflicts += 1
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="The original request is still being processed.",
+                    )
+                entry = self._live(key)
+            if entry is not None and entry.body is not None:
+                return self._replay(entry)
+            # The original failed and was forgotten; this request gets to try
+
+        entry = _Entry(time.time() + idempotency.ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        try:
+            result = await work()
+        except BaseException:
+            self._entries.pop(key, None)
+            entry.done.set()
+            raise
+
+        if isinstance(result, Response):
+            entry.status_code, entry.body = result.status_code, bytes(result.body)
+        else:
+            entry.status_code = status_code
+            entry.body = json.dumps(jsonable_encoder(result)).encode("utf-8")
+        entry.done.set()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "replays": self.replays,
+            "conflicts": self.conflicts,
+        }
+
+
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_MAX_ENTRIES, settings.IDEMPOTENCY_WAIT_SECONDS)
@@ -0,0 +1,215 @@
+# core/mailer.py
+"""
+Outbound email over a small pool of persistent SMTP connections.
+
+Opening an SMTP session costs a TCP connect, a STARTTLS handshake and
+AUTH before the first message; doing that per event is what overwhelms a
+relay during a campaign spike. Here connections are opened lazily, kept
+for SMTP_IDLE_SECONDS between uses and recycled after
+SMTP_MAX_MESSAGES_PER_CONNECTION. `send` delivers a whole batch of messages
+over one connection.
+
+smtplib is blocking, so batches run in a worker thread. With SMTP_HOST
+unset the mailer only logs each message, which keeps development and
+tests free of a mail server (point SMTP_HOST at a local aiosmtpd to see
+the real traffic).
+"""
+import time
+import smtplib
+import asyncio
+import logging
+import threading
+from email.message import EmailMessage
+from typing import Iterable, List, Optional, Sequence
+
+from core.config import settings
+
+logger = logging.getLogger("focitech_api")
+
+
+# Subjects carry visitor input (inquiry subject, job title); keep them to one short line
+MAX_SUBJECT_CHARS = 150
+
+
+def header_text(value: str, limit: int = MAX_SUBJECT_CHARS) -> str:
+    """One line of at most `limit` characters: CR/LF and other whitespace runs become single spaces."""
+    text = " ".join(str(value).split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def build_message(to: Sequence[str], subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = ", ".join(to)
+    # EmailMessage refuses CR/LF in headers; a raise here would only retry into the dead letters
+    message["Subject"] = header_text(subject)
+    message.set_content(body)
+    return message
+
+
+def recipients(value: str) -> List[str]:
+    """Comma-separated address list from a setting."""
+    return [address.strip() for address in value.split(",") if address.strip()]
+
+
+class _Connection:
+    __slots__ = ("smtp", "last_used", "sent")
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.sent = 0
+
+
+class SMTPPool:
+    """At most `size` live SMTP sessions, reused across batches. Blocking API."""
+
+    def __init__(self, host: str, port: int, username: str, password: str, starttls: bool,
+                 use_ssl: bool, timeout: float, size: int, idle_seconds: float, max_messages: int):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_Connection] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.sent = 0
+        self.refused = 0
+
+    def _open(self) -> _Connection:
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        self.opened += 1
+        return _Connection(smtp)
+
+    @staticmethod
+    def _quit(conn: _Connection):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+
+    def _checkout(self) -> _Connection:
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if time.monotonic() - conn.last_used < self.idle_seconds:
+                    self.reused += 1
+                    return conn
+                self._quit(conn)
+        return self._open()
+
+    def _checkin(self, conn: _Connection):
+        conn.last_used = time.monotonic()
+        if conn.sent >= self.max_messages:
+            self._quit(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    def send_batch(self, messages: Iterable[EmailMessage]) -> int:
+        """Deliver `messages` over one pooled session; returns how many were accepted.
+
+        Refused recipients are logged and skipped (retrying will not help); a
+        connection that fails is discarded and the error propagates so the
+        caller's job is retried.
+        """
+        delivered = 0
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                for message in messages:
+                    if conn.sent >= self.max_messages:
+                        self._quit(conn)
+                        conn = self._open()
+                    try:
+                        conn.smtp.send_message(message)
+                        delivered += 1
+                    except smtplib.SMTPServerDisconnected:
+                        # Server dropped an idle session; one fresh connection, then give up
+                        conn.smtp.close()
+                        conn = self._open()
+                        conn.smtp.send_message(message)
+                        delivered += 1
+                    except smtplib.SMTPRecipientsRefused as e:
+                        self.refused += 1
+                        logger.warning(f"📭 Mail to {', '.join(e.recipients)} refused: {message['Subject']}")
+                    conn.sent += 1
+            except Exception:
+                conn.smtp.close()
+                raise
+            self._checkin(conn)
+        finally:
+            self.sent += delivered
+            self._slots.release()
+        return delivered
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._quit(conn)
+
+    def stats(self) -> dict:
+        return {
+            "idle": len(self._idle),
+            "opened": self.opened,
+            "reused": self.reused,
+            "sent": self.sent,
+            "refused": self.refused,
+        }
+
+
+class Mailer:
+    """Async front for the pool; logs instead of sending when SMTP is not configured."""
+
+    def __init__(self, pool: Optional[SMTPPool]):
+        self.pool = pool
+        self.logged = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.pool is not None
+
+    async def send(self, messages: List[EmailMessage]) -> int:
+        if not messages:
+            return 0
+        if self.pool is None:
+            for message in messages:
+                self.logged += 1
+                logger.info(f"📧 [mail disabled] To {message['To']}: {message['Subject']}")
+            return len(messages)
+        return await asyncio.to_thread(self.pool.send_batch, messages)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+    def stats(self) -> dict:
+        if self.pool is None:
+            return {"enabled": False, "logged": self.logged}
+        return {"enabled": True, **self.pool.stats()}
+
+
+mailer = Mailer(
+    SMTPPool(
+        settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USERNAME, settings.SMTP_PASSWORD,
+        starttls=settings.SMTP_STARTTLS, use_ssl=settings.SMTP_SSL, timeout=settings.SMTP_TIMEOUT,
+        size=settings.SMTP_POOL_SIZE, idle_seconds=settings.SMTP_IDLE_SECONDS,
+        max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+    ) if settings.SMTP_HOST else None
+)
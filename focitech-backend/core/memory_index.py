@@ -0,0 +1,362 @@
+# core/memory_index.py
+"""
+In-process table engine used when Supabase is not configured (local dev)
+and as the degraded-mode fallback for the careers listings.
+
+It executes the same `Query` objects the repository sends to PostgREST:
+
+* every table keeps a tokenized inverted index over its text columns
+  (prefix lookups run on a sorted vocabulary), which backs the
+  `search_projects` / `search_jobs` RPCs with weighted ranking;
+* `created_at`-style columns keep sorted (value, id) indexes, so
+  newest-first pages walk the index and stop after `limit` matches;
+* filters (eq/neq/gt/gte/lt/lte/like/ilike/is/in/cs and nested or/and),
+  ordering, limit/offset, select lists, `single()`, `count=exact` and
+  embedded `child(count)` are evaluated with PostgREST semantics.
+"""
+import re
+import json
+import bisect
+import fnmatch
+import itertools
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# Per-table search weights (title > tags > body) and sorted secondary indexes
+TABLE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "projects": {"text": {"title": 3, "tech_stack": 2, "description": 1}, "sorted": ("created_at",)},
+    "jobs": {
+        "text": {"title": 3, "department": 2, "location": 2, "description": 1, "requirements": 1},
+        "sorted": ("created_at",),
+    },
+    "team": {"text": {"name": 3, "role": 2, "bio": 1}, "sorted": ()},
+    "inquiries": {"text": {}, "sorted": ("created_at",)},
+    "job_applications": {"text": {}, "sorted": ("applied_at",)},
+}
+
+# Set-returning RPCs (sql/006) emulated on top of the inverted index
+SEARCH_FUNCTIONS = {"search_projects": "projects", "search_jobs": "jobs"}
+
+
+def _wire_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class UnknownFunction(LookupError):
+    """RPC with no in-memory implementation (the repository maps this to a 404)."""
+
+
+def tokenize(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [t for item in value for t in tokenize(item)]
+    return TOKEN.findall(str(value).lower())
+
+
+def _unquote(text: str) -> str:
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return text
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split `a.eq.1,and(b.eq.2,c.eq.3)` on commas outside parentheses/quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch in "({":
+            depth += 1
+        elif not quoted and ch in ")}":
+            depth -= 1
+        elif ch == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def _coerce(raw: str, like: Any) -> Any:
+    """Interpret a filter literal with the type of the row value it is compared to."""
+    raw = _unquote(raw)
+    if isinstance(like, bool):
+        return raw.lower() == "true"
+    if isinstance(like, int):
+        try:
+            return int(raw)
+        except ValueError:
+            return raw
+    if isinstance(like, float):
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def _comparable(value: Any) -> Any:
+    return str(value) if not isinstance(value, (int, float, bool)) else value
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # NULLs sort last ascending, like Postgres
+    return (1, "") if value is None else (0, _comparable(value))
+
+
+class MemoryTable:
+    """Rows by id plus inverted and sorted secondary indexes."""
+
+    def __init__(self, name: str, text_fields: Dict[str, int], sorted_fields: Iterable[str]):
+        self.name = name
+        self.text_fields = text_fields
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        self.inverted: Dict[str, Dict[Any, int]] = {}
+        self._vocabulary: List[str] = []
+        self.sorted: Dict[str, List[Tuple[Tuple[int, Any], Any]]] = {f: [] for f in ("id", *sorted_fields)}
+        self._ids = itertools.count(1)
+
+    # --- Index maintenance ---
+    def _index(self, row: Dict[str, Any]):
+        row_id = row["id"]
+        for field, weight in self.text_fields.items():
+            for token in tokenize(row.get(field)):
+                postings = self.inverted.get(token)
+                if postings is None:
+                    postings = self.inverted[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                postings[row_id] = postings.get(row_id, 0) + weight
+        for field, entries in self.sorted.items():
+            bisect.insort(entries, (_sort_key(row.get(field)), row_id))
+
+    def _unindex(self, row: Dict[str, Any]):
+        row_id = row["id"]
+        for token in set(tokenize([row.get(f) for f in self.text_fields])):
+            postings = self.inverted.get(token)
+            if postings is not None:
+                postings.pop(row_id, None)
+                if not postings:
+                    del self.inverted[token]
+                    self._vocabulary.pop(bisect.bisect_left(self._vocabulary, token))
+        for field, entries in self.sorted.items():
+            position = bisect.bisect_left(entries, (_sort_key(row.get(field)), row_id))
+            if position < len(entries) and entries[position][1] == row_id:
+                entries.pop(position)
+
+    # --- Writes ---
+    def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        if row.get("id") is None:
+            row["id"] = next(self._ids)
+            while row["id"] in self.rows:
+                row["id"] = next(self._ids)
+        for field in ("created_at", *self.sorted):
+            if field != "id" and row.get(field) is None:
+                row[field] = datetime.now(timezone.utc).isoformat()
+        if row["id"] in self.rows:
+            self._unindex(self.rows[row["id"]])
+        self.rows[row["id"]] = row
+        self._index(row)
+        return dict(row)
+
+    def update(self, row_id: Any, patch: Dict[str, Any]) -> Dict[str, Any]:
+        row = self.rows[row_id]
+        self._unindex(row)
+        row.update(patch)
+        self._index(row)
+        return dict(row)
+
+    def delete(self, row_id: Any) -> Dict[str, Any]:
+        row = self.rows.pop(row_id)
+        self._unindex(row)
+        return row
+
+    # --- Reads ---
+    def search(self, text: str) -> Dict[Any, int]:
+        """Prefix AND-match every query word; returns id -> relevance score."""
+        scores: Optional[Dict[Any, int]] = None
+        for word in tokenize(text):
+            matched: Dict[Any, int] = {}
+            position = bisect.bisect_left(self._vocabulary, word)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(word):
+                for row_id, weight in self.inverted[self._vocabulary[position]].items():
+                    matched[row_id] = matched.get(row_id, 0) + weight
+                position += 1
+            scores = matched if scores is None else {i: s + matched[i] for i, s in scores.items() if i in matched}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def ordered_ids(self, ordering: List[str]) -> Iterator[Any]:
+        """Walk a sorted index when the leading order column has one, else sort."""
+        if not ordering:
+            ordering = ["id.asc"]
+        column, _, direction = ordering[0].rpartition(".")
+        # Index entries are (value, id), so ties already come out in id order
+        tiebreak_ok = len(ordering) == 1 or ordering[1:] == [f"id.{direction}"]
+        if column in self.sorted and tiebreak_ok:
+            entries = self.sorted[column]
+            return (row_id for _, row_id in (reversed(entries) if direction == "desc" else entries))
+        return iter(order_rows(list(self.rows), self.rows, ordering))
+
+
+def order_rows(ids: List[Any], rows: Dict[Any, Dict[str, Any]], ordering: List[str]) -> List[Any]:
+    for clause in reversed(ordering):
+        column, _, direction = clause.rpartition(".")
+        ids.sort(key=lambda i: _sort_key(rows[i].get(column)), reverse=direction == "desc")
+    return ids
+
+
+def matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter (`column=op.value`) against a row."""
+    if column in ("or", "and"):
+        results = (_match_clause(row, part) for part in _split_top_level(expression[1:-1]))
+        return any(results) if column == "or" else all(results)
+
+    operator, _, raw = expression.partition(".")
+    negate = operator == "not"
+    if negate:
+        operator, _, raw = raw.partition(".")
+    value = row.get(column)
+
+    if operator == "is":
+        token = raw.lower()
+        result = value is None if token == "null" else value is (token == "true")
+    elif operator in ("like", "ilike"):
+        pattern = _unquote(raw).replace("%", "*")
+        text = "" if value is None else str(value)
+        result = fnmatch.fnmatchcase(text.lower(), pattern.lower()) if operator == "ilike" else fnmatch.fnmatchcase(text, pattern)
+    elif operator == "in":
+        options = [_coerce(v, value) for v in _split_top_level(raw[1:-1])]
+        result = value in options
+    elif operator == "cs":
+        wanted = [_unquote(v) for v in _split_top_level(raw[1:-1])]
+        have = [str(v) for v in (value or [])]
+        result = all(w in have for w in wanted)
+    elif value is None:
+        result = False
+    else:
+        other = _coerce(raw, value)
+        left, right = _comparable(value), _comparable(other)
+        if type(left) is not type(right):
+            left, right = str(left), str(right)
+        result = {
+            "eq": left == right, "neq": left != right,
+            "gt": left > right, "gte": left >= right,
+            "lt": left < right, "lte": left <= right,
+        }.get(operator, False)
+    return not result if negate else result
+
+
+def _match_clause(row: Dict[str, Any], clause: str) -> bool:
+    """`col.op.value` or nested `and(...)` / `or(...)` inside a logical filter."""
+    for logical in ("and", "or"):
+        if clause.startswith(logical + "("):
+            return matches(row, logical, clause[len(logical):])
+    column, _, expression = clause.partition(".")
+    return matches(row, column, expression)
+
+
+class MemoryBackend:
+    """Executes repository queries against MemoryTables."""
+
+    def __init__(self):
+        self.tables: Dict[str, MemoryTable] = {}
+
+    def table(self, name: str) -> MemoryTable:
+        if name not in self.tables:
+            schema = TABLE_SCHEMAS.get(name, {"text": {}, "sorted": ("created_at",)})
+            self.tables[name] = MemoryTable(name, schema["text"], schema["sorted"])
+        return self.tables[name]
+
+    def seed(self, name: str, rows: Iterable[Dict[str, Any]]):
+        table = self.table(name)
+        for row in rows:
+            # Same wire shape PostgREST returns (ISO timestamps, plain JSON types)
+            table.insert(json.loads(json.dumps(row, default=_wire_default)))
+
+    # --- Query execution ---
+    def execute(self, query) -> Tuple[Any, Optional[int]]:
+        scores: Optional[Dict[Any, int]] = None
+        filters = list(query.filters)
+        name = query.table
+        if name.startswith("rpc/"):
+            function = name[4:]
+            if function not in SEARCH_FUNCTIONS:
+                raise UnknownFunction(function)
+            args = {k: v for k, v in filters if k == "q"}
+            filters = [(k, v) for k, v in filters if k != "q"]
+            name = SEARCH_FUNCTIONS[function]
+            scores = self.table(name).search(args.get("q", ""))
+
+        table = self.table(name)
+        if query.method == "POST":
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            return [table.insert(row) for row in payload], None
+
+        selected = self._select_ids(table, filters, query.ordering, scores, query)
+        if query.method == "PATCH":
+            return [self._project(table, table.update(i, query.payload), query.columns) for i in selected], None
+        if query.method == "DELETE":
+            return [self._project(table, table.delete(i), query.columns) for i in selected], None
+
+        count = len(selected) if query.count else None
+        offset = query.offset_value or 0
+        page = selected[offset:offset + query.limit_value] if query.limit_value is not None else selected[offset:]
+        data = [self._project(table, table.rows[i], query.columns) for i in page]
+        return data, count
+
+    def _select_ids(self, table: MemoryTable, filters, ordering, scores, query) -> List[Any]:
+        def keep(row_id) -> bool:
+            row = table.rows[row_id]
+            return all(matches(row, column, expression) for column, expression in filters)
+
+        if scores is not None:
+            # Relevance first, then newest, like the SQL search functions
+            ids = [i for i in scores if keep(i)]
+            if ordering:
+                return order_rows(ids, table.rows, ordering)
+            ids = order_rows(ids, table.rows, ["created_at.desc", "id.desc"])
+            ids.sort(key=lambda i: -scores[i])  # stable: equal scores stay newest-first
+            return ids
+
+        wanted = None
+        if query.method == "GET" and query.limit_value is not None and not query.count:
+            wanted = (query.offset_value or 0) + query.limit_value
+        ids: List[Any] = []
+        for row_id in table.ordered_ids(ordering):
+            if keep(row_id):
+                ids.append(row_id)
+                if wanted is not None and len(ids) >= wanted:
+                    break
+        return ids
+
+    def _project(self, table: MemoryTable, row: Dict[str, Any], columns: str) -> Dict[str, Any]:
+        parts = [p.strip() for p in _split_top_level(re.sub(r"\s+", "", columns or "*"))]
+        out: Dict[str, Any] = {}
+        for part in parts:
+            if part == "*":
+                out.update(row)
+            elif "(" in part:
+                child, _, inner = part.partition("(")
+                if inner.rstrip(")") == "count":
+                    foreign_key = f"{table.name.rstrip('s')}_id"
+                    total = sum(1 for r in self.table(child).rows.values() if r.get(foreign_key) == row["id"])
+                    out[child] = [{"count": total}]
+            else:
+                out[part] = row.get(part)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"rows": len(t.rows), "tokens": len(t.inverted)}
+            for name, t in self.tables.items()
+        }
+
+
+memory_backend = MemoryBackend()
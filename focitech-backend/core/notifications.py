@@ -0,0 +1,148 @@
+# core/notifications.py
+"""
+Staff and applicant notifications, run by the task worker (core/task_queue.py).
+
+Handlers here are registered by name. The API and `worker.py` both import
+this module, so whichever process runs the worker can execute them.
+`notify_later` is what routers call: the row is already saved by then, so
+a queue failure is logged and never turned into an error for the visitor.
+
+Staff alerts for new inquiries and applications go to NOTIFY_ADMIN_EMAILS.
+They are sent one mail per event, or, when NOTIFY_DIGEST_SECONDS is set,
+collected into one digest mail per interval. Digest lines are stored in
+the task queue (`collect`), not in process memory: they survive a crash,
+and every API process and worker feeds the same digest. The first line of
+an interval queues a delayed `notify.digest` job that mails all stored
+lines and deletes them only once the mail went out. Applicant emails for status changes are always sent right away,
+as one job per applicant: a retry after a dropped connection never
+re-sends mail that already went out. The jobs still share the pooled SMTP
+sessions (core/mailer.py), so a bulk change does not reconnect per mail.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Iterable
+
+from core.config import settings
+from core.mailer import build_message, mailer, recipients
+from core.task_queue import collect, enqueue, on_worker_stop, task_backend, task_handler
+
+logger = logging.getLogger("focitech_api")
+
+# Applicant-facing copy per pipeline stage; stages missing here send nothing
+STATUS_EMAILS: Dict[str, Dict[str, str]] = {
+    "reviewing": {
+        "subject": "Your application for {job_title} is under review",
+        "body": "Hi {name},\n\nThanks for applying for {job_title} at Focitech. "
+                "Our HR team is now reviewing your application.\n\nTeam Focitech",
+    },
+    "shortlisted": {
+        "subject": "You have been shortlisted for {job_title}",
+        "body": "Hi {name},\n\nGood news: you have been shortlisted for {job_title}. "
+                "Our HR team will contact you shortly about the next steps.\n\nTeam Focitech",
+    },
+    "rejected": {
+        "subject": "Update on your application for {job_title}",
+        "body": "Hi {name},\n\nThank you for your interest in {job_title}. After careful review, "
+                "we will not be moving forward with your application at this time.\n\nTeam Focitech",
+    },
+    "hired": {
+        "subject": "Welcome to Focitech!",
+        "body": "Hi {name},\n\nCongratulations, we are delighted to offer you the {job_title} role. "
+                "Our HR team will be in touch with the details.\n\nTeam Focitech",
+    },
+}
+
+
+async def notify_later(name: str, payload: Dict[str, Any]):
+    """Queue a notification; failures are logged, not raised."""
+    try:
+        await enqueue(name, payload)
+    except Exception as e:
+        logger.error(f"❌ Could not queue {name}: {str(e)}")
+
+
+async def notify_applicants(status: str, applications: Iterable[Dict[str, Any]]):
+    """Queue one status-change email job per updated application row."""
+    if status not in recipients(settings.APPLICANT_STATUS_EMAILS):
+        return
+    for row in applications:
+        if row.get("email"):
+            applicant = {"id": row["id"], "name": row["name"], "email": row["email"], "job_title": row["job_title"]}
+            await notify_later("application.status_changed", {"status": status, "applicant": applicant})
+
+
+# --- Admin digest ---
+
+DIGEST_BATCH = "admin_digest"
+
+
+async def alert_admins(kind: str, subject: str, line: str):
+    """One staff email now, or a line in the next digest."""
+    admins = recipients(settings.NOTIFY_ADMIN_EMAILS)
+    if not admins:
+        logger.info(f"📧 {line}")
+        return
+    if settings.NOTIFY_DIGEST_SECONDS > 0:
+        await collect(DIGEST_BATCH, {"kind": kind, "line": line}, "notify.digest", settings.NOTIFY_DIGEST_SECONDS)
+        return
+    await mailer.send([build_message(admins, subject, line)])
+
+
+@on_worker_stop
+async def close_notifications():
+    await asyncio.to_thread(mailer.close)
+
+
+# --- Job handlers ---
+
+@task_handler("inquiry.notify_admin")
+async def notify_admin_of_inquiry(payload: dict):
+    await alert_admins(
+        "inquiry",
+        f"New inquiry: {payload.get('subject', 'Contact form')}",
+        f"NEW INQUIRY: {payload['name']} ({payload['email']}) registered in the Focitech ecosystem.",
+    )
+
+
+@task_handler("application.notify_hr")
+async def notify_hr_of_application(payload: dict):
+    await alert_admins(
+        "application",
+        f"New application for {payload['job_title']}",
+        f"NEW APPLICATION #{payload['application_id']}: {payload['name']} ({payload['email']}) "
+        f"for {payload['job_title']}.",
+    )
+
+
+@task_handler("notify.digest")
+async def send_admin_digest(payload: dict):
+    stored = await asyncio.to_thread(task_backend.batch_items, payload["batch"])
+    if not stored:
+        return
+    events = [event for _, event in stored]
+    admins = recipients(settings.NOTIFY_ADMIN_EMAILS)
+    sections = []
+    for kind, title in (("inquiry", "New inquiries"), ("application", "New applications")):
+        lines = [event["line"] for event in events if event["kind"] == kind]
+        if lines:
+            sections.append(f"{title} ({len(lines)}):\n" + "\n".join(f"  - {line}" for line in lines))
+    subject = f"Focitech digest: {len(events)} new event{'s' if len(events) != 1 else ''}"
+    if admins:
+        await mailer.send([build_message(admins, subject, "\n\n".join(sections))])
+    # Lines stored while this mail was going out stay for the next digest
+    await asyncio.to_thread(task_backend.drop_batch_items, payload["batch"], stored[-1][0])
+
+
+@task_handler("application.status_changed")
+async def notify_applicant_of_status(payload: dict):
+    template = STATUS_EMAILS.get(payload["status"])
+    if template is None:
+        return
+    applicant = payload["applicant"]
+    message = build_message(
+        [applicant["email"]],
+        template["subject"].format(**applicant),
+        template["body"].format(**applicant),
+    )
+    if await mailer.send([message]):
+        logger.info(f"📧 Application #{applicant['id']} applicant notified: status {payload['status']}")
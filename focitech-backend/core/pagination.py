@@ -0,0 +1,59 @@
+# core/pagination.py
+"""
+Keyset (cursor) pagination over `(sort_column, id)`.
+
+Instead of `offset`, the next page starts strictly after the last row of
+the current one:
+
+    (created_at, id) < (last_created_at, last_id)    -- newest first
+
+so every page costs the same index range scan however deep the client
+scrolls. Cursors are opaque url-safe base64 tokens. List endpoints keep
+their plain JSON array bodies (the frontend expects arrays) and return
+the token for the following page in the `X-Next-Cursor` header, which is
+absent on the last page.
+"""
+import json
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+
+from core.repository import Query, format_value, quote_value
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    raw = json.dumps([format_value(sort_value), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return sort_value, row_id
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+def keyset(query: Query, column: str, cursor: Optional[str], limit: int) -> Query:
+    """Order newest-first on (column, id), seek past `cursor` and fetch one extra row."""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        value, last_id = quote_value(sort_value), quote_value(row_id)
+        query = query.or_(f"{column}.lt.{value},and({column}.eq.{value},id.lt.{last_id})")
+    # The extra row only tells us whether another page exists
+    return query.order(column, desc=True).order("id", desc=True).limit(limit + 1)
+
+
+def paginate(rows: List[Dict[str, Any]], column: str, limit: int, response: Response) -> List[Dict[str, Any]]:
+    """Trim the look-ahead row and expose the next cursor header when there is more."""
+    rows = rows or []
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last[column], last["id"])
+    return rows
@@ -0,0 +1,193 @@
+# core/query_cache.py
+"""
+Read-through cache for public PostgREST reads.
+
+Portfolio, team and careers data only change when an admin edits them, so
+list/detail queries opted in with `.cache()` are answered from memory:
+
+    await db.table("projects").select("*").eq("id", 3).cache().execute()
+
+Entries are keyed by table + normalized query (filter order does not
+matter), bounded by count and bytes (LRU) and expire after QUERY_CACHE_TTL.
+Every write that goes through the repository invalidates precisely:
+list queries on the written table are dropped, detail queries (`id=eq.X`)
+only when X was touched, and anything that embeds the table (for example
+`job_applications(count)` inside a jobs select) is dropped too.
+
+The cache is per worker process; other workers converge within the TTL.
+"""
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Set
+
+EMBEDDED_RESOURCE = re.compile(r"(\w+)(?:!\w+)?\s*\(")
+
+
+@dataclass
+class CacheEntry:
+    table: str
+    payload: bytes
+    count: Optional[int]
+    expires: float
+    tags: Set[str] = field(default_factory=set)
+    pinned_id: Optional[str] = None
+    # Content digest, computed once per entry and reused as the HTTP ETag
+    etag: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+def query_tags(query) -> Set[str]:
+    """Tables whose writes can change this query's result."""
+    return {query.table, *EMBEDDED_RESOURCE.findall(query.columns), *query.cache_depends_on}
+
+
+def pinned_id(filters) -> Optional[str]:
+    for column, expression in filters:
+        if column == "id" and expression.startswith("eq."):
+            return expression[3:]
+    return None
+
+
+def affected_ids(query, data: Any) -> Optional[Set[str]]:
+    """Row ids a write touched, or None when that cannot be told."""
+    target = pinned_id(query.filters)
+    if target is not None:
+        return {target}
+    rows = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+    if rows and all("id" in row for row in rows):
+        return {str(row["id"]) for row in rows}
+    return None
+
+
+class QueryCache:
+    """LRU + TTL store of serialized query results with table-level tags."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int, enabled: bool = True):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Bumped on every write so a read that raced a write is not stored
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # --- Keys ---
+    @staticmethod
+    def key_for(query) -> str:
+        return json.dumps([
+            query.table,
+            re.sub(r"\s+", "", query.columns),
+            query.count,
+            query.single_row,
+            sorted(query.filters),
+            query.ordering,
+            query.limit_value,
+            query.offset_value or 0,
+        ], separators=(",", ":"))
+
+    def generation(self, tags: Iterable[str]) -> tuple:
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in sorted(tags))
+
+    # --- Reads ---
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires <= time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, query, data: Any, count: Optional[int], generation: tuple, ttl: Optional[int] = None,
+            encoder=None) -> Optional[CacheEntry]:
+        tags = query_tags(query)
+        payload = json.dumps(data, default=encoder, separators=(",", ":")).encode("utf-8")
+        entry = CacheEntry(
+            table=query.table,
+            payload=payload,
+            count=count,
+            expires=time.monotonic() + (ttl or self.ttl),
+            tags=tags,
+            pinned_id=pinned_id(query.filters),
+            etag=hashlib.blake2b(payload, digest_size=16).hexdigest(),
+        )
+        if entry.size > self.max_bytes:
+            return None
+        with self._lock:
+            if tuple(self._generations.get(t, 0) for t in sorted(tags)) != generation:
+                return None
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    # --- Invalidation ---
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def invalidate(self, table: str, ids: Optional[Set[str]] = None) -> int:
+        """Drop entries affected by a write to `table` touching `ids` (None = unknown rows)."""
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [
+                key for key, entry in self._entries.items()
+                if table in entry.tags and (
+                    entry.table != table
+                    or entry.pinned_id is None
+                    or ids is None
+                    or entry.pinned_id in ids
+                )
+            ]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def invalidate_write(self, query, data: Any) -> int:
+        return self.invalidate(query.table, affected_ids(query, data))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
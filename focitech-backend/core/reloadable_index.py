@@ -0,0 +1,112 @@
+# core/reloadable_index.py
+"""
+Shared lifecycle for the in-memory read indexes (core/facets.py,
+core/suggest.py).
+
+An index mirrors some columns of one table, per document. Admin writes
+`upsert`/`remove` single rows; readers call `ensure()`, which reloads the
+whole table when the index is empty or older than its refresh window (so
+edits made directly in Supabase show up). Subclasses only say how one
+row is added, discarded and cleared, plus any extra stats.
+"""
+import time
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.repository import db
+
+logger = logging.getLogger("focitech_api")
+
+
+class ReloadableIndex(ABC):
+    """Per-document index over `columns` of `table`, rebuilt every `refresh_seconds`."""
+
+    # Used in the reload log line
+    label = "Index"
+    emoji = "🗂️"
+
+    def __init__(self, table: str, columns: Iterable[str], refresh_seconds: int, active_only: bool):
+        self.table = table
+        self.columns = tuple(columns)
+        self.refresh_seconds = refresh_seconds
+        self.active_only = active_only
+        self._docs: Dict[Any, Any] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self.reloads = 0
+
+    # --- Per-document hooks (called under self._lock) ---
+    @abstractmethod
+    def _add(self, doc_id, row: Dict[str, Any]): ...
+
+    @abstractmethod
+    def _discard(self, doc_id): ...
+
+    @abstractmethod
+    def _clear(self):
+        """Drop everything derived from documents (self._docs is cleared by the caller)."""
+
+    def _extra_stats(self) -> Dict[str, Any]:
+        return {}
+
+    # --- Maintenance ---
+    def _indexable(self, row: Dict[str, Any]) -> bool:
+        return not self.active_only or row.get("is_active", True)
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        with self._lock:
+            self._docs.clear()
+            self._clear()
+            for row in rows:
+                if self._indexable(row):
+                    self._add(row["id"], row)
+            self._loaded_at = time.monotonic()
+            self.reloads += 1
+
+    def upsert(self, row: Dict[str, Any]):
+        """Re-index a created/updated row; inactive rows drop out when active_only."""
+        with self._lock:
+            self._discard(row["id"])
+            if self._indexable(row):
+                self._add(row["id"], row)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._discard(doc_id)
+
+    # --- Reloading ---
+    @property
+    def stale(self) -> bool:
+        return self._loaded_at == 0.0 or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    async def ensure(self):
+        """Reload from the table when empty or older than the refresh window; returns self."""
+        if not self.stale:
+            return self
+
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        async with self._reload_lock:
+            # Another request may have reloaded while we waited
+            if self.stale:
+                columns = ["id", *self.columns] + (["is_active"] if self.active_only else [])
+                query = db.table(self.table).select(", ".join(columns))
+                if self.active_only:
+                    query = query.eq("is_active", True)
+                result = await query.execute()
+                self.rebuild(result.data or [])
+                logger.info(f"{self.emoji} {self.label} for {self.table} rebuilt from {len(result.data or [])} rows")
+        return self
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                **self._extra_stats(),
+                "reloads": self.reloads,
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            }
@@ -0,0 +1,513 @@
+# core/repository.py
+"""
+Async data-access layer for Supabase (PostgREST tables + Storage).
+
+supabase-py's builders are synchronous, so calling `.execute()` inside an
+`async def` handler blocks the whole uvicorn worker until PostgREST answers.
+This module speaks to the same REST endpoints through a shared
+`httpx.AsyncClient`, exposing a fluent builder that mirrors the supabase-py
+API closely enough that routers only need an `await` in front of the chain:
+
+    result = await db.table("projects").select("*").eq("id", 1).execute()
+
+The pooled clients come from core/supabase.py and are opened and closed in
+`main.lifespan`. With DATA_BACKEND=threadpool the same queries are replayed onto the legacy
+supabase-py client instead, each on its upstream's bulkhead (core/executor.py).
+"""
+import io
+import os
+import enum
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.executor import run_in_bulkhead
+from core.query_cache import QueryCache, query_tags
+from core.memory_index import UnknownFunction, memory_backend
+from core.supabase import get_supabase, http_clients, is_configured, open_http_clients, close_http_clients
+
+logger = logging.getLogger("focitech_api")
+
+
+class RepositoryError(Exception):
+    """Raised when PostgREST or Storage rejects a request."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+@dataclass
+class QueryResult:
+    """Same shape as supabase-py's APIResponse (`.data`, `.count`)."""
+    data: Any
+    count: Optional[int] = None
+    # Content digest when the result went through the query cache
+    etag: Optional[str] = None
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+def format_value(value: Any) -> str:
+    """Render a Python value the way PostgREST expects it inside a filter."""
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def quote_value(value: Any) -> str:
+    """Format a value and double-quote it if PostgREST would treat any character as syntax."""
+    text = format_value(value)
+    if any(ch in text for ch in ',.:()"\\ '):
+        text = '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return text
+
+
+class Query:
+    """Fluent, awaitable PostgREST request (select / insert / update / delete)."""
+
+    def __init__(self, repository: "Repository", table: str):
+        self._repository = repository
+        self.table = table
+        self.method = "GET"
+        self.columns = "*"
+        self.count: Optional[str] = None
+        self.payload: Any = None
+        self.filters: List[Tuple[str, str]] = []
+        self.ordering: List[str] = []
+        self.limit_value: Optional[int] = None
+        self.offset_value: Optional[int] = None
+        self.single_row = False
+        self.cache_ttl: Optional[int] = None
+        self.cache_depends_on: Tuple[str, ...] = ()
+
+    # --- Verbs ---
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "Query":
+        self.method = "GET"
+        self.columns = columns
+        self.count = count
+        return self
+
+    def insert(self, data) -> "Query":
+        self.method = "POST"
+        self.payload = data
+        return self
+
+    def update(self, data: Dict[str, Any]) -> "Query":
+        self.method = "PATCH"
+        self.payload = data
+        return self
+
+    def delete(self) -> "Query":
+        self.method = "DELETE"
+        return self
+
+    def returning(self, columns: str) -> "Query":
+        """Columns echoed back by insert/update/delete (return=representation)."""
+        self.columns = columns
+        return self
+
+    # --- Filters ---
+    def filter(self, column: str, operator: str, value: Any) -> "Query":
+        self.filters.append((column, f"{operator}.{value}"))
+        return self
+
+    def eq(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "eq", format_value(value))
+
+    def neq(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "neq", format_value(value))
+
+    def gt(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "gt", format_value(value))
+
+    def gte(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "gte", format_value(value))
+
+    def lt(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "lt", format_value(value))
+
+    def lte(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "lte", format_value(value))
+
+    def ilike(self, column: str, pattern: str) -> "Query":
+        return self.filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "is", format_value(value))
+
+    def in_(self, column: str, values) -> "Query":
+        return self.filter(column, "in", "(" + ",".join(quote_value(v) for v in values) + ")")
+
+    def contains(self, column: str, values) -> "Query":
+        return self.filter(column, "cs", "{" + ",".join(quote_value(v) for v in values) + "}")
+
+    def arg(self, name: str, value: Any) -> "Query":
+        """Function argument for `rpc_select` queries (sent as a plain query parameter)."""
+        self.filters.append((name, format_value(value)))
+        return self
+
+    def or_(self, expression: str) -> "Query":
+        self.filters.append(("or", f"({expression})"))
+        return self
+
+    # --- Modifiers ---
+    def order(self, column: str, desc: bool = False) -> "Query":
+        self.ordering.append(f"{column}.{'desc' if desc else 'asc'}")
+        return self
+
+    def limit(self, count: int) -> "Query":
+        self.limit_value = count
+        return self
+
+    def range(self, start: int, end: int) -> "Query":
+        self.offset_value = start
+        self.limit_value = end - start + 1
+        return self
+
+    def single(self) -> "Query":
+        """Return the first matching row (or None) instead of a list."""
+        self.single_row = True
+        self.limit_value = 1
+        return self
+
+    def cache(self, ttl: Optional[int] = None, depends_on: Tuple[str, ...] = ()) -> "Query":
+        """Serve this read from the query cache; `depends_on` lists extra tables whose writes invalidate it."""
+        self.cache_ttl = ttl or settings.QUERY_CACHE_TTL
+        self.cache_depends_on = tuple(depends_on)
+        return self
+
+    @property
+    def cacheable(self) -> bool:
+        return self.method == "GET" and self.cache_ttl is not None and query_cache.enabled
+
+    def params(self) -> List[Tuple[str, str]]:
+        params: List[Tuple[str, str]] = []
+        if self.method == "GET" or self.columns != "*":
+            params.append(("select", self.columns))
+        params.extend(self.filters)
+        if self.ordering:
+            params.append(("order", ",".join(self.ordering)))
+        if self.limit_value is not None:
+            params.append(("limit", str(self.limit_value)))
+        if self.offset_value:
+            params.append(("offset", str(self.offset_value)))
+        return params
+
+    async def execute(self) -> QueryResult:
+        return await self._repository.execute(self)
+
+
+async def _file_chunks(stream) -> AsyncIterator[bytes]:
+    """Read a (possibly disk-backed) file object off the event loop, one chunk at a time."""
+    while True:
+        chunk = await run_in_threadpool(stream.read, settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _storage3_body(file):
+    """
+    storage3 only sends bytes, BufferedReader or FileIO; anything else it
+    passes to open() as a path. Starlette's SpooledTemporaryFile is none of
+    these, so a disk-backed spool gets a BufferedReader over a dup of its
+    descriptor (still streamed) and an in-memory spool (< 1 MB) its bytes.
+    Returns (body, reader_to_close). Runs inside the bulkhead thread.
+    """
+    if isinstance(file, (bytes, io.BufferedReader, io.FileIO)):
+        return file, None
+    if isinstance(getattr(file, "_file", file), io.BytesIO):
+        return file.read(), None
+    try:
+        fd = file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return file.read(), None
+    reader = open(os.dup(fd), "rb")
+    reader.seek(file.tell())
+    return reader, reader
+
+
+class StorageBucket:
+    """Minimal async wrapper over the Supabase Storage object API."""
+
+    def __init__(self, repository: "Repository", bucket: str):
+        self._repository = repository
+        self.bucket = bucket
+
+    async def upload(self, path: str, file, content_type: str = "application/octet-stream",
+                     size: Optional[int] = None, upsert: bool = False) -> str:
+        """
+        Upload bytes or a binary file object; file objects are streamed, never read whole.
+        `upsert` overwrites an existing object instead of failing (content-addressed paths).
+        """
+        if self._repository.threadpool_mode:
+            options = {"content-type": content_type, "upsert": "true" if upsert else "false"}
+
+            def sync_upload():
+                body, reader = _storage3_body(file)
+                try:
+                    _sync_client().storage.from_(self.bucket).upload(path=path, file=body, file_options=options)
+                finally:
+                    if reader is not None:
+                        reader.close()
+
+            await run_in_bulkhead("storage", sync_upload)
+            return path
+
+        headers = {"content-type": content_type}
+        if upsert:
+            headers["x-upsert"] = "true"
+        if hasattr(file, "read"):
+            content = _file_chunks(file)
+            if size is not None:
+                headers["content-length"] = str(size)
+        else:
+            content = file
+        response = await self._repository.storage_client.post(
+            f"/storage/v1/object/{self.bucket}/{path}",
+            content=content,
+            headers=headers,
+        )
+        self._repository.raise_for_status(response)
+        return path
+
+    def get_public_url(self, path: str) -> str:
+        return f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/object/public/{self.bucket}/{path}"
+
+
+class Repository:
+    """Routes every table and storage call through the shared upstream pools."""
+
+    @property
+    def configured(self) -> bool:
+        return is_configured()
+
+    @property
+    def threadpool_mode(self) -> bool:
+        return settings.DATA_BACKEND == "threadpool"
+
+    @staticmethod
+    def _pool(upstream: str) -> httpx.AsyncClient:
+        client = http_clients.get(upstream)
+        if client is None:
+            raise RuntimeError("Supabase HTTP pools are not open. Is main.lifespan running?")
+        return client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._pool("rest")
+
+    @property
+    def storage_client(self) -> httpx.AsyncClient:
+        return self._pool("storage")
+
+    async def connect(self):
+        if not self.configured:
+            logger.warning("⚠️ Supabase not configured: tables are served by the in-memory index (core/memory_index.py)")
+            return
+        if self.threadpool_mode:
+            get_supabase()
+            logger.info("🧵 Repository using sync Supabase client on bounded thread pools.")
+            return
+        await open_http_clients()
+
+    async def close(self):
+        await close_http_clients()
+
+    # --- Entry points ---
+    def table(self, name: str) -> Query:
+        return Query(self, name)
+
+    def storage(self, bucket: str) -> StorageBucket:
+        return StorageBucket(self, bucket)
+
+    def rpc_select(self, function: str, **args: Any) -> Query:
+        """
+        Read from a set-returning SQL function as if it were a table
+        (GET /rest/v1/rpc/<fn>?arg=...), so select lists, filters, embedding,
+        limits and the query cache all still apply to its rows.
+        """
+        query = Query(self, f"rpc/{function}")
+        for name, value in args.items():
+            query.arg(name, value)
+        return query
+
+    async def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> QueryResult:
+        if not self.configured:
+            raise RepositoryError(f"function {function} not available offline", status_code=404, code="PGRST202")
+        if self.threadpool_mode:
+            response = await run_in_bulkhead(
+                "postgrest", lambda: _sync_client().rpc(function, params or {}).execute()
+            )
+            return QueryResult(data=response.data)
+
+        response = await self.client.post(
+            f"/rest/v1/rpc/{function}",
+            content=json.dumps(params or {}, default=_json_default),
+            headers={"content-type": "application/json"},
+        )
+        self.raise_for_status(response)
+        return QueryResult(data=response.json() if response.content else None)
+
+    # --- Transport ---
+    @staticmethod
+    def raise_for_status(response: httpx.Response):
+        if response.status_code < 400:
+            return
+        try:
+            body = response.json()
+            message, code = body.get("message") or body.get("error") or response.text, body.get("code")
+        except ValueError:
+            message, code = response.text, None
+        raise RepositoryError(message, status_code=response.status_code, code=code)
+
+    async def execute(self, query: Query) -> QueryResult:
+        if not query.cacheable:
+            result = await self._execute(query)
+            if query.method != "GET":
+                query_cache.invalidate_write(query, result.data)
+            return result
+
+        key = query_cache.key_for(query)
+        entry = query_cache.get(key)
+        if entry is not None:
+            return QueryResult(data=json.loads(entry.payload), count=entry.count, etag=entry.etag)
+
+        generation = query_cache.generation(query_tags(query))
+        result = await self._execute(query)
+        entry = query_cache.put(key, query, result.data, result.count, generation, query.cache_ttl, encoder=_json_default)
+        if entry is not None:
+            result.etag = entry.etag
+        return result
+
+    async def execute_offline(self, query: Query) -> QueryResult:
+        """Run a query on the in-memory index (offline mode, or a degraded-mode fallback)."""
+        if query.payload is not None:
+            # Same JSON normalization the HTTP path applies (datetimes, enums)
+            query.payload = json.loads(json.dumps(query.payload, default=_json_default))
+        try:
+            data, count = memory_backend.execute(query)
+        except UnknownFunction as e:
+            raise RepositoryError(f"function {e} not found", status_code=404, code="PGRST202")
+        if query.single_row:
+            data = data[0] if data else None
+        return QueryResult(data=data, count=count)
+
+    async def _execute(self, query: Query) -> QueryResult:
+        if not self.configured:
+            return await self.execute_offline(query)
+        if self.threadpool_mode:
+            return await run_in_bulkhead("postgrest", _sync_execute, query)
+
+        prefer = []
+        if query.count:
+            prefer.append(f"count={query.count}")
+        if query.method != "GET":
+            prefer.append("return=representation")
+
+        headers = {"content-type": "application/json"}
+        if prefer:
+            headers["Prefer"] = ",".join(prefer)
+
+        content = None
+        if query.payload is not None:
+            content = json.dumps(query.payload, default=_json_default)
+
+        response = await self.client.request(
+            query.method,
+            f"/rest/v1/{query.table}",
+            params=query.params(),
+            content=content,
+            headers=headers,
+        )
+        self.raise_for_status(response)
+
+        data = response.json() if response.content else []
+        count = None
+        content_range = response.headers.get("content-range")
+        if content_range and "/" in content_range:
+            total = content_range.split("/")[-1]
+            count = int(total) if total.isdigit() else None
+
+        if query.single_row:
+            data = data[0] if data else None
+        return QueryResult(data=data, count=count)
+
+
+# --- Legacy sync client replay (DATA_BACKEND=threadpool) ---
+
+def _sync_client():
+    if not is_configured():
+        raise RepositoryError("Supabase client is not configured")
+    return get_supabase()
+
+
+def _sync_execute(query: Query) -> QueryResult:
+    """Rebuild a Query on the supabase-py builder. Runs inside a bulkhead thread."""
+    if query.table.startswith("rpc/"):
+        # The builder has no select/order on rpc(); use its underlying HTTP session
+        response = _sync_client().postgrest.session.get(f"/{query.table}", params=query.params())
+        Repository.raise_for_status(response)
+        data = response.json() if response.content else []
+        if query.single_row:
+            data = data[0] if data else None
+        return QueryResult(data=data)
+
+    table = _sync_client().table(query.table)
+    if query.method == "POST":
+        builder = table.insert(query.payload)
+    elif query.method == "PATCH":
+        builder = table.update(query.payload)
+    elif query.method == "DELETE":
+        builder = table.delete()
+    else:
+        builder = table.select(query.columns, count=query.count)
+
+    for column, expression in query.filters:
+        if column == "or":
+            builder = builder.or_(expression[1:-1])
+        else:
+            operator, _, value = expression.partition(".")
+            builder = builder.filter(column, operator, value)
+
+    for ordering in query.ordering:
+        column, _, direction = ordering.rpartition(".")
+        builder = builder.order(column, desc=direction == "desc")
+
+    if query.limit_value is not None:
+        start = query.offset_value or 0
+        builder = builder.range(start, start + query.limit_value - 1)
+
+    response = builder.execute()
+    data = response.data
+    if query.single_row:
+        data = data[0] if data else None
+    return QueryResult(data=data, count=response.count)
+
+
+# Global repository object and its read-through cache
+query_cache = QueryCache(
+    settings.QUERY_CACHE_MAX_ENTRIES, settings.QUERY_CACHE_MAX_BYTES, settings.QUERY_CACHE_TTL,
+    enabled=settings.QUERY_CACHE_ENABLED,
+)
+db = Repository()
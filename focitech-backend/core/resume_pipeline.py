@@ -0,0 +1,240 @@
+# core/resume_pipeline.py
+"""
+Background resume uploads for RESUME_UPLOAD_MODE=async.
+
+`/careers/apply` spools the validated resume to RESUME_SPOOL_DIR, inserts
+the application with `resume_status='pending'` and answers 202. Worker
+tasks then push the spooled file to the `resumes` bucket, retrying with
+exponential backoff, and patch `resume_url` / `resume_status` on the row.
+
+Every spooled file sits next to a small JSON manifest. A manifest is only
+deleted after the row has been patched, so anything a restart interrupts
+is found again by `recover()` at boot and re-queued.
+"""
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from core.repository import db
+from core.resume_store import record_resume
+
+logger = logging.getLogger("focitech_api")
+
+# How many finished jobs /careers/apply/{tracking_id} can still report on
+_RECENT_LIMIT = 1000
+
+
+@dataclass
+class ResumeJob:
+    tracking_id: str
+    bucket: str
+    cloud_path: str
+    extension: str
+    content_type: str
+    size: int
+    sha256: str
+    application_id: Optional[int] = None
+    # Set once the object is in storage, so a retry only re-attempts the row patch
+    resume_url: Optional[str] = None
+    state: str = "queued"  # queued -> uploading -> uploaded | failed
+    attempts: int = 0
+    last_error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+    def public(self) -> Dict[str, Any]:
+        return {
+            "tracking_id": self.tracking_id,
+            "application_id": self.application_id,
+            "state": self.state,
+            "attempts": self.attempts,
+        }
+
+
+class ResumeUploader:
+    """Disk-backed upload queue drained by a small pool of asyncio workers."""
+
+    def __init__(self, spool_dir: Path, workers: int, max_attempts: int, backoff: float, backoff_max: float):
+        self.spool_dir = Path(spool_dir)
+        self.worker_count = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._queue: Optional["asyncio.Queue[ResumeJob]"] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, ResumeJob]" = OrderedDict()
+        self.uploaded = 0
+        self.failed = 0
+        self.recovered = 0
+
+    # --- Spool files ---
+    def _data_path(self, job: ResumeJob) -> Path:
+        return self.spool_dir / f"{job.tracking_id}{job.extension}"
+
+    def _manifest_path(self, tracking_id: str) -> Path:
+        return self.spool_dir / f"{tracking_id}.json"
+
+    def _save(self, job: ResumeJob):
+        tmp = self._manifest_path(job.tracking_id).with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(job)))
+        tmp.replace(self._manifest_path(job.tracking_id))
+
+    def _discard(self, job: ResumeJob):
+        self._data_path(job).unlink(missing_ok=True)
+        self._manifest_path(job.tracking_id).unlink(missing_ok=True)
+
+    def _remember(self, job: ResumeJob):
+        self._jobs[job.tracking_id] = job
+        self._jobs.move_to_end(job.tracking_id)
+        while len(self._jobs) > _RECENT_LIMIT:
+            self._jobs.popitem(last=False)
+
+    def spool(self, upload, bucket: str, cloud_path: str) -> ResumeJob:
+        """Copy a validated upload (core/uploads.IngestedFile) into the spool. Blocking disk IO."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        job = ResumeJob(
+            tracking_id=uuid.uuid4().hex, bucket=bucket, cloud_path=cloud_path,
+            extension=upload.extension, content_type=upload.content_type,
+            size=upload.size, sha256=upload.sha256,
+        )
+        with open(self._data_path(job), "wb") as f:
+            while chunk := upload.stream.read(settings.UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
+        self._save(job)
+        return job
+
+    def abandon(self, job: ResumeJob):
+        """Drop a spooled resume whose application row could not be created."""
+        self._discard(job)
+
+    async def enqueue(self, job: ResumeJob, application_id: int):
+        job.application_id = application_id
+        await asyncio.to_thread(self._save, job)
+        self._remember(job)
+        await self._queue.put(job)
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._workers:
+            return
+        # Created here so the queue belongs to the serving event loop
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        logger.info(f"📮 Resume uploader started ({self.worker_count} workers)")
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def recover(self) -> int:
+        """Re-queue every manifest left in the spool by a previous process."""
+        if not self.spool_dir.exists():
+            return 0
+        count = 0
+        for manifest in sorted(self.spool_dir.glob("*.json")):
+            try:
+                job = ResumeJob(**json.loads(manifest.read_text()))
+            except (ValueError, TypeError) as e:
+                logger.error(f"❌ Unreadable resume manifest {manifest.name}: {str(e)}")
+                continue
+            if job.application_id is None or not self._data_path(job).exists():
+                # Crashed before the row existed (or the file is gone): nothing to attach it to
+                self._discard(job)
+                continue
+            job.state, job.attempts = "queued", 0
+            self._remember(job)
+            self._queue.put_nowait(job)
+            count += 1
+        self.recovered += count
+        if count:
+            logger.warning(f"♻️ Recovered {count} pending resume uploads from the spool")
+        return count
+
+    # --- Workers ---
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except Exception as e:
+                logger.error(f"❌ Resume worker {index} crashed on {job.tracking_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _upload_once(self, job: ResumeJob) -> str:
+        with open(self._data_path(job), "rb") as f:
+            await db.storage(job.bucket).upload(
+                path=job.cloud_path, file=f, content_type=job.content_type, size=job.size, upsert=True,
+            )
+        url = db.storage(job.bucket).get_public_url(job.cloud_path)
+        await record_resume(job.sha256, job.cloud_path, url, job.size, job.content_type)
+        return url
+
+    async def _process(self, job: ResumeJob):
+        job.state = "uploading"
+        while True:
+            job.attempts += 1
+            try:
+                if job.resume_url is None:
+                    job.resume_url = await self._upload_once(job)
+                await db.table("job_applications").update(
+                    {"resume_url": job.resume_url, "resume_status": "uploaded"}
+                ).eq("id", job.application_id).execute()
+                break
+            except Exception as e:
+                job.last_error = str(e)
+                if job.attempts >= self.max_attempts:
+                    await self._give_up(job)
+                    return
+                delay = min(self.backoff_max, self.backoff * 2 ** (job.attempts - 1))
+                logger.warning(f"⏳ Resume upload {job.tracking_id} failed (attempt {job.attempts}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+
+        job.state = "uploaded"
+        self.uploaded += 1
+        await asyncio.to_thread(self._discard, job)
+        logger.info(f"☁️ Resume for application {job.application_id} uploaded after {job.attempts} attempt(s)")
+
+    async def _give_up(self, job: ResumeJob):
+        job.state = "failed"
+        self.failed += 1
+        # The spooled file and manifest stay put; the next boot retries them
+        await asyncio.to_thread(self._save, job)
+        try:
+            await db.table("job_applications").update({"resume_status": "failed"}).eq("id", job.application_id).execute()
+        except Exception as e:
+            logger.error(f"❌ Could not flag application {job.application_id} resume as failed: {str(e)}")
+        logger.error(f"❌ Resume upload {job.tracking_id} gave up after {job.attempts} attempts: {job.last_error}")
+
+    # --- Reads ---
+    def status(self, tracking_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(tracking_id)
+        return job.public() if job else None
+
+    def stats(self) -> dict:
+        return {
+            "mode": settings.RESUME_UPLOAD_MODE,
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "uploaded": self.uploaded,
+            "failed": self.failed,
+            "recovered": self.recovered,
+        }
+
+
+resume_uploader = ResumeUploader(
+    Path(settings.RESUME_SPOOL_DIR),
+    workers=settings.RESUME_UPLOAD_WORKERS,
+    max_attempts=settings.RESUME_UPLOAD_MAX_ATTEMPTS,
+    backoff=settings.RESUME_UPLOAD_BACKOFF,
+    backoff_max=settings.RESUME_UPLOAD_BACKOFF_MAX,
+)
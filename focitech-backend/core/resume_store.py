@@ -0,0 +1,54 @@
+# core/resume_store.py
+"""
+Content-addressed resume storage.
+
+Resumes are stored under their SHA-256 (computed while the upload streams,
+see core/uploads.py), and the `resume_objects` table (sql/008) maps each hash
+to the stored object. When a candidate sends the same PDF to several
+openings, or a client retries, the bytes are already in the bucket: the
+lookup hits and the storage upload is skipped entirely.
+
+Lookup failures (table not deployed, database hiccup) never block an
+application; they just mean the file is uploaded again. Because the path
+is derived from the hash, that upload overwrites identical bytes.
+"""
+import logging
+from typing import Optional
+
+from core.repository import db, RepositoryError
+
+logger = logging.getLogger("focitech_api")
+
+RESUME_OBJECTS_TABLE = "resume_objects"
+
+
+def content_path(folder: str, sha256: str, extension: str) -> str:
+    """Bucket path for a resume; two-character fan-out keeps listings small."""
+    return f"{folder}/{sha256[:2]}/{sha256}{extension}"
+
+
+async def find_resume(sha256: str) -> Optional[str]:
+    """Public URL of an already stored resume with this digest, if any."""
+    try:
+        result = await db.table(RESUME_OBJECTS_TABLE).select("public_url").eq("sha256", sha256).cache().execute()
+    except Exception as e:
+        logger.warning(f"Resume dedup lookup skipped: {str(e)}")
+        return None
+    return result.data[0]["public_url"] if result.data else None
+
+
+async def record_resume(sha256: str, storage_path: str, public_url: str, size: int, content_type: str):
+    """Remember a freshly stored resume; a concurrent insert of the same hash is fine."""
+    try:
+        await db.table(RESUME_OBJECTS_TABLE).insert({
+            "sha256": sha256,
+            "storage_path": storage_path,
+            "public_url": public_url,
+            "size_bytes": size,
+            "content_type": content_type,
+        }).execute()
+    except RepositoryError as e:
+        if e.status_code != 409:
+            logger.warning(f"Resume object not recorded for dedup: {str(e)}")
+    except Exception as e:
+        logger.warning(f"Resume object not recorded for dedup: {str(e)}")
@@ -0,0 +1,148 @@
+# core/session_cache.py
+"""
+Bounded cache of verified sessions.
+
+The admin dashboard fires dozens of requests with the same bearer token.
+Once a token has been verified we keep the resolved user (and its role)
+until shortly before the token's `exp`, so repeat checks cost a dict lookup.
+Revoked tokens are remembered until they would have expired anyway, which
+stops a logged-out token from being re-admitted by local JWT verification.
+Only tokens that verify can be revoked, and revocations leave the list
+when their `exp` passes, never to make room: junk tokens posted to
+/auth/logout cannot push real sign-outs out.
+"""
+import time
+import heapq
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.executor import run_in_bulkhead
+from core.tokens import AuthenticatedUser, TokenVerificationError, authenticate
+
+
+def token_key(token: str) -> str:
+    """Tokens are never stored verbatim, only their SHA-256 digest."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SessionCache:
+    """LRU cache of token hash -> (user, expiry) with an expiry-bounded revocation list."""
+
+    def __init__(self, max_entries: int, expiry_skew: int, default_ttl: int):
+        self.max_entries = max_entries
+        self.expiry_skew = expiry_skew
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._revoked_by_expiry: List[Tuple[float, str]] = []  # heap, for pruning
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expiry_for(self, user: AuthenticatedUser) -> float:
+        now = time.time()
+        if user.expires_at:
+            return min(user.expires_at - self.expiry_skew, now + self.default_ttl)
+        return now + self.default_ttl
+
+    def get(self, token: str) -> Optional[AuthenticatedUser]:
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires = entry
+            if expires <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: AuthenticatedUser):
+        expires = self._expiry_for(user)
+        if expires <= time.time():
+            return
+        key = token_key(token)
+        with self._lock:
+            self._entries[key] = (user, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _prune_revoked(self, now: float):
+        heap = self._revoked_by_expiry
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            if self._revoked.get(key) == expires:
+                del self._revoked[key]
+
+    def is_revoked(self, token: str) -> bool:
+        key = token_key(token)
+        with self._lock:
+            expires = self._revoked.get(key)
+            return expires is not None and expires > time.time()
+
+    def revoke(self, token: str, user: AuthenticatedUser):
+        """Drop a verified session and refuse the token until its `exp`."""
+        key = token_key(token)
+        now = time.time()
+        # Remote-verified sessions may lack `exp`; Supabase itself refuses them once signed out
+        expires = float(user.expires_at) if user.expires_at else now + self.default_ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._prune_revoked(now)
+            if expires <= now:
+                return
+            self._revoked[key] = expires
+            heapq.heappush(self._revoked_by_expiry, (expires, key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "revoked": len(self._revoked),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+session_cache = SessionCache(
+    max_entries=settings.SESSION_CACHE_MAX_ENTRIES,
+    expiry_skew=settings.SESSION_CACHE_EXPIRY_SKEW,
+    default_ttl=settings.SESSION_CACHE_DEFAULT_TTL,
+)
+
+
+async def resolve_user(token: str) -> AuthenticatedUser:
+    """Cached front door for authenticate(): revocation check, cache hit, or verify + store."""
+    if session_cache.is_revoked(token):
+        raise TokenVerificationError("Session has been signed out.")
+
+    user = session_cache.get(token)
+    if user is None:
+        # Misses may hit JWKS or Supabase Auth, so keep them off the event loop
+        user = await run_in_bulkhead("auth", authenticate, token)
+        session_cache.put(token, user)
+    return user
+
+
+async def revoke_session(token: str) -> bool:
+    """Revoke `token` if it is a live session; False for invalid or already revoked tokens."""
+    try:
+        user = await resolve_user(token)
+    except Exception:
+        return False
+    session_cache.revoke(token, user)
+    return True
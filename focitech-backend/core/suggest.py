@@ -0,0 +1,122 @@
+# core/suggest.py
+"""
+Type-ahead completions for `/careers/suggest` and `/portfolio/suggest`.
+
+Each index keeps a sorted array of lowercase keys and answers a prefix with
+two binary searches, so keystrokes never reach Supabase. A phrase is also
+keyed from each of its word starts ("Backend Engineer" is found by "eng").
+Completions are ranked by how many live documents carry the term. Admin
+writes update the index per document; a reload every SUGGEST_REFRESH_SECONDS
+picks up edits made directly in Supabase.
+"""
+import bisect
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.reloadable_index import ReloadableIndex
+
+# Sentinel above any character that can appear in a key
+_HIGH = "\U0010ffff"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _terms(value: Any) -> List[str]:
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    terms = []
+    for v in values:
+        if v is None:
+            continue
+        text = " ".join(str(getattr(v, "value", v)).split())
+        if text:
+            terms.append(text)
+    return terms
+
+
+class SuggestIndex(ReloadableIndex):
+    """Sorted-array prefix index with per-term document frequencies."""
+
+    label = "Suggest index"
+    emoji = "🔤"
+
+    def __init__(self, table: str, fields: Dict[str, str], refresh_seconds: int, active_only: bool = False):
+        # fields maps a column to the `kind` reported with its completions
+        super().__init__(table, fields, refresh_seconds, active_only)
+        self.fields = dict(fields)
+        self._docs: Dict[Any, List[Tuple[str, str]]] = {}
+        self._counts: Counter = Counter()          # (kind, norm) -> documents
+        self._display: Dict[Tuple[str, str], str] = {}
+        self._keys: List[Tuple[str, str, str]] = []  # sorted (key, kind, norm)
+
+    # --- Maintenance ---
+    @staticmethod
+    def _keys_for(kind: str, norm: str) -> List[Tuple[str, str, str]]:
+        words = norm.split(" ")
+        return [(" ".join(words[i:]), kind, norm) for i in range(len(words))]
+
+    def _add(self, doc_id, row: Dict[str, Any]):
+        entries = []
+        for column, kind in self.fields.items():
+            for term in _terms(row.get(column)):
+                entry = (kind, _normalize(term))
+                if entry in entries:
+                    continue
+                entries.append(entry)
+                self._counts[entry] += 1
+                if self._counts[entry] == 1:
+                    self._display[entry] = term
+                    for key in self._keys_for(*entry):
+                        bisect.insort(self._keys, key)
+        self._docs[doc_id] = entries
+
+    def _discard(self, doc_id):
+        for entry in self._docs.pop(doc_id, ()):
+            self._counts[entry] -= 1
+            if self._counts[entry] > 0:
+                continue
+            del self._counts[entry]
+            del self._display[entry]
+            for key in self._keys_for(*entry):
+                i = bisect.bisect_left(self._keys, key)
+                if i < len(self._keys) and self._keys[i] == key:
+                    del self._keys[i]
+
+    def _clear(self):
+        self._counts.clear()
+        self._display.clear()
+        self._keys = []
+
+    # --- Reads ---
+    def suggest(self, prefix: str, limit: int = 8, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top `limit` completions for `prefix`, most frequent first."""
+        prefix = _normalize(prefix)
+        with self._lock:
+            lo = bisect.bisect_left(self._keys, (prefix,))
+            hi = bisect.bisect_left(self._keys, (prefix + _HIGH,), lo)
+            matches = {(k, norm) for _, k, norm in self._keys[lo:hi] if kind is None or k == kind}
+            ranked = sorted(matches, key=lambda e: (-self._counts[e], e[1]))[:limit]
+            return [{"text": self._display[e], "kind": e[0], "count": self._counts[e]} for e in ranked]
+
+    def _extra_stats(self) -> Dict[str, Any]:
+        return {"terms": len(self._counts), "keys": len(self._keys)}
+
+
+job_suggest = SuggestIndex(
+    "jobs", {"title": "title", "department": "department", "location": "location"},
+    settings.SUGGEST_REFRESH_SECONDS, active_only=True,
+)
+project_suggest = SuggestIndex(
+    "projects", {"title": "project", "tech_stack": "tech"}, settings.SUGGEST_REFRESH_SECONDS,
+)
+
+
+async def ensure_suggest(index: SuggestIndex) -> SuggestIndex:
+    """Reload `index` from its table when it is empty or older than the refresh window."""
+    return await index.ensure()
+
+
+def suggest_stats() -> dict:
+    return {index.table: index.stats() for index in (job_suggest, project_suggest)}
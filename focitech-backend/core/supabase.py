@@ -1,129 +1,169 @@
 # core/supabase.py
-import os
-from supabase import create_client, Client
+"""
+Single home for every Supabase client in the process.
+
+Clients used to be created three times at import (core/config, this module
+and supabase_client.py), and this module also fired a `select count` probe
+against `jobs` during import. Now nothing connects at import time:
+
+* `get_supabase()` lazily builds the one sync supabase-py client (auth, and
+  the DATA_BACKEND=threadpool replay path). Without credentials there is no
+  client; table reads and writes are then served by core/memory_index.py.
+* `open_http_clients()` / `close_http_clients()` manage the pooled
+  `httpx.AsyncClient`s used by core/repository.py, one per upstream so each
+  gets its own timeouts and connection pool. Both run from `main.lifespan`.
+
+Table DDL lives in sql/ and is applied through the Supabase SQL editor.
+"""
+import time
 import logging
+import threading
+from typing import Dict, Optional
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger("focitech_api")
+
+_client = None
+_client_lock = threading.Lock()
+_auth_http: Optional[httpx.Client] = None
+http_clients: Dict[str, httpx.AsyncClient] = {}
+_request_stats: Dict[str, Dict[str, float]] = {}
+
+
+def is_configured() -> bool:
+    return bool(settings.SUPABASE_URL and settings.SUPABASE_KEY)
+
+
+def get_supabase():
+    """Return the process-wide sync client, creating it on first use."""
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is not None:
+            return _client
+
+        if not is_configured():
+            # Tables fall back to core/memory_index.py; auth has no offline equivalent
+            raise RuntimeError("SUPABASE_URL or SUPABASE_KEY missing; Supabase Auth is unavailable")
+
+        # Imported lazily: supabase-py pulls in gotrue/postgrest/storage/realtime
+        from supabase import create_client, ClientOptions
+
+        started = time.perf_counter()
+        _client = create_client(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_KEY,
+            options=ClientOptions(
+                postgrest_client_timeout=settings.POSTGREST_TIMEOUT,
+                storage_client_timeout=settings.STORAGE_TIMEOUT,
+                auto_refresh_token=False,
+            ),
+        )
+        logger.info(f"✅ {settings.PROJECT_NAME} Supabase client ready in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return _client
+
+
+# --- Pooled HTTP clients ---
+
+def _http2_supported() -> bool:
+    if not settings.HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _default_headers() -> Dict[str, str]:
+    return {
+        "apikey": settings.SUPABASE_KEY,
+        "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+    }
+
+
+def _track(upstream: str):
+    stats = _request_stats.setdefault(upstream, {"requests": 0, "errors": 0})
+
+    async def on_request(request):
+        stats["requests"] += 1
+
+    async def on_response(response):
+        if response.status_code >= 500:
+            stats["errors"] += 1
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def _build_async_client(upstream: str, timeout: float) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=settings.SUPABASE_URL.rstrip("/"),
+        headers=_default_headers(),
+        limits=_limits(),
+        http2=_http2_supported(),
+        timeout=httpx.Timeout(timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+        event_hooks=_track(upstream),
+    )
+
+
+async def open_http_clients() -> Dict[str, httpx.AsyncClient]:
+    """Create the per-upstream async pools (idempotent)."""
+    if http_clients or not is_configured():
+        return http_clients
+    http_clients["rest"] = _build_async_client("rest", settings.POSTGREST_TIMEOUT)
+    http_clients["storage"] = _build_async_client("storage", settings.STORAGE_TIMEOUT)
+    logger.info(
+        f"🔌 Supabase HTTP pools ready (max={settings.HTTP_MAX_CONNECTIONS}, "
+        f"keepalive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS}, http2={_http2_supported()})"
+    )
+    return http_clients
+
+
+async def close_http_clients():
+    global _auth_http
+    for client in http_clients.values():
+        await client.aclose()
+    http_clients.clear()
+    if _auth_http is not None:
+        _auth_http.close()
+        _auth_http = None
+
+
+def get_auth_http() -> httpx.Client:
+    """Small pooled sync client for Auth-side fetches (JWKS) on the auth bulkhead."""
+    global _auth_http
+    if _auth_http is None:
+        _auth_http = httpx.Client(
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            timeout=httpx.Timeout(settings.AUTH_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        )
+    return _auth_http
+
 
-logger = logging.getLogger(__name__)
-
-# Try to initialize Supabase client
-try:
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    supabase_service_key = os.environ.get("SUPABASE_SERVICE_KEY")
-    
-    if supabase_url and supabase_key:
-        supabase: Client = create_client(supabase_url, supabase_key)
-        logger.info("✅ Supabase client initialized successfully")
-        
-        # Create tables if they don't exist
-        try:
-            # Check if jobs table exists
-            result = supabase.table("jobs").select("count", count="exact").limit(1).execute()
-            logger.info("✅ Jobs table is accessible")
-        except Exception as e:
-            logger.warning(f"⚠️ Jobs table may not exist: {e}")
-            
-            # SQL to create tables
-            create_tables_sql = """
-            -- Create jobs table
-            CREATE TABLE IF NOT EXISTS jobs (
-                id BIGSERIAL PRIMARY KEY,
-                title VARCHAR(255) NOT NULL,
-                department VARCHAR(100) NOT NULL,
-                location VARCHAR(100) NOT NULL,
-                job_type VARCHAR(50) NOT NULL,
-                salary_range VARCHAR(100),
-                experience_required VARCHAR(100) NOT NULL,
-                education_required TEXT,
-                description TEXT NOT NULL,
-                requirements TEXT NOT NULL,
-                benefits TEXT,
-                is_active BOOLEAN DEFAULT true,
-                application_deadline TIMESTAMP,
-                posted_date TIMESTAMP DEFAULT NOW(),
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            );
-
-            -- Create job_applications table
-            CREATE TABLE IF NOT EXISTS job_applications (
-                id BIGSERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                email VARCHAR(255) NOT NULL,
-                phone VARCHAR(50),
-                cover_letter TEXT,
-                portfolio_url VARCHAR(500),
-                resume_filename VARCHAR(255),
-                job_id BIGINT NOT NULL,
-                job_title VARCHAR(255),
-                job_department VARCHAR(100),
-                job_type VARCHAR(50),
-                status VARCHAR(50) DEFAULT 'pending',
-                internal_notes TEXT,
-                source VARCHAR(100) DEFAULT 'Company Website',
-                additional_info TEXT,
-                applied_at TIMESTAMP DEFAULT NOW(),
-                status_updated_at TIMESTAMP,
-                FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
-            );
-
-            -- Create indexes for better performance
-            CREATE INDEX IF NOT EXISTS idx_jobs_is_active ON jobs(is_active);
-            CREATE INDEX IF NOT EXISTS idx_jobs_department ON jobs(department);
-            CREATE INDEX IF NOT EXISTS idx_job_applications_status ON job_applications(status);
-            CREATE INDEX IF NOT EXISTS idx_job_applications_job_id ON job_applications(job_id);
-            CREATE INDEX IF NOT EXISTS idx_job_applications_applied_at ON job_applications(applied_at DESC);
-            """
-            
-            logger.info("📋 Table creation SQL prepared (run this in Supabase SQL editor)")
-            
-    else:
-        raise ValueError("Supabase URL or key not found in environment variables")
-        
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Supabase client: {e}")
-    logger.warning("⚠️ Running in mock mode - data will not be persisted")
-    
-    # Create mock client for development
-    class MockSupabase:
-        class table:
-            def __init__(self, name):
-                self.name = name
-                self.data = []
-                
-            def select(self, *args):
-                return self
-                
-            def insert(self, data):
-                if isinstance(data, dict):
-                    data['id'] = len(self.data) + 1
-                    self.data.append(data)
-                elif isinstance(data, list):
-                    for item in data:
-                        item['id'] = len(self.data) + 1
-                        self.data.append(item)
-                return self
-                
-            def update(self, data):
-                return self
-                
-            def delete(self):
-                return self
-                
-            def eq(self, column, value):
-                return self
-                
-            def ilike(self, column, pattern):
-                return self
-                
-            def order(self, column, desc=False):
-                return self
-                
-            def range(self, start, end):
-                return self
-                
-            def execute(self):
-                return type('obj', (object,), {'data': self.data})()
-    
-    supabase = MockSupabase()
-    logger.warning("⚠️ Using mock Supabase client for development")
\ No newline at end of file
+def pool_stats() -> Dict[str, dict]:
+    """Connection-pool and request counters per upstream."""
+    stats = {}
+    for upstream, client in http_clients.items():
+        pool = getattr(client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        stats[upstream] = {
+            **_request_stats.get(upstream, {}),
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "http2": _http2_supported(),
+            "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        }
+    return stats
@@ -0,0 +1,466 @@
+# core/task_queue.py
+"""
+Durable background jobs (notifications, post-processing, webhooks).
+
+Side effects that used to ride on FastAPI `BackgroundTasks` were lost on
+restart. Here a request only appends a row to the queue. A worker claims
+rows under a lease and runs the registered handler for each one, with at
+most TASK_WORKER_CONCURRENCY jobs at a time. Failed jobs are retried with
+exponential backoff; after TASK_MAX_ATTEMPTS they are dead-lettered and
+kept for inspection.
+
+Backends are pluggable (TaskBackend); the default stores jobs in SQLite at
+TASK_QUEUE_PATH. The worker is either `python worker.py` (its own process)
+or, with TASK_WORKER_EMBEDDED, a task inside the API lifespan. A job whose
+worker died is picked up again when its lease runs out; while a handler is
+still running its worker keeps renewing the lease. Completing, failing or
+releasing a job only touches the row while this claim still owns it, so a
+worker that lost its lease cannot overwrite the newer attempt.
+
+`collect` stores small items for a later batch job (e.g. the admin digest)
+in the same backend. The first item of a batch queues the delayed job that
+will read them, so items survive a crash and every process sharing the
+queue feeds the same single batch.
+"""
+import json
+import time
+import socket
+import sqlite3
+import asyncio
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from core.config import settings
+
+logger = logging.getLogger("focitech_api")
+
+Handler = Callable[[Dict[str, Any]], Union[Awaitable[None], None]]
+TASK_HANDLERS: Dict[str, Handler] = {}
+# Awaited after the worker drains (e.g. closing pooled SMTP sessions)
+WORKER_STOP_HOOKS: List[Callable[[], Awaitable[None]]] = []
+
+
+def task_handler(name: str):
+    """Register a job handler; it receives the JSON payload given to `enqueue`."""
+    def register(fn: Handler) -> Handler:
+        TASK_HANDLERS[name] = fn
+        return fn
+    return register
+
+
+def on_worker_stop(fn: Callable[[], Awaitable[None]]):
+    WORKER_STOP_HOOKS.append(fn)
+    return fn
+
+
+@dataclass
+class Task:
+    id: int
+    name: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    # Owner of this claim; with `attempts` it identifies the claim in the backend
+    locked_by: str
+
+
+class TaskBackend(ABC):
+    """Storage contract for the queue. Every method is blocking; callers use threads."""
+
+    @abstractmethod
+    def push(self, name: str, payload: Dict[str, Any], max_attempts: int, delay: float = 0) -> int: ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, limit: int, lease_seconds: float) -> List[Task]: ...
+
+    @abstractmethod
+    def extend(self, task: Task, lease_seconds: float) -> bool:
+        """Push the lease out; False when the claim was lost to another worker."""
+
+    # complete/fail/release return False (and change nothing) when the claim was lost
+
+    @abstractmethod
+    def complete(self, task: Task) -> bool: ...
+
+    @abstractmethod
+    def fail(self, task: Task, error: str, retry_in: Optional[float]) -> bool:
+        """Re-queue after `retry_in` seconds, or dead-letter when it is None."""
+
+    @abstractmethod
+    def release(self, task: Task) -> bool:
+        """Hand an unfinished job back without counting the attempt (shutdown)."""
+
+    @abstractmethod
+    def add_to_batch(self, batch: str, item: Dict[str, Any], flush_task: str,
+                     delay: float, max_attempts: int) -> int:
+        """Store `item` and queue `flush_task` in `delay` seconds unless one is already waiting."""
+
+    @abstractmethod
+    def batch_items(self, batch: str) -> List[Tuple[int, Dict[str, Any]]]:
+        """Stored (id, item) pairs, oldest first."""
+
+    @abstractmethod
+    def drop_batch_items(self, batch: str, up_to_id: int) -> int: ...
+
+    @abstractmethod
+    def requeue_dead(self) -> int: ...
+
+    @abstractmethod
+    def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class SQLiteTaskBackend(TaskBackend):
+    """Single-file queue; WAL mode so the API and a worker process can share it."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._ready = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._init_lock:
+                if not self._ready:
+                    self._create(conn)
+                    self._ready = True
+        return conn
+
+    def _create(self, conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',  -- queued | running | dead
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                run_at REAL NOT NULL,
+                locked_by TEXT,
+                locked_until REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_run_at ON tasks(status, run_at);
+            CREATE TABLE IF NOT EXISTS batch_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch TEXT NOT NULL,
+                item TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_batch_items_batch ON batch_items(batch, id);
+        """)
+
+    def push(self, name, payload, max_attempts, delay=0) -> int:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT INTO tasks (name, payload, max_attempts, run_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                (name, json.dumps(payload, default=str), max_attempts, now + delay, now),
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker_id, limit, lease_seconds) -> List[Task]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so two workers never claim the same row
+            conn.execute("BEGIN IMMEDIATE")
+            # A job that kept killing its worker never reaches fail(); dead-letter it here
+            lost = conn.execute(
+                """UPDATE tasks SET status = 'dead', locked_by = NULL, locked_until = NULL,
+                          last_error = 'lease expired on the last attempt (worker lost)'
+                   WHERE status = 'running' AND locked_until < ? AND attempts >= max_attempts""",
+                (now,),
+            ).rowcount
+            rows = conn.execute(
+                """SELECT * FROM tasks
+                   WHERE (status = 'queued' AND run_at <= ?) OR (status = 'running' AND locked_until < ?)
+                   ORDER BY run_at LIMIT ?""",
+                (now, now, limit),
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE tasks SET status = 'running', locked_by = ?, locked_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    (worker_id, now + lease_seconds, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        if lost:
+            logger.error(f"☠️ {lost} task(s) dead-lettered: lease expired on their last attempt")
+        return [
+            Task(row["id"], row["name"], json.loads(row["payload"]), row["attempts"] + 1,
+                 row["max_attempts"], worker_id)
+            for row in rows
+        ]
+
+    # A re-claim bumps `attempts`, so this also tells a worker's old claim from its new one
+    _OWNED = "id = ? AND status = 'running' AND locked_by = ? AND attempts = ?"
+
+    def _owned(self, task: Task) -> tuple:
+        return (task.id, task.locked_by, task.attempts)
+
+    def extend(self, task, lease_seconds) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET locked_until = ? WHERE {self._OWNED}",
+                (time.time() + lease_seconds, *self._owned(task)),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute(f"DELETE FROM tasks WHERE {self._OWNED}", self._owned(task)).rowcount == 1
+
+    def fail(self, task, error, retry_in) -> bool:
+        with closing(self._connect()) as conn:
+            if retry_in is None:
+                cursor = conn.execute(
+                    f"UPDATE tasks SET status = 'dead', locked_by = NULL, locked_until = NULL, last_error = ? WHERE {self._OWNED}",
+                    (error, *self._owned(task)),
+                )
+            else:
+                cursor = conn.execute(
+                    f"UPDATE tasks SET status = 'queued', locked_by = NULL, locked_until = NULL, last_error = ?, run_at = ? WHERE {self._OWNED}",
+                    (error, time.time() + retry_in, *self._owned(task)),
+                )
+            return cursor.rowcount == 1
+
+    def release(self, task) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET status = 'queued', locked_by = NULL, locked_until = NULL, attempts = attempts - 1 WHERE {self._OWNED}",
+                self._owned(task),
+            )
+            return cursor.rowcount == 1
+
+    def add_to_batch(self, batch, item, flush_task, delay, max_attempts) -> int:
+        now = time.time()
+        payload = json.dumps({"batch": batch})
+        conn = self._connect()
+        try:
+            # One transaction, so concurrent producers never queue two flush jobs
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "INSERT INTO batch_items (batch, item, created_at) VALUES (?, ?, ?)",
+                (batch, json.dumps(item, default=str), now),
+            )
+            waiting = conn.execute(
+                "SELECT 1 FROM tasks WHERE name = ? AND payload = ? AND status = 'queued' LIMIT 1",
+                (flush_task, payload),
+            ).fetchone()
+            if waiting is None:
+                conn.execute(
+                    "INSERT INTO tasks (name, payload, max_attempts, run_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (flush_task, payload, max_attempts, now + delay, now),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return cursor.lastrowid
+
+    def batch_items(self, batch) -> List[Tuple[int, Dict[str, Any]]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT id, item FROM batch_items WHERE batch = ? ORDER BY id", (batch,)).fetchall()
+        return [(row["id"], json.loads(row["item"])) for row in rows]
+
+    def drop_batch_items(self, batch, up_to_id) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("DELETE FROM batch_items WHERE batch = ? AND id <= ?", (batch, up_to_id)).rowcount
+
+    def requeue_dead(self) -> int:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'queued', attempts = 0, run_at = ? WHERE status = 'dead'", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, name, payload, attempts, last_error, created_at FROM tasks WHERE status = 'dead' ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+            batched = dict(conn.execute("SELECT batch, COUNT(*) FROM batch_items GROUP BY batch").fetchall())
+        return {"backend": "sqlite", "queued": counts.get("queued", 0),
+                "running": counts.get("running", 0), "dead": counts.get("dead", 0), "batched": batched}
+
+
+TASK_BACKENDS: Dict[str, Callable[[], TaskBackend]] = {
+    "sqlite": lambda: SQLiteTaskBackend(settings.TASK_QUEUE_PATH),
+}
+
+
+def _make_backend() -> TaskBackend:
+    factory = TASK_BACKENDS.get(settings.TASK_QUEUE_BACKEND)
+    if factory is None:
+        raise RuntimeError(f"Unknown TASK_QUEUE_BACKEND '{settings.TASK_QUEUE_BACKEND}'")
+    Path(settings.TASK_QUEUE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    return factory()
+
+
+task_backend = _make_backend()
+
+
+async def enqueue(name: str, payload: Dict[str, Any], delay: float = 0) -> int:
+    """Persist a job for the worker; returns its id. Costs one local write."""
+    if name not in TASK_HANDLERS:
+        raise KeyError(f"No task handler registered for '{name}'")
+    return await asyncio.to_thread(task_backend.push, name, payload, settings.TASK_MAX_ATTEMPTS, delay)
+
+
+async def collect(batch: str, item: Dict[str, Any], flush_task: str, delay: float) -> int:
+    """Persist `item` for `flush_task`, which runs `delay` seconds after the batch's first item."""
+    if flush_task not in TASK_HANDLERS:
+        raise KeyError(f"No task handler registered for '{flush_task}'")
+    return await asyncio.to_thread(
+        task_backend.add_to_batch, batch, item, flush_task, delay, settings.TASK_MAX_ATTEMPTS
+    )
+
+
+class TaskWorker:
+    """Claims jobs and runs them with bounded concurrency; drains on stop()."""
+
+    def __init__(self, backend: TaskBackend, concurrency: int, poll_interval: float,
+                 lease_seconds: float, drain_seconds: float):
+        self.backend = backend
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.drain_seconds = drain_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._inflight: Dict[asyncio.Task, Task] = {}
+        self._stopping: Optional[asyncio.Event] = None
+        self.completed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    def _retry_delay(self, attempts: int) -> float:
+        return min(settings.TASK_RETRY_BACKOFF_MAX, settings.TASK_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+    async def _renew_lease(self, task: Task):
+        """Keep the claim alive while the handler runs (every third of a lease)."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await asyncio.to_thread(self.backend.extend, task, self.lease_seconds):
+                    logger.warning(f"⚠️ Task {task.name}#{task.id} lost its lease; another worker owns it now")
+                    return
+            except Exception as e:
+                logger.error(f"❌ Could not renew lease of task {task.name}#{task.id}: {str(e)}")
+
+    async def _execute(self, task: Task):
+        handler = TASK_HANDLERS.get(task.name)
+        renewer = asyncio.create_task(self._renew_lease(task))
+        try:
+            if handler is None:
+                raise LookupError(f"no handler registered for '{task.name}'")
+            result = handler(task.payload)
+            if asyncio.iscoroutine(result):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            final = handler is None or task.attempts >= task.max_attempts
+            retry_in = None if final else self._retry_delay(task.attempts)
+            if not await asyncio.to_thread(self.backend.fail, task, str(e), retry_in):
+                logger.warning(f"⚠️ Task {task.name}#{task.id} failed after losing its lease: {str(e)}")
+                return
+            if final:
+                self.dead_lettered += 1
+                logger.error(f"☠️ Task {task.name}#{task.id} dead-lettered after {task.attempts} attempts: {str(e)}")
+            else:
+                self.retried += 1
+                logger.warning(f"⏳ Task {task.name}#{task.id} failed (attempt {task.attempts}), retry in {retry_in:.0f}s: {str(e)}")
+            return
+        finally:
+            renewer.cancel()
+        if not await asyncio.to_thread(self.backend.complete, task):
+            logger.warning(f"⚠️ Task {task.name}#{task.id} finished after losing its lease; not marked done")
+            return
+        self.completed += 1
+
+    async def run(self):
+        """Poll until stop(), then wait up to drain_seconds for in-flight jobs."""
+        self._stopping = asyncio.Event()
+        logger.info(f"🛠️ Task worker {self.worker_id} started (concurrency={self.concurrency})")
+        while not self._stopping.is_set():
+            free = self.concurrency - len(self._inflight)
+            claimed: List[Task] = []
+            if free > 0:
+                try:
+                    claimed = await asyncio.to_thread(self.backend.claim, self.worker_id, free, self.lease_seconds)
+                except Exception as e:
+                    logger.error(f"❌ Task queue claim failed: {str(e)}")
+            for task in claimed:
+                runner = asyncio.create_task(self._execute(task))
+                self._inflight[runner] = task
+                runner.add_done_callback(self._inflight.pop)
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        await self._drain()
+
+    async def _drain(self):
+        if self._inflight:
+            logger.info(f"⏳ Draining {len(self._inflight)} in-flight tasks (up to {self.drain_seconds}s)")
+            done, pending = await asyncio.wait(list(self._inflight), timeout=self.drain_seconds)
+            for runner in pending:
+                task = self._inflight.get(runner)
+                runner.cancel()
+                if task is not None:
+                    await asyncio.to_thread(self.backend.release, task)
+        for hook in WORKER_STOP_HOOKS:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"❌ Task worker stop hook {hook.__name__} failed: {str(e)}")
+        logger.info(f"🛑 Task worker {self.worker_id} stopped")
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "inflight": len(self._inflight),
+            "completed": self.completed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "running": self._stopping is not None and not self._stopping.is_set(),
+        }
+
+
+task_worker = TaskWorker(
+    task_backend,
+    concurrency=settings.TASK_WORKER_CONCURRENCY,
+    poll_interval=settings.TASK_POLL_INTERVAL,
+    lease_seconds=settings.TASK_LEASE_SECONDS,
+    drain_seconds=settings.TASK_DRAIN_SECONDS,
+)
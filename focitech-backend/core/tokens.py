@@ -0,0 +1,182 @@
+# core/tokens.py
+"""
+In-process verification of Supabase access tokens.
+
+Supabase signs user sessions either with the project's HS256 JWT secret or,
+on newer projects, with asymmetric keys published as a JWKS document. Both
+can be checked locally, so protected routes no longer need a network round
+trip to Supabase Auth. The remote check is kept as an explicit mode and as
+an opt-in fallback for tokens we have no key material for.
+"""
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from jose import jwt, JWTError
+
+from core.config import settings
+from core.supabase import get_supabase, get_auth_http, is_configured
+
+logger = logging.getLogger("focitech_api")
+
+HMAC_ALGORITHMS = ["HS256"]
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+# Minimum gap between forced JWKS refreshes triggered by an unknown `kid`
+JWKS_MIN_REFRESH_INTERVAL = 30
+
+
+class TokenVerificationError(Exception):
+    """Raised when a token is malformed, expired or fails signature checks."""
+
+
+class LocalVerificationUnavailable(TokenVerificationError):
+    """Raised when no local key material can verify the token."""
+
+
+@dataclass
+class AuthenticatedUser:
+    """Normalized view of a verified Supabase user (local or remote check)."""
+    id: str
+    email: Optional[str]
+    role: str
+    app_metadata: Dict[str, Any] = field(default_factory=dict)
+    user_metadata: Dict[str, Any] = field(default_factory=dict)
+    expires_at: Optional[int] = None
+    issued_at: Optional[int] = None
+    # Account creation date; only Supabase Auth knows it, access tokens do not carry it
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "AuthenticatedUser":
+        app_metadata = claims.get("app_metadata") or {}
+        return cls(
+            id=claims["sub"],
+            email=claims.get("email"),
+            role=app_metadata.get("role", "authenticated"),
+            app_metadata=app_metadata,
+            user_metadata=claims.get("user_metadata") or {},
+            expires_at=claims.get("exp"),
+            issued_at=claims.get("iat"),
+        )
+
+    @classmethod
+    def from_supabase_user(cls, user, expires_at: Optional[int] = None) -> "AuthenticatedUser":
+        app_metadata = user.app_metadata or {}
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=app_metadata.get("role", "authenticated"),
+            app_metadata=app_metadata,
+            user_metadata=user.user_metadata or {},
+            expires_at=expires_at,
+            created_at=user.created_at,
+        )
+
+
+class JWKSCache:
+    """Thread-safe cache of the project's published signing keys."""
+
+    def __init__(self, url: str, ttl: int):
+        self.url = url
+        self.ttl = ttl
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        response = get_auth_http().get(self.url)
+        response.raise_for_status()
+        self._keys = {k["kid"]: k for k in response.json().get("keys", []) if "kid" in k}
+        self._fetched_at = time.monotonic()
+        logger.info(f"🔑 JWKS refreshed: {len(self._keys)} signing key(s) cached")
+
+    def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            stale = age > self.ttl
+            unknown = kid not in self._keys and age > JWKS_MIN_REFRESH_INTERVAL
+            if stale or unknown:
+                try:
+                    self._refresh()
+                except Exception as e:
+                    # Keep serving the previous key set if the endpoint is flaky
+                    logger.warning(f"JWKS refresh failed: {str(e)}")
+            return self._keys.get(kid)
+
+
+def _jwks_url() -> str:
+    if settings.SUPABASE_JWKS_URL:
+        return settings.SUPABASE_JWKS_URL
+    if settings.SUPABASE_URL:
+        return f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+    return ""
+
+
+jwks_cache = JWKSCache(_jwks_url(), settings.JWKS_CACHE_TTL) if _jwks_url() else None
+
+
+def verify_locally(token: str) -> AuthenticatedUser:
+    """Check signature, exp/nbf/aud and extract the user without any I/O (JWKS aside)."""
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise TokenVerificationError(f"Malformed token: {str(e)}")
+
+    alg = header.get("alg")
+    if alg in HMAC_ALGORITHMS:
+        if not settings.SUPABASE_JWT_SECRET:
+            raise LocalVerificationUnavailable("SUPABASE_JWT_SECRET is not configured")
+        key, algorithms = settings.SUPABASE_JWT_SECRET, HMAC_ALGORITHMS
+    elif alg in ASYMMETRIC_ALGORITHMS:
+        key = jwks_cache.get_key(header.get("kid", "")) if jwks_cache else None
+        if key is None:
+            raise LocalVerificationUnavailable(f"No JWKS key for kid={header.get('kid')}")
+        algorithms = [alg]
+    else:
+        raise TokenVerificationError(f"Unsupported signing algorithm: {alg}")
+
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=algorithms,
+            audience=settings.SUPABASE_JWT_AUDIENCE,
+            options={"require_exp": True, "require_sub": True, "leeway": settings.JWT_LEEWAY_SECONDS},
+        )
+    except JWTError as e:
+        raise TokenVerificationError(str(e))
+
+    return AuthenticatedUser.from_claims(claims)
+
+
+def verify_remotely(token: str) -> AuthenticatedUser:
+    """Legacy path: ask Supabase Auth to resolve the session (one HTTP round trip)."""
+    if not is_configured():
+        raise TokenVerificationError("Supabase client is not configured")
+
+    response = get_supabase().auth.get_user(token)
+    if not response or not response.user:
+        raise TokenVerificationError("User session is invalid or expired.")
+
+    try:
+        expires_at = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        expires_at = None
+    return AuthenticatedUser.from_supabase_user(response.user, expires_at)
+
+
+def authenticate(token: str) -> AuthenticatedUser:
+    """Resolve a bearer token according to AUTH_VERIFICATION_MODE."""
+    if settings.AUTH_VERIFICATION_MODE == "remote":
+        return verify_remotely(token)
+
+    try:
+        return verify_locally(token)
+    except LocalVerificationUnavailable as e:
+        if not settings.AUTH_REMOTE_FALLBACK:
+            raise
+        logger.info(f"Local JWT check unavailable ({str(e)}), using Supabase Auth fallback")
+        return verify_remotely(token)
@@ -0,0 +1,165 @@
+# core/uploads.py
+"""
+Bounded, streaming ingest for uploaded files (resumes).
+
+Starlette already spools every multipart file part to a
+SpooledTemporaryFile (memory up to 1 MB, then disk). Instead of
+`await file.read()`-ing that spool back into one bytes object, we walk it in
+UPLOAD_CHUNK_SIZE pieces, which lets us:
+
+  * stop with 413 the moment the running size passes MAX_UPLOAD_BYTES,
+  * compute the SHA-256 digest on the fly,
+  * check the leading magic bytes against the claimed extension,
+
+and then rewind the same spool and hand it on as a stream (httpx body for
+Supabase Storage, `shutil.copyfileobj` for the local fallback). Peak memory
+per upload is one chunk.
+
+By the time `ingest_upload` runs the body has already been read, so the
+whole-request cap sits in front of parsing: RequestSizeLimit rejects a
+declared Content-Length above MAX_REQUEST_BYTES outright and counts the
+bytes of bodies that declare none (chunked transfer), answering 413 as
+soon as they pass the cap instead of spooling the rest.
+"""
+import json
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+
+logger = logging.getLogger("focitech_api")
+
+# Leading bytes of each accepted document type
+MAGIC_BYTES: Dict[str, Tuple[bytes, ...]] = {
+    ".pdf": (b"%PDF-",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),  # OLE2 compound file
+    ".docx": (b"PK\x03\x04",),                       # OOXML zip container
+}
+_SNIFF_BYTES = max(len(m) for prefixes in MAGIC_BYTES.values() for m in prefixes)
+
+
+@dataclass
+class IngestedFile:
+    """A validated upload, rewound and ready to be streamed onwards."""
+    stream: BinaryIO
+    size: int
+    sha256: str
+    extension: str
+    content_type: str
+
+
+def _too_large() -> HTTPException:
+    limit_mb = settings.MAX_UPLOAD_BYTES / (1024 * 1024)
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the {limit_mb:g} MB limit.",
+    )
+
+
+async def ingest_upload(file: UploadFile, extension: str) -> IngestedFile:
+    """Size-cap, hash and sniff `file` in one chunked pass; 413/400 on failure."""
+    # Starlette records the spooled size; reject before reading anything
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    await file.seek(0)
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > settings.MAX_UPLOAD_BYTES:
+            raise _too_large()
+        if len(head) < _SNIFF_BYTES:
+            head += chunk[:_SNIFF_BYTES - len(head)]
+        digest.update(chunk)
+
+    if size == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty.")
+    if not head.startswith(MAGIC_BYTES.get(extension, (b"",))):
+        logger.warning(f"🚫 Upload rejected: {file.filename} is not a real {extension} file")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File content does not match its {extension} extension.",
+        )
+
+    await file.seek(0)
+    return IngestedFile(
+        stream=file.file,
+        size=size,
+        sha256=digest.hexdigest(),
+        extension=extension,
+        content_type=file.content_type or "application/octet-stream",
+    )
+
+
+# --- Whole-request cap ---
+
+class RequestTooLarge(HTTPException):
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds {max_bytes} bytes.",
+        )
+
+
+class RequestSizeLimit:
+    """ASGI middleware: 413 for bodies over `max_bytes`, declared or streamed."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                await self._reject(send)
+                return
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised into the body parser; FastAPI turns it into the 413 response
+                    raise RequestTooLarge(self.max_bytes)
+            return message
+
+        async def tracked_send(message: Message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except RequestTooLarge:
+            # Read outside FastAPI's body parsing (e.g. request.stream() in a handler)
+            if started:
+                raise
+            await self._reject(send)
+
+    async def _reject(self, send: Send):
+        body = json.dumps({"detail": f"Request body exceeds {self.max_bytes} bytes."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,5 +1,6 @@
 from fastapi import Request, HTTPException, Depends, status
-from core.config import supabase
+from core.tokens import TokenVerificationError
+from core.session_cache import resolve_user
 from typing import Annotated
 import logging
 
@@ -9,6 +10,7 @@ logger = logging.getLogger("focitech_api")
 async def get_current_user(request: Request):
     """
     Middleware to verify the Supabase JWT token.
+    Uses local signature checks; see core.tokens for the remote fallback.
     """
     auth_header = request.headers.get("Authorization")
     
@@ -22,17 +24,17 @@ async def get_current_user(request: Request):
     token = auth_header.split(" ")[1]
     
     try:
-        # Supabase se user verify kar rahe hain
-        response = supabase.auth.get_user(token)
-        
-        if not response or not response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User session is invalid or expired."
-            )
-            
-        return response.user
-        
+        # Pehle session cache, phir local JWT verify (remote sirf fallback)
+        return await resolve_user(token)
+
+    except HTTPException:
+        raise
+    except TokenVerificationError as e:
+        logger.error(f"Auth Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User session is invalid or expired."
+        )
     except Exception as e:
         logger.error(f"Auth Error: {str(e)}")
         raise HTTPException(
@@ -1,5 +1,6 @@
 import uvicorn
 import time
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -10,7 +11,13 @@ from contextlib import asynccontextmanager
 
 # Centralized settings and modular routers
 from core.config import settings
-from routers import projects, inquiries, team, auth, careers  # ADDED careers import
+from core.repository import db
+from core.executor import shutdown_bulkheads, run_in_bulkhead
+from core.supabase import get_supabase, is_configured
+from core.resume_pipeline import resume_uploader
+from core.task_queue import task_worker
+from core.uploads import RequestSizeLimit
+from routers import projects, inquiries, team, auth, careers, system  # ADDED careers import
 
 
 # --- Setup Production Logging ---
@@ -26,8 +33,24 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize resources
     logger.info(f"🚀 {settings.PROJECT_NAME} v{settings.PROJECT_VERSION} booting...")
     logger.info(f"Environment: {'Development' if settings.DEBUG else 'Production'}")
+    await db.connect()
+    # Single shared sync client (auth); built off the event loop
+    if is_configured():
+        await run_in_bulkhead("auth", get_supabase)
+    # Background resume uploads, re-queuing whatever the last run left spooled
+    if settings.RESUME_UPLOAD_MODE == "async" and is_configured():
+        resume_uploader.start()
+        resume_uploader.recover()
+    # Durable jobs (notifications); otherwise `python worker.py` drains the queue
+    worker_task = asyncio.create_task(task_worker.run()) if settings.TASK_WORKER_EMBEDDED else None
     yield
     # Shutdown: Clean up resources
+    if worker_task:
+        task_worker.stop()
+        await worker_task
+    await resume_uploader.stop()
+    await db.close()
+    shutdown_bulkheads()
     logger.info("🛑 Focitech API Services stopped.")
 
 # --- Initialize FastAPI App ---
@@ -58,7 +81,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Allow all for OPTIONS preflight stability
     allow_headers=["*"],
-    expose_headers=["X-Response-Time", "X-Powered-By"]
+    expose_headers=["X-Response-Time", "X-Powered-By", "X-Next-Cursor", "Idempotent-Replayed"]
 )
 
 # 2. Trusted Host: Secure Render and Netlify nodes
@@ -78,7 +101,10 @@ app.add_middleware(
 # 3. GZip Compression
 app.add_middleware(GZipMiddleware, minimum_size=500)
 
-# 4. Request Logging & Performance Tracking
+# 4. Request Size Guard: refuse oversized bodies (declared or chunked) before they are spooled
+app.add_middleware(RequestSizeLimit, max_bytes=settings.MAX_REQUEST_BYTES)
+
+# 5. Request Logging & Performance Tracking
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
@@ -111,6 +137,7 @@ app.include_router(projects.router if hasattr(projects, 'router') else projects,
 app.include_router(inquiries.router if hasattr(inquiries, 'router') else inquiries, prefix="/api/v1/contact", tags=["Inquiries"])
 app.include_router(team.router if hasattr(team, 'router') else team, prefix="/api/v1/corporate", tags=["Team"])
 app.include_router(careers.router if hasattr(careers, 'router') else careers, prefix="/api/v1/careers", tags=["Careers"])  # FIXED careers router
+app.include_router(system, prefix="/api/v1/system", tags=["System"])
 
 @app.get("/", tags=["Health"])
 async def root():
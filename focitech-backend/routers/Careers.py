@@ -3,9 +3,8 @@
 # Targets: FastAPI, Pydantic V2, Supabase Cloud Storage
 
 import os
-import re
+import asyncio
 import sys
-import uuid
 import logging
 import shutil
 import enum
@@ -22,7 +21,8 @@ from fastapi import (
     status, 
     Depends, 
     Query, 
-    BackgroundTasks
+    Request,
+    Response
 )
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, EmailStr, ConfigDict, field_validator
@@ -37,22 +37,34 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("focitech_careers")
 
 # --- SUPABASE INTEGRATION ---
-try:
-    # Attempting to load the centralized supabase client
-    from core.supabase import supabase
-    SUPABASE_AVAILABLE = True
+# All table and storage access goes through the async repository (core/repository.py)
+from core.repository import db, RepositoryError
+from core.memory_index import memory_backend
+from core.config import settings
+from core.career_stats import career_stats_rollup, get_career_stats
+from core.facets import JOB_FACETS, ensure_job_facets, job_facets
+from core.suggest import ensure_suggest, job_suggest
+from core.bulk import bulk_outcome, bulk_query, unique_ids
+from core.export import EXPORT_FORMATS, stream_export
+from core.uploads import ingest_upload
+from core.resume_pipeline import resume_uploader
+from core.resume_store import content_path, find_resume, record_resume
+from core.idempotency import idempotency_key, idempotency_store
+from core.notifications import notify_applicants, notify_later
+from core.http_cache import check_not_modified, make_etag, result_etag
+from core.pagination import keyset, paginate
+from core.fields import FieldSet
+from dependencies import AdminUser
+
+SUPABASE_AVAILABLE = db.configured
+if SUPABASE_AVAILABLE:
     logger.info("✅ Careers Router: Supabase Cloud Connection Active.")
-except ImportError:
-    try:
-        from supabase_client import supabase
-        SUPABASE_AVAILABLE = True
-    except Exception:
-        SUPABASE_AVAILABLE = False
-        logger.warning("⚠️ Careers Router: Running in Mock Mode (Client not found).")
+else:
+    logger.warning("⚠️ Careers Router: Running in Mock Mode (Client not found).")
 
 # --- CONSTANTS ---
 ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx'}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 Megabytes
+MAX_FILE_SIZE = settings.MAX_UPLOAD_BYTES  # 5 Megabytes by default, enforced in core/uploads.py
 BUCKET_NAME = "resumes"
 STORAGE_FOLDER = "applications"
 
@@ -139,7 +151,9 @@ class ApplicationBase(BaseModel):
 
 class ApplicationRead(ApplicationBase):
     id: int
-    resume_url: str
+    # Empty until the background uploader finishes (RESUME_UPLOAD_MODE=async)
+    resume_url: Optional[str] = None
+    resume_status: str = "uploaded"
     status: ApplicationStatus = ApplicationStatus.PENDING
     internal_notes: Optional[str] = None
     applied_at: datetime
@@ -151,11 +165,24 @@ class CareerStats(BaseModel):
     total_applications: int
     applications_by_status: Dict[str, int]
     department_distribution: Dict[str, int]
+    average_time_to_hire: Optional[float] = Field(None, description="Days from application to hire")
+    top_performing_jobs: List[Dict[str, Any]] = []
+
+class ApplicationBulkUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_IDS)
+    status: ApplicationStatus
+    notes: Optional[str] = None
 
 # --- ROUTER INITIALIZATION ---
 router = APIRouter()
 
+# Allow-lists for ?fields= on list routes
+JOB_FIELDS = FieldSet(JobRead, virtual={"applications_count": lambda: application_count_column()})
+APPLICATION_FIELDS = FieldSet(ApplicationRead)
+
 # --- MOCK DATA STORE ---
+# Seeds the in-memory index (core/memory_index.py) that serves offline mode
+# and the degraded-mode fallback with the same filters as the live path.
 MOCK_STORE = {
     "jobs": [
         {
@@ -163,11 +190,11 @@ MOCK_STORE = {
             "location": "Bareilly", "job_type": "full-time", "work_mode": "onsite",
             "experience_required": "8+ Years", "description": "Design the core TechnoviaX infrastructure.",
             "requirements": "Python, Cloud Architecture, Leadership", "is_active": True,
-            "created_at": datetime.now(timezone.utc), "applications_count": 42
+            "created_at": datetime.now(timezone.utc).isoformat(), "applications_count": 42
         }
-    ],
-    "applications": []
+    ]
 }
+memory_backend.seed("jobs", MOCK_STORE["jobs"])
 
 # --- HELPER UTILITIES ---
 
@@ -180,41 +207,50 @@ def validate_file(file: UploadFile):
             detail=f"Invalid file type. Allowed: {ALLOWED_EXTENSIONS}"
         )
 
-async def upload_to_cloud(file: UploadFile, applicant_name: str) -> str:
+async def upload_to_cloud(file: UploadFile) -> str:
     """
     Uploads a file to Supabase Storage and returns the Public URL.
     Fallback to local storage if Supabase is unavailable.
+    The file is size-capped (413), hashed and sniffed in chunks, then stored
+    under its SHA-256, so a resume we already have is never uploaded twice.
     """
-    try:
-        # Generate unique safe filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = uuid.uuid4().hex[:8]
-        clean_name = re.sub(r'[^a-zA-Z0-9]', '_', applicant_name.lower())
-        ext = os.path.splitext(file.filename)[1].lower()
-        final_filename = f"{timestamp}_{clean_name}_{unique_id}{ext}"
-        cloud_path = f"{STORAGE_FOLDER}/{final_filename}"
-
-        file_data = await file.read()
+    ext = os.path.splitext(file.filename)[1].lower()
+    upload = await ingest_upload(file, ext)
+    cloud_path = content_path(STORAGE_FOLDER, upload.sha256, ext)
+    logger.info(f"📄 Resume received: {upload.size} bytes, sha256={upload.sha256[:12]}")
 
+    try:
         if SUPABASE_AVAILABLE:
-            # 1. Upload to Supabase Storage Bucket
-            supabase.storage.from_(BUCKET_NAME).upload(
+            existing = await find_resume(upload.sha256)
+            if existing:
+                logger.info(f"♻️ Resume {upload.sha256[:12]} already stored, upload skipped")
+                return existing
+            # 1. Upload to Supabase Storage Bucket (same bytes -> same path, so upsert is safe)
+            await db.storage(BUCKET_NAME).upload(
                 path=cloud_path,
-                file=file_data,
-                file_options={"content-type": file.content_type}
+                file=upload.stream,
+                content_type=upload.content_type,
+                size=upload.size,
+                upsert=True,
             )
-            # 2. Get the public access URL
-            public_url = supabase.storage.from_(BUCKET_NAME).get_public_url(cloud_path)
+            # 2. Get the public access URL and remember it for the next duplicate
+            public_url = db.storage(BUCKET_NAME).get_public_url(cloud_path)
+            await record_resume(upload.sha256, cloud_path, public_url, upload.size, upload.content_type)
             return public_url
         else:
-            # Local Storage Fallback
+            # Local Storage Fallback (content-addressed too: an existing file is reused)
+            final_filename = f"{upload.sha256}{ext}"
             local_dir = BASE_DIR / "uploads" / "resumes"
             local_dir.mkdir(parents=True, exist_ok=True)
             local_file_path = local_dir / final_filename
-            with open(local_file_path, "wb") as f:
-                f.write(file_data)
+            if not local_file_path.exists():
+                with open(local_file_path, "wb") as f:
+                    shutil.copyfileobj(upload.stream, f, settings.UPLOAD_CHUNK_SIZE)
             return f"/uploads/resumes/{final_filename}"
-            
+
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"File Upload Error: {str(e)}")
         raise HTTPException(
@@ -222,78 +258,127 @@ async def upload_to_cloud(file: UploadFile, applicant_name: str) -> str:
             detail="Cloud storage synchronization failed."
         )
 
+async def spool_resume(file: UploadFile) -> tuple:
+    """
+    RESUME_UPLOAD_MODE=async: validate, then park the file in the local spool for the uploader.
+    Returns (url, None) when the same resume is already stored, else (None, spooled job).
+    """
+    ext = os.path.splitext(file.filename)[1].lower()
+    upload = await ingest_upload(file, ext)
+    existing = await find_resume(upload.sha256)
+    if existing:
+        logger.info(f"♻️ Resume {upload.sha256[:12]} already stored, nothing to spool")
+        return existing, None
+    cloud_path = content_path(STORAGE_FOLDER, upload.sha256, ext)
+    try:
+        return None, await asyncio.to_thread(resume_uploader.spool, upload, BUCKET_NAME, cloud_path)
+    except OSError as e:
+        logger.error(f"Resume Spool Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Cloud storage synchronization failed."
+        )
+
+# Application writes change the counts on cached job reads (embedded or trigger column)
+JOB_COUNT_TABLES = ("job_applications",)
+
+def application_count_column() -> str:
+    if settings.APPLICATION_COUNT_SOURCE == "column":
+        return "applications_count"
+    # PostgREST embedded aggregate: counts ride along in the same request
+    return "job_applications(count)"
+
+def job_list_columns() -> str:
+    """Select list for job listings, including the per-job application count."""
+    if settings.APPLICATION_COUNT_SOURCE == "column":
+        return "*"
+    return f"*, {application_count_column()}"
+
+def flatten_application_count(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn the embedded `job_applications: [{count: n}]` into `applications_count`."""
+    embedded = job.pop("job_applications", None)
+    if embedded is not None:
+        job["applications_count"] = embedded[0]["count"] if embedded else 0
+    job.setdefault("applications_count", 0)
+    return job
+
 # --- PUBLIC ENDPOINTS (CANDIDATE FACING) ---
 
 @router.get("/openings", response_model=List[JobRead], summary="Get all active jobs")
 async def get_active_openings(
+    request: Request,
+    response: Response,
     department: Optional[str] = Query(None, description="Filter by dept"),
     location: Optional[str] = Query(None, description="Filter by location"),
-    search: Optional[str] = Query(None, description="Search in titles"),
-    limit: int = Query(20, ge=1, le=100)
+    search: Optional[str] = Query(None, description="Ranked full-text search (prefix matching)"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,title"),
 ):
     """
     Fetches a list of all currently active job openings from Supabase.
     Implements multi-parameter filtering and search logic.
     """
-    if not SUPABASE_AVAILABLE:
-        return MOCK_STORE["jobs"]
+    selected = JOB_FIELDS.parse(fields)
+    columns = JOB_FIELDS.columns(selected, default=job_list_columns())
 
-    try:
-        # Construct the query
-        query = supabase.table("jobs").select("*").eq("is_active", True)
-        
+    def openings_query():
+        if search and search.strip():
+            # Relevance-ranked tsvector search (sql/006); the RPC's ORDER BY is kept
+            query = db.rpc_select("search_jobs", q=search)
+        else:
+            query = db.table("jobs").order("created_at", desc=True)
+        query = query.select(columns).eq("is_active", True)
         if department and department.lower() != "all":
             query = query.ilike("department", f"%{department}%")
-        
         if location and location.lower() != "all":
             query = query.ilike("location", f"%{location}%")
-            
-        result = query.order("created_at", desc=True).limit(limit).execute()
-        
-        # Check if result has data (PGRST205 errors usually caught here)
-        if hasattr(result, 'data') and result.data is not None:
-            jobs = result.data
-        else:
-            # Fallback if result exists but data is missing (schema issues)
-            logger.warning("Supabase returned empty data or schema error. Using mock.")
-            return MOCK_STORE["jobs"]
-
-        # Logic to append application counts per job
-        for job in jobs:
-            try:
-                count_res = supabase.table("job_applications").select("id", count="exact").eq("job_id", job["id"]).execute()
-                job["applications_count"] = count_res.count or 0
-            except Exception:
-                job["applications_count"] = 0
-
-        return jobs
+        return query.limit(limit)
+
+    try:
+        try:
+            result = await openings_query().cache(depends_on=("jobs", *JOB_COUNT_TABLES)).execute()
+        except RepositoryError as e:
+            if e.status_code != 404 or not search:
+                raise
+            logger.warning("search_jobs() RPC missing, falling back to title ilike")
+            query = db.table("jobs").select(columns).eq("is_active", True).ilike("title", f"%{search}%")
+            result = await query.order("created_at", desc=True).limit(limit).execute()
+        check_not_modified(request, response, result_etag(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Jobs Fetch Error: {str(e)}")
-        # RESILIENCE: Return mock data instead of 500 if the database table is missing
-        return MOCK_STORE["jobs"]
+        # RESILIENCE: same filters against the in-memory index instead of a 500
+        result = await db.execute_offline(openings_query())
+
+    # Counts arrive with the jobs themselves (one round trip for the whole page)
+    jobs = [flatten_application_count(job) for job in result.data or []]
+    return JOB_FIELDS.respond(jobs, selected, response) if selected else jobs
 
 @router.get("/openings/{job_id}", response_model=JobRead)
-async def get_job_detail(job_id: int):
+async def get_job_detail(job_id: int, request: Request, response: Response):
     """Fetch specific job details for the description page."""
-    if not SUPABASE_AVAILABLE:
-        job = next((j for j in MOCK_STORE["jobs"] if j["id"] == job_id), None)
-        if not job: raise HTTPException(404, "Job not found")
-        return job
-
+    detail_query = lambda: db.table("jobs").select(job_list_columns()).eq("id", job_id).single()
     try:
-        result = supabase.table("jobs").select("*").eq("id", job_id).single().execute()
-        if not result.data:
-            raise HTTPException(status_code=404, detail="The requested job opening no longer exists.")
-        return result.data
+        result = await detail_query().cache(depends_on=JOB_COUNT_TABLES).execute()
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Job Detail Fetch Error: {str(e)}")
-        # Fallback to mock if available for that ID
-        job = next((j for j in MOCK_STORE["jobs"] if j["id"] == job_id), None)
-        if job: return job
-        raise HTTPException(500, "Database communication error.")
+        # Fallback to the in-memory index if it knows that ID
+        result = await db.execute_offline(detail_query())
+        if not result.data:
+            raise HTTPException(500, "Database communication error.")
+        return flatten_application_count(result.data)
+
+    if not result.data:
+        raise HTTPException(status_code=404, detail="The requested job opening no longer exists.")
+    check_not_modified(request, response, result_etag(result))
+    return flatten_application_count(result.data)
 
 @router.post("/apply", status_code=status.HTTP_201_CREATED)
 async def submit_job_application(
+    request: Request,
     name: str = Form(...),
     email: EmailStr = Form(...),
     phone: Optional[str] = Form(None),
@@ -308,12 +393,30 @@ async def submit_job_application(
     1. Validates the incoming resume file.
     2. Stream-uploads to cloud storage.
     3. Records the application meta-data in the relational database.
+    With RESUME_UPLOAD_MODE=async, step 2 only spools the file locally and
+    the response is 202; the upload finishes in the background.
+    Retries (same Idempotency-Key, or same email + job within the window)
+    replay the first response instead of applying twice.
     """
+    key = idempotency_key(request, "apply", email, job_id)
+    return await idempotency_store.run(
+        key,
+        lambda: process_application(name, email, phone, job_id, job_title, cover_letter, portfolio_url, resume),
+        status.HTTP_201_CREATED,
+    )
+
+async def process_application(name: str, email: str, phone: Optional[str], job_id: int, job_title: str,
+                              cover_letter: Optional[str], portfolio_url: Optional[str], resume: UploadFile):
+    """Validate, store the resume and insert the application row (runs once per idempotency key)."""
     # 1. Validation
     validate_file(resume)
 
     # 2. Cloud Storage Processing
-    cloud_url = await upload_to_cloud(resume, name)
+    spooled = None
+    if settings.RESUME_UPLOAD_MODE == "async" and SUPABASE_AVAILABLE:
+        cloud_url, spooled = await spool_resume(resume)
+    else:
+        cloud_url = await upload_to_cloud(resume)
 
     # 3. Database Persistence
     application_payload = {
@@ -328,56 +431,181 @@ async def submit_job_application(
         "status": "pending",
         "applied_at": datetime.now(timezone.utc).isoformat()
     }
-
-    if not SUPABASE_AVAILABLE:
-        MOCK_STORE["applications"].append(application_payload)
-        return {"message": "Application saved to mock store.", "url": cloud_url}
+    if spooled:
+        application_payload["resume_status"] = "pending"
 
     try:
-        db_result = supabase.table("job_applications").insert(application_payload).execute()
+        db_result = await db.table("job_applications").insert(application_payload).execute()
         if not db_result.data:
             raise Exception("Database insertion failed.")
-        
+
+        career_stats_rollup.record_application(job_id, job_title, job_facets.value(job_id, "department"))
+        application_id = db_result.data[0]["id"]
+        await notify_later("application.notify_hr", {
+            "application_id": application_id, "name": application_payload["name"],
+            "email": application_payload["email"], "job_title": job_title,
+        })
+        if spooled:
+            await resume_uploader.enqueue(spooled, application_id)
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={
+                "success": True,
+                "message": "Your application has been received. Our HR team will contact you soon.",
+                "application_id": application_id,
+                "tracking_id": spooled.tracking_id,
+            })
         return {
             "success": True, 
             "message": "Your application has been received. Our HR team will contact you soon.",
-            "application_id": db_result.data[0]["id"]
+            "application_id": application_id
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Application Database Error: {str(e)}")
+        if spooled and spooled.application_id is None:
+            await asyncio.to_thread(resume_uploader.abandon, spooled)
         raise HTTPException(500, "Failed to register application in database.")
 
+@router.get("/apply/{tracking_id}")
+async def get_resume_upload_status(tracking_id: str):
+    """Progress of a background resume upload (RESUME_UPLOAD_MODE=async)."""
+    progress = resume_uploader.status(tracking_id)
+    if not progress:
+        raise HTTPException(404, "No pending upload with that tracking id.")
+    return progress
+
 # --- ADMIN ENDPOINTS (INTERNAL ONLY) ---
 
+@router.post("/admin/jobs", response_model=JobRead, status_code=status.HTTP_201_CREATED)
+async def create_job(job: JobCreate, admin: AdminUser):
+    """Admin-only: Publish a new opening."""
+    result = await db.table("jobs").insert(job.model_dump(mode="json")).execute()
+    if not result.data:
+        raise HTTPException(400, "Database insertion failed.")
+
+    job_facets.upsert(result.data[0])
+    job_suggest.upsert(result.data[0])
+    logger.info(f"📢 Job '{job.title}' published by {admin.email}")
+    return result.data[0]
+
+@router.patch("/admin/jobs/{job_id}", response_model=JobRead)
+async def update_job(job_id: int, job: JobUpdate, admin: AdminUser):
+    """Admin-only: Edit an opening (set is_active=false to close it)."""
+    update_data = job.model_dump(mode="json", exclude_unset=True)
+    if not update_data:
+        raise HTTPException(400, "No fields provided for update.")
+    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+    result = await db.table("jobs").update(update_data).eq("id", job_id).execute()
+    if not result.data:
+        raise HTTPException(404, "Job not found.")
+
+    job_facets.upsert(result.data[0])
+    job_suggest.upsert(result.data[0])
+    return result.data[0]
+
+@router.delete("/admin/jobs/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_job(job_id: int, admin: AdminUser):
+    """Admin-only: Close an opening. Rows are kept so applications stay linked."""
+    result = await db.table("jobs").update({
+        "is_active": False, "updated_at": datetime.now(timezone.utc).isoformat()
+    }).eq("id", job_id).execute()
+    if not result.data:
+        raise HTTPException(404, "Job not found.")
+
+    job_facets.remove(job_id)
+    job_suggest.remove(job_id)
+    logger.warning(f"🗑️ Job ID {job_id} closed by {admin.email}")
+    return None
+
 @router.get("/admin/applications", response_model=List[ApplicationRead])
-async def list_all_applications(status: Optional[ApplicationStatus] = None):
-    """Admin-only: Retrieve all submitted applications."""
-    if not SUPABASE_AVAILABLE: return MOCK_STORE["applications"]
+async def list_all_applications(
+    admin: AdminUser,
+    response: Response,
+    status: Optional[ApplicationStatus] = None,
+    limit: int = Query(settings.ADMIN_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,title"),
+):
+    """Admin-only: Retrieve submitted applications, newest first, in keyset pages."""
+    selected = APPLICATION_FIELDS.parse(fields)
+
+    def applications_query():
+        query = db.table("job_applications").select(APPLICATION_FIELDS.columns(selected, extra=("applied_at",)))
+        if status:
+            query = query.eq("status", status)
+        return keyset(query, "applied_at", cursor, limit)
 
     try:
-        query = supabase.table("job_applications").select("*")
+        result = await applications_query().execute()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Applications Fetch Error: {str(e)}")
+        result = await db.execute_offline(applications_query())
+
+    rows = paginate(result.data, "applied_at", limit, response)
+    return APPLICATION_FIELDS.respond(rows, selected, response) if selected else rows
+
+@router.get("/admin/applications/export")
+async def export_applications(
+    admin: AdminUser,
+    format: str = Query("csv", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    status: Optional[ApplicationStatus] = None,
+    job_id: Optional[int] = None,
+):
+    """Admin-only: Stream all applications (newest first) as csv, ndjson or a json array."""
+    def build():
+        query = db.table("job_applications").select("*")
         if status:
             query = query.eq("status", status)
-        
-        result = query.order("applied_at", desc=True).execute()
-        return result.data or []
-    except Exception:
-        return MOCK_STORE["applications"]
+        if job_id:
+            query = query.eq("job_id", job_id)
+        return query
+
+    logger.info(f"📦 Applications export ({format}) requested by {admin.email}")
+    return await stream_export(build, "applied_at", format, "focitech_applications_export")
+
+@router.patch("/admin/applications/bulk")
+async def bulk_update_application_status(batch: ApplicationBulkUpdate, admin: AdminUser):
+    """Admin-only: Move many applications to one stage in a single upstream call."""
+    ids = unique_ids(batch.ids)
+    update_data = {"status": batch.status, "status_updated_at": datetime.now(timezone.utc).isoformat()}
+    if batch.notes: update_data["internal_notes"] = batch.notes
+
+    try:
+        # Echo the contact fields too, for the applicant status emails
+        result = await bulk_query(db.table("job_applications").update(update_data), ids).returning(
+            "id,name,email,job_title"
+        ).execute()
+    except Exception as e:
+        logger.error(f"Bulk Status Update Error: {str(e)}")
+        raise HTTPException(500, "Failed to update status in database.")
+
+    outcome = bulk_outcome(ids, result.data)
+    if outcome["succeeded"]:
+        career_stats_rollup.invalidate()
+        await notify_applicants(batch.status.value, result.data)
+    logger.info(f"🗂️ {len(outcome['succeeded'])} applications marked as {batch.status.value} by {admin.email}")
+    return outcome
 
 @router.patch("/admin/applications/{app_id}")
-async def update_application_status(app_id: int, status: ApplicationStatus, notes: Optional[str] = None):
+async def update_application_status(app_id: int, status: ApplicationStatus, admin: AdminUser, notes: Optional[str] = None):
     """Admin-only: Move application through the pipeline (Shortlist/Reject/Hire)."""
-    if not SUPABASE_AVAILABLE: return {"status": "updated"}
-
-    update_data = {"status": status}
+    update_data = {"status": status, "status_updated_at": datetime.now(timezone.utc).isoformat()}
     if notes: update_data["internal_notes"] = notes
 
     try:
-        result = supabase.table("job_applications").update(update_data).eq("id", app_id).execute()
+        result = await db.table("job_applications").update(update_data).eq("id", app_id).execute()
         if not result.data:
             raise HTTPException(404, "Application record not found.")
-        
+
+        career_stats_rollup.invalidate()
+        await notify_applicants(status.value, result.data)
+        logger.info(f"🗂️ Application {app_id} marked as {status.value} by {admin.email}")
         return {"message": f"Application {app_id} marked as {status}."}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Status Update Error: {str(e)}")
         raise HTTPException(500, "Failed to update status in database.")
@@ -385,39 +613,11 @@ async def update_application_status(app_id: int, status: ApplicationStatus, note
 @router.get("/stats", response_model=CareerStats)
 async def get_hr_analytics():
     """Aggregates data for the HR Dashboard visualization."""
-    if not SUPABASE_AVAILABLE:
-        return {
-            "total_active_jobs": 1, "total_applications": 0,
-            "applications_by_status": {"pending": 0}, "department_distribution": {"Engineering": 1}
-        }
-
     try:
-        # Get Job Stats
-        jobs_res = supabase.table("jobs").select("department").eq("is_active", True).execute()
-        # Get App Stats
-        apps_res = supabase.table("job_applications").select("status").execute()
-        
-        jobs_data = jobs_res.data or []
-        apps_data = apps_res.data or []
-
-        # Build Department distribution
-        dept_dist = {}
-        for j in jobs_data:
-            d = j["department"]
-            dept_dist[d] = dept_dist.get(d, 0) + 1
-            
-        # Build Status distribution
-        status_dist = {}
-        for a in apps_data:
-            s = a["status"]
-            status_dist[s] = status_dist.get(s, 0) + 1
-
-        return {
-            "total_active_jobs": len(jobs_data),
-            "total_applications": len(apps_data),
-            "applications_by_status": status_dist,
-            "department_distribution": dept_dist
-        }
+        # GROUP BY rollup in Postgres (sql/003), cached in-process between refreshes
+        return await get_career_stats()
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Stats Calculation Error: {str(e)}")
         return {
@@ -427,28 +627,64 @@ async def get_hr_analytics():
 
 # --- FILTER DATA ENDPOINTS ---
 
+async def load_job_facets():
+    """Facet index for active jobs (memory, reloaded from `jobs` when stale)."""
+    return await ensure_job_facets()
+
+@router.get("/facets")
+async def get_job_facets(request: Request, response: Response):
+    """All filter values for the Careers page with active-job counts, in one call."""
+    try:
+        index = await load_job_facets()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Facet Index Error: {str(e)}")
+        return {f: [] for f in JOB_FACETS}
+    snapshot = index.snapshot()
+    check_not_modified(request, response, make_etag(snapshot))
+    return snapshot
+
 @router.get("/departments")
-async def get_departments():
+async def get_departments(request: Request, response: Response):
     """Helper for frontend dropdowns."""
-    if not SUPABASE_AVAILABLE: return {"departments": ["Engineering", "Design", "Marketing"]}
     try:
-        res = supabase.table("jobs").select("department").execute()
-        unique_depts = sorted(list(set([r["department"] for r in res.data])))
-        return {"departments": unique_depts}
+        index = await load_job_facets()
+        payload = {"departments": index.values("department")}
+        check_not_modified(request, response, make_etag(payload))
+        return payload
+    except HTTPException:
+        raise
     except Exception:
         return {"departments": ["Engineering", "Design", "Marketing"]}
 
 @router.get("/locations")
-async def get_locations():
+async def get_locations(request: Request, response: Response):
     """Helper for frontend dropdowns."""
-    if not SUPABASE_AVAILABLE: return {"locations": ["Remote", "Bareilly", "Noida"]}
     try:
-        res = supabase.table("jobs").select("location").execute()
-        unique_locs = sorted(list(set([r["location"] for r in res.data])))
-        return {"locations": unique_locs}
+        index = await load_job_facets()
+        payload = {"locations": index.values("location")}
+        check_not_modified(request, response, make_etag(payload))
+        return payload
+    except HTTPException:
+        raise
     except Exception:
         return {"locations": ["Remote", "Bareilly", "Noida"]}
 
+@router.get("/suggest")
+async def suggest_jobs(
+    q: str = Query("", max_length=100, description="What the user has typed so far"),
+    kind: Optional[str] = Query(None, description="title, department or location"),
+    limit: int = Query(8, ge=1, le=settings.SUGGEST_MAX_RESULTS),
+):
+    """Type-ahead for the Careers search box, answered from memory (no DB hit per keystroke)."""
+    try:
+        index = await ensure_suggest(job_suggest)
+    except Exception as e:
+        logger.error(f"Suggest Index Error: {str(e)}")
+        return []
+    return index.suggest(q, limit, kind)
+
 # --- SYSTEM HEALTH ---
 
 @router.get("/status")
@@ -2,4 +2,5 @@ from .projects import router as projects
 from .inquiries import router as inquiries
 from .team import router as team
 from .auth import router as auth 
-from .Careers import router as careers
\ No newline at end of file
+from .Careers import router as careers
+from .system import router as system
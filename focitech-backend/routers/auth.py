@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from core.config import supabase
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from core.supabase import get_supabase, is_configured
+from core.executor import run_in_bulkhead
+from core.session_cache import revoke_session
+from dependencies import CurrentUser
 from schemas import UserAuth, Token, UserRead, UserCreate
 from typing import Annotated
 import logging
@@ -16,7 +19,7 @@ async def signup(user_data: UserCreate):
     """
     try:
         # 1. Create user in Supabase
-        response = supabase.auth.sign_up({
+        response = await run_in_bulkhead("auth", get_supabase().auth.sign_up, {
             "email": user_data.email,
             "password": user_data.password,
             "options": {
@@ -43,6 +46,8 @@ async def signup(user_data: UserCreate):
             "created_at": response.user.created_at
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Signup Error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -53,7 +58,7 @@ async def login(credentials: UserAuth):
     Authenticate user and return Supabase JWT token.
     """
     try:
-        response = supabase.auth.sign_in_with_password({
+        response = await run_in_bulkhead("auth", get_supabase().auth.sign_in_with_password, {
             "email": credentials.email,
             "password": credentials.password
         })
@@ -79,6 +84,8 @@ async def login(credentials: UserAuth):
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.warning(f"Login failed for {credentials.email}: {str(e)}")
         raise HTTPException(
@@ -87,22 +94,35 @@ async def login(credentials: UserAuth):
         )
 
 @router.post("/logout")
-async def logout():
+async def logout(request: Request):
     """
     Global logout (Client will also need to clear local storage)
+    Also revokes the bearer token from the verified-session cache; tokens
+    that do not verify are ignored, so they cannot crowd out real sign-outs.
+    The Supabase sign-out is best effort: without Supabase, or when it
+    fails, the token is still revoked locally and logout succeeds.
     """
-    supabase.auth.sign_out()
+    auth_header = request.headers.get("Authorization", "")
+    parts = auth_header.split()
+    if len(parts) == 2 and parts[0] == "Bearer":
+        await revoke_session(parts[1])
+
+    if is_configured():
+        try:
+            await run_in_bulkhead("auth", get_supabase().auth.sign_out)
+        except Exception as e:
+            logger.warning(f"⚠️ Supabase sign-out failed, token revoked locally only: {str(e)}")
     return {"message": "Successfully logged out"}
 
 @router.get("/me", response_model=UserRead)
-async def get_me(current_user: Annotated[dict, Depends(supabase.auth.get_user)]):
+async def get_me(current_user: CurrentUser):
     """
     Fetch current logged-in user details (Token validation test)
     """
     return {
-        "email": current_user.user.email,
-        "full_name": current_user.user.user_metadata.get("full_name"),
-        "id": 0,
+        "email": current_user.email,
+        "full_name": current_user.user_metadata.get("full_name"),
+        "id": current_user.id,
         "is_active": True,
-        "created_at": current_user.user.created_at
+        "created_at": current_user.created_at
     }
\ No newline at end of file
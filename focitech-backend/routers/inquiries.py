@@ -1,37 +1,78 @@
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
-from schemas import InquiryCreate, InquiryUpdate, InquiryRead
-from core.config import supabase
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from schemas import InquiryCreate, InquiryUpdate, InquiryRead, InquiryBulkUpdate, InquiryStatus, BulkIds, BulkResult
+from core.config import settings
+from core.repository import db
+from core.pagination import keyset, paginate
+from core.fields import FieldSet
+from core.bulk import bulk_outcome, bulk_query, unique_ids
+from core.export import EXPORT_FORMATS, stream_export
+from core.idempotency import idempotency_key, idempotency_store
+from core.notifications import notify_later
+from core.spam import spam_filter
 from dependencies import AdminUser
-from typing import List
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger("focitech_api")
 router = APIRouter()
 
-# --- HELPER: BACKGROUND TASKS ---
-def notify_admin_of_inquiry(name: str, email: str):
-    # Potential for future email integration (SendGrid/Postmark)
-    logger.info(f"📧 NEW INQUIRY: {name} ({email}) registered in the Focitech ecosystem.")
+# Allow-list for ?fields= on the admin list route
+INQUIRY_FIELDS = FieldSet(InquiryRead)
+
+INQUIRY_RECEIVED = {"status": "success", "message": "Your inquiry node has been synchronized."}
 
 # --- PUBLIC ENDPOINT: CONTACT FORM ---
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_inquiry(inquiry: InquiryCreate, background_tasks: BackgroundTasks):
+async def create_inquiry(inquiry: InquiryCreate, request: Request):
     """
     Public entry point for lead generation. 
     Matches the updated 'subject' mandatory schema.
+    Retried submissions (Idempotency-Key, or same email + subject + message within the window) are stored once.
+    Spam scoring (core/spam.py) runs before the insert: likely spam is stored as 'spam',
+    obvious spam is quarantined in memory (or rejected) without touching the database.
     """
+    key = idempotency_key(request, "contact", inquiry.email, inquiry.subject, inquiry.message)
+    client_ip = request.client.host if request.client else None
+    return await idempotency_store.run(
+        key, lambda: save_inquiry(inquiry, client_ip), status.HTTP_201_CREATED
+    )
+
+async def save_inquiry(inquiry: InquiryCreate, client_ip: Optional[str]):
+    data = inquiry.model_dump(exclude={"website"})
+    verdict = None
+    if settings.SPAM_FILTER_ENABLED:
+        verdict = spam_filter.check(
+            inquiry.name, inquiry.email, inquiry.subject, inquiry.message, inquiry.website, client_ip
+        )
+        if verdict.action == "block":
+            logger.warning(f"🚫 Spam blocked from {client_ip} ({inquiry.email}): score {verdict.score:.2f} [{', '.join(verdict.reasons)}]")
+            if settings.SPAM_BLOCK_ACTION == "reject":
+                raise HTTPException(status_code=400, detail="Your message could not be accepted.")
+            # Same answer as a real lead, so bots learn nothing
+            spam_filter.hold(data, verdict, client_ip)
+            return INQUIRY_RECEIVED
+        if verdict.action == "tag":
+            data["status"] = InquiryStatus.SPAM.value
+
     try:
-        data = inquiry.model_dump()
-        result = supabase.table("inquiries").insert(data).execute()
+        result = await db.table("inquiries").insert(data).execute()
         
         if not result.data:
             raise HTTPException(status_code=400, detail="Database insertion failed.")
 
-        background_tasks.add_task(notify_admin_of_inquiry, inquiry.name, inquiry.email)
+        if verdict and verdict.action == "tag":
+            logger.info(f"🏷️ Inquiry from {inquiry.email} tagged as spam: score {verdict.score:.2f} [{', '.join(verdict.reasons)}]")
+            return INQUIRY_RECEIVED
+
+        await notify_later("inquiry.notify_admin", {
+            "name": inquiry.name, "email": inquiry.email, "subject": inquiry.subject,
+        })
         logger.info(f"✅ Secure Transmission: Lead received from {inquiry.email}")
-        return {"status": "success", "message": "Your inquiry node has been synchronized."}
+        return INQUIRY_RECEIVED
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Transmission Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -39,12 +80,89 @@ async def create_inquiry(inquiry: InquiryCreate, background_tasks: BackgroundTas
 # --- ADMIN PROTECTED ENDPOINTS ---
 
 @router.get("/", response_model=List[InquiryRead])
-async def get_all_inquiries(admin: AdminUser):
+async def get_all_inquiries(
+    admin: AdminUser,
+    response: Response,
+    limit: int = Query(settings.ADMIN_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,title"),
+):
+    """
+    Retrieve client leads, newest first. Admin node access required.
+    Keyset pages on (created_at, id); follow X-Next-Cursor for older leads.
+    """
+    selected = INQUIRY_FIELDS.parse(fields)
+    query = db.table("inquiries").select(INQUIRY_FIELDS.columns(selected, extra=("created_at",)))
+    result = await keyset(query, "created_at", cursor, limit).execute()
+    rows = paginate(result.data, "created_at", limit, response)
+    return INQUIRY_FIELDS.respond(rows, selected, response) if selected else rows
+
+@router.get("/export")
+async def export_inquiries(
+    admin: AdminUser,
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    lead_status: Optional[InquiryStatus] = Query(None, alias="status", description="Only leads in this state"),
+):
+    """
+    EXPORT: Stream every lead (newest first) as ndjson, csv or a json array.
+    """
+    def build():
+        query = db.table("inquiries").select("*")
+        return query.eq("status", lead_status) if lead_status else query
+
+    logger.info(f"📦 Inquiry export ({format}) requested by Admin: {admin.email}")
+    return await stream_export(build, "created_at", format, "focitech_inquiries_export")
+
+@router.get("/quarantine")
+async def list_quarantined_inquiries(admin: AdminUser):
+    """
+    SPAM REVIEW: Submissions blocked by the spam filter and never written (this worker, newest first).
+    """
+    return list(reversed(spam_filter.quarantine.values()))
+
+@router.post("/quarantine/{quarantine_id}/release", status_code=status.HTTP_201_CREATED)
+async def release_quarantined_inquiry(quarantine_id: int, admin: AdminUser):
+    """
+    SPAM REVIEW: Store a wrongly blocked submission as a normal pending lead.
+    """
+    data = spam_filter.release(quarantine_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Quarantined inquiry not found.")
+
+    result = await db.table("inquiries").insert(data).execute()
+    if not result.data:
+        raise HTTPException(status_code=400, detail="Database insertion failed.")
+    await notify_later("inquiry.notify_admin", {
+        "name": data["name"], "email": data["email"], "subject": data["subject"],
+    })
+    logger.info(f"♻️ Quarantined inquiry from {data['email']} released by Admin: {admin.email}")
+    return {"message": "Inquiry released", "data": result.data[0]}
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_inquiries(batch: InquiryBulkUpdate, admin: AdminUser):
+    """
+    TRIAGE: Apply one status/note change to many inquiries in a single upstream call.
+    """
+    ids = unique_ids(batch.ids)
+    update_data = batch.model_dump(exclude={"ids"}, exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No changes provided.")
+
+    result = await bulk_query(db.table("inquiries").update(update_data), ids).execute()
+    outcome = bulk_outcome(ids, result.data)
+    logger.info(f"🛠 Bulk Override: {len(outcome['succeeded'])} nodes updated by Admin: {admin.email}")
+    return outcome
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_remove_inquiries(batch: BulkIds, admin: AdminUser):
     """
-    Retrieve all client leads. Admin node access required.
+    PURGE: Erase many inquiries (e.g. spam) in a single upstream call.
     """
-    result = supabase.table("inquiries").select("*").order("created_at", desc=True).execute()
-    return result.data
+    ids = unique_ids(batch.ids)
+    result = await bulk_query(db.table("inquiries").delete(), ids).execute()
+    outcome = bulk_outcome(ids, result.data)
+    logger.warning(f"🗑 Bulk Erasure: {len(outcome['succeeded'])} nodes purged by Admin: {admin.email}")
+    return outcome
 
 # FIXED: Changed from @router.patch to @router.put to fix the 405 error
 @router.put("/{inquiry_id}") 
@@ -57,13 +175,15 @@ async def update_inquiry_status(inquiry_id: int, update: InquiryUpdate, admin: A
         # Filter out unset fields to prevent accidental overwrites
         update_data = {k: v for k, v in update.model_dump(exclude_unset=True).items()}
         
-        result = supabase.table("inquiries").update(update_data).eq("id", inquiry_id).execute()
+        result = await db.table("inquiries").update(update_data).eq("id", inquiry_id).execute()
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Inquiry node not found in cloud.")
             
         logger.info(f"🛠 Status Override: Node {inquiry_id} updated by Admin: {admin.email}")
         return {"message": "Protocol updated", "data": result.data[0]}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Protocol Update Failure: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -73,10 +193,10 @@ async def remove_inquiry(inquiry_id: int, admin: AdminUser):
     """
     PURGE: Permanently erase an inquiry record.
     """
-    check = supabase.table("inquiries").select("id").eq("id", inquiry_id).execute()
-    if not check.data:
+    # The delete echoes the removed row, so an empty result means it never existed
+    result = await db.table("inquiries").delete().eq("id", inquiry_id).returning("id").execute()
+    if not result.data:
         raise HTTPException(status_code=404, detail="Inquiry node not found.")
 
-    supabase.table("inquiries").delete().eq("id", inquiry_id).execute()
     logger.warning(f"🗑 Erasure Protocol: Node {inquiry_id} purged by Admin: {admin.email}")
     return None
\ No newline at end of file
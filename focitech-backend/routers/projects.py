@@ -1,9 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, status, Response
+from fastapi import APIRouter, HTTPException, Query, Depends, status, Request, Response
 from typing import List, Optional
-from core.config import supabase, settings
+from core.config import settings
+from core.repository import db, RepositoryError
+from core.http_cache import check_not_modified, make_etag, result_etag
+from core.pagination import keyset, paginate
+from core.fields import FieldSet
+from core.bulk import bulk_outcome, bulk_query, unique_ids
+from core.export import EXPORT_FORMATS, stream_export
+from core.suggest import ensure_suggest, project_suggest
+from core.facets import ensure_project_facets, project_facets
 from dependencies import CurrentUser, AdminUser # Using the refined dependencies
-from schemas import ProjectCreate, ProjectRead, ProjectUpdate
-import json
+from schemas import ProjectCreate, ProjectRead, ProjectUpdate, BulkIds, BulkResult
 import logging
 
 # Logger for tracking portfolio activity
@@ -11,34 +18,75 @@ logger = logging.getLogger("focitech_api")
 
 router = APIRouter()
 
+# Allow-list for ?fields= on the list route
+PROJECT_FIELDS = FieldSet(ProjectRead)
+
+# --- SEARCH HELPERS ---
+
+async def search_projects(search: str, tech: Optional[str], columns: str, limit: int, offset: int,
+                          request: Request, response: Response) -> list:
+    """Ranked tsvector search via the search_projects() RPC (sql/006), ilike if it is not deployed."""
+    try:
+        query = db.rpc_select("search_projects", q=search).select(columns)
+        if tech:
+            query = query.filter("tech_stack", "cs", f"{{{tech}}}")
+        result = await query.range(offset, offset + limit - 1).cache(depends_on=("projects",)).execute()
+    except RepositoryError as e:
+        if e.status_code != 404:
+            raise
+        logger.warning("search_projects() RPC missing, falling back to ilike search")
+        query = db.table("projects").select(columns).or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
+        if tech:
+            query = query.filter("tech_stack", "cs", f"{{{tech}}}")
+        result = await query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+
+    check_not_modified(request, response, result_etag(result))
+    return result.data or []
+
 # --- PUBLIC ENDPOINTS ---
 
 @router.get("/", response_model=List[ProjectRead])
 async def get_projects(
+    request: Request,
+    response: Response,
     tech: Optional[str] = Query(None, description="Filter by tech stack (e.g. React)"),
-    search: Optional[str] = Query(None, description="Search in title or description"),
-    limit: int = Query(20, le=100),
-    offset: int = 0
+    search: Optional[str] = Query(None, description="Ranked full-text search (prefix matching)"),
+    limit: int = Query(20, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    offset: int = Query(0, ge=0, description="Deprecated: use cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,title"),
 ):
     """
     READ: Fetch projects with advanced multi-filter and pagination.
     Perfect for infinite scroll or 'Load More' buttons on the frontend.
+    Pages are keyset-based on (created_at, id); follow X-Next-Cursor.
+    Search results come back by relevance and page with `offset` instead.
     """
+    selected = PROJECT_FIELDS.parse(fields)
+    columns = PROJECT_FIELDS.columns(selected, extra=("created_at",))
     try:
-        query = supabase.table("projects").select("*")
+        if search and search.strip():
+            rows = await search_projects(search, tech, columns, limit, offset, request, response)
+            return PROJECT_FIELDS.respond(rows, selected, response) if selected else rows
+
+        query = db.table("projects").select(columns)
 
         if tech:
             # Postgres 'contains' operator for array column
             query = query.filter("tech_stack", "cs", f"{{{tech}}}")
 
-        if search:
-            # Case-insensitive partial search on Title or Description
-            query = query.or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
-        
-        # Applying pagination range and latest-first order
-        result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
-        
-        return result.data
+        if offset and not cursor:
+            # Legacy offset paging for older clients (one look-ahead row, like keyset)
+            query = query.order("created_at", desc=True).order("id", desc=True).range(offset, offset + limit)
+        else:
+            query = keyset(query, "created_at", cursor, limit)
+        result = await query.cache().execute()
+
+        check_not_modified(request, response, result_etag(result))
+        rows = paginate(result.data, "created_at", limit, response)
+        return PROJECT_FIELDS.respond(rows, selected, response) if selected else rows
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Portfolio Fetch Error: {str(e)}")
         raise HTTPException(
@@ -46,12 +94,39 @@ async def get_projects(
             detail="Could not retrieve portfolio data."
         )
 
+@router.get("/suggest")
+async def suggest_projects(
+    q: str = Query("", max_length=100, description="What the user has typed so far"),
+    kind: Optional[str] = Query(None, description="project or tech"),
+    limit: int = Query(8, ge=1, le=settings.SUGGEST_MAX_RESULTS),
+):
+    """Type-ahead over project titles and tech stacks, answered from memory."""
+    try:
+        index = await ensure_suggest(project_suggest)
+    except Exception as e:
+        logger.error(f"Suggest Index Error: {str(e)}")
+        return []
+    return index.suggest(q, limit, kind)
+
+@router.get("/tech")
+async def get_tech_counts(request: Request, response: Response):
+    """Every technology in the portfolio with its project count, for filter chips."""
+    try:
+        index = await ensure_project_facets()
+    except Exception as e:
+        logger.error(f"Tech Facet Error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Could not retrieve technologies.")
+    payload = index.ranked("tech_stack")
+    check_not_modified(request, response, make_etag(payload))
+    return payload
+
 @router.get("/{project_id}", response_model=ProjectRead)
-async def get_single_project(project_id: int):
+async def get_single_project(project_id: int, request: Request, response: Response):
     """READ: Fetch deep details for a single project card."""
-    result = supabase.table("projects").select("*").eq("id", project_id).execute()
+    result = await db.table("projects").select("*").eq("id", project_id).cache().execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Project not found.")
+    check_not_modified(request, response, result_etag(result))
     return result.data[0]
 
 # --- ADMIN PROTECTED ENDPOINTS ---
@@ -67,10 +142,12 @@ async def add_project(project: ProjectCreate, admin: AdminUser):
     if isinstance(data.get('tech_stack'), str):
         data['tech_stack'] = [t.strip() for t in data['tech_stack'].split(',')]
 
-    result = supabase.table("projects").insert(data).execute()
+    result = await db.table("projects").insert(data).execute()
     if not result.data:
         raise HTTPException(status_code=400, detail="Database insertion failed.")
     
+    project_suggest.upsert(result.data[0])
+    project_facets.upsert(result.data[0])
     logger.info(f"🚀 Project '{project.title}' added by {admin.email}")
     return result.data[0]
 
@@ -86,36 +163,48 @@ async def update_project(
     if not update_data:
         raise HTTPException(status_code=400, detail="No changes provided.")
 
-    result = supabase.table("projects").update(update_data).eq("id", project_id).execute()
+    result = await db.table("projects").update(update_data).eq("id", project_id).execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Target project not found.")
     
+    project_suggest.upsert(result.data[0])
+    project_facets.upsert(result.data[0])
     logger.info(f"📝 Project {project_id} updated by {admin.email}")
     return result.data[0]
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(project_id: int, admin: AdminUser):
     """DELETE: Permanently wipe a project from the portfolio."""
-    # Pre-check existence
-    exists = supabase.table("projects").select("id").eq("id", project_id).execute()
-    if not exists.data:
+    # The delete echoes the removed row, so an empty result means it was already gone
+    result = await db.table("projects").delete().eq("id", project_id).returning("id").execute()
+    if not result.data:
         raise HTTPException(status_code=404, detail="Project already deleted.")
-         
-    supabase.table("projects").delete().eq("id", project_id).execute()
+
+    project_suggest.remove(project_id)
+    project_facets.remove(project_id)
     logger.warning(f"🗑️ Project {project_id} deleted by Admin {admin.email}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_projects(batch: BulkIds, admin: AdminUser):
+    """DELETE: Wipe many projects in a single upstream call."""
+    ids = unique_ids(batch.ids)
+    result = await bulk_query(db.table("projects").delete(), ids).execute()
+    outcome = bulk_outcome(ids, result.data)
+    for project_id in outcome["succeeded"]:
+        project_suggest.remove(project_id)
+        project_facets.remove(project_id)
+    logger.warning(f"🗑️ {len(outcome['succeeded'])} projects deleted by Admin {admin.email}")
+    return outcome
+
 @router.get("/admin/export-data", tags=["Admin Only"])
-async def export_projects_data(admin: AdminUser):
+async def export_projects_data(
+    admin: AdminUser,
+    format: str = Query("json", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+):
     """
     EXPORT: Secured data export for TechnoviaX internal records.
+    Streams keyset pages (json array, ndjson or csv) instead of building the file in memory.
     """
-    result = supabase.table("projects").select("*").execute()
-    content = json.dumps(result.data, indent=4)
-    filename = f"focitech_projects_export.json"
-    
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
\ No newline at end of file
+    logger.info(f"📦 Project export ({format}) requested by {admin.email}")
+    return await stream_export(lambda: db.table("projects").select("*"), "created_at", format, "focitech_projects_export")
\ No newline at end of file
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Query
+from core.session_cache import session_cache
+from core.executor import bulkhead_stats
+from core.supabase import pool_stats
+from core.career_stats import career_stats_rollup
+from core.facets import job_facets, project_facets
+from core.memory_index import memory_backend
+from core.suggest import suggest_stats
+from core.resume_pipeline import resume_uploader
+from core.idempotency import idempotency_store
+from core.task_queue import task_backend, task_worker
+from core.mailer import mailer
+from core.config import settings
+from core.spam import spam_filter
+from core.repository import query_cache
+from dependencies import AdminUser
+import asyncio
+import logging
+
+# Logger for runtime diagnostics
+logger = logging.getLogger("focitech_api")
+
+router = APIRouter()
+
+# --- ADMIN PROTECTED ENDPOINTS ---
+
+@router.get("/metrics")
+async def get_runtime_metrics(admin: AdminUser):
+    """
+    DIAGNOSTICS: In-process cache and pool counters for this worker.
+    """
+    return {
+        "session_cache": session_cache.stats(),
+        "query_cache": query_cache.stats(),
+        "bulkheads": bulkhead_stats(),
+        "http_pools": pool_stats(),
+        "career_stats": career_stats_rollup.stats(),
+        "job_facets": job_facets.stats(),
+        "project_facets": project_facets.stats(),
+        "memory_index": memory_backend.stats(),
+        "suggest": suggest_stats(),
+        "resume_uploads": resume_uploader.stats(),
+        "idempotency": idempotency_store.stats(),
+        "task_queue": await asyncio.to_thread(task_backend.stats),
+        "task_worker": task_worker.stats(),
+        "mail": {**mailer.stats(), "digest_seconds": settings.NOTIFY_DIGEST_SECONDS},
+        "spam_filter": spam_filter.stats(),
+    }
+
+@router.get("/tasks/dead")
+async def list_dead_tasks(admin: AdminUser, limit: int = Query(50, ge=1, le=500)):
+    """
+    DIAGNOSTICS: Background jobs that ran out of retries (newest first).
+    """
+    return await asyncio.to_thread(task_backend.dead_letters, limit)
+
+@router.post("/tasks/dead/requeue")
+async def requeue_dead_tasks(admin: AdminUser):
+    """
+    RECOVERY: Give every dead-lettered job a fresh set of attempts.
+    """
+    count = await asyncio.to_thread(task_backend.requeue_dead)
+    logger.info(f"♻️ Admin {admin.email} re-queued {count} dead tasks")
+    return {"requeued": count}
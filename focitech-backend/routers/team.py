@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Response
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request, Response
 from typing import List, Optional
-from core.config import supabase
+from core.repository import db
+from core.http_cache import check_not_modified, result_etag
+from core.fields import FieldSet
+from core.bulk import bulk_outcome, bulk_query, unique_ids
 from dependencies import AdminUser, CurrentUser # Using our refined dependency
-from schemas import TeamMemberRead, TeamMemberCreate, TeamMemberUpdate
+from schemas import TeamMemberRead, TeamMemberCreate, TeamMemberUpdate, BulkIds, BulkResult
 import logging
 
 # Logger for HR/Team management
@@ -10,18 +13,29 @@ logger = logging.getLogger("focitech_api")
 
 router = APIRouter()
 
+# Allow-list for ?fields= on the list route
+TEAM_FIELDS = FieldSet(TeamMemberRead)
+
 # --- PUBLIC ENDPOINTS ---
 
 @router.get("/", response_model=List[TeamMemberRead])
-async def get_team():
+async def get_team(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,title"),
+):
     """
     READ: Fetch the entire Focitech team list.
     Public: Used for the 'About Us' or 'Team' page.
     """
+    selected = TEAM_FIELDS.parse(fields)
     try:
         # Sorting by ID ensures consistent order on the UI
-        response = supabase.table("team").select("*").order("id", desc=False).execute()
-        return response.data
+        result = await db.table("team").select(TEAM_FIELDS.columns(selected)).order("id", desc=False).cache().execute()
+        check_not_modified(request, response, result_etag(result))
+        return TEAM_FIELDS.respond(result.data, selected, response) if selected else result.data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch team: {str(e)}")
         raise HTTPException(
@@ -30,12 +44,13 @@ async def get_team():
         )
 
 @router.get("/{member_id}", response_model=TeamMemberRead)
-async def get_team_member(member_id: int):
+async def get_team_member(member_id: int, request: Request, response: Response):
     """READ: Fetch deep details of a specific team member."""
-    response = supabase.table("team").select("*").eq("id", member_id).execute()
-    if not response.data:
+    result = await db.table("team").select("*").eq("id", member_id).cache().execute()
+    if not result.data:
         raise HTTPException(status_code=404, detail="Team member profile not found.")
-    return response.data[0]
+    check_not_modified(request, response, result_etag(result))
+    return result.data[0]
 
 # --- ADMIN PROTECTED ENDPOINTS (TechnoviaX Management) ---
 
@@ -51,7 +66,7 @@ async def add_team_member(member: TeamMemberCreate, admin: AdminUser):
     if not data.get("photo_url"):
         data["photo_url"] = "https://ui-avatars.com/api/?name=" + data["name"].replace(" ", "+")
 
-    result = supabase.table("team").insert(data).execute()
+    result = await db.table("team").insert(data).execute()
     
     if not result.data:
         raise HTTPException(status_code=400, detail="Database rejected team entry.")
@@ -75,7 +90,7 @@ async def update_team_member(
     if not update_data:
         raise HTTPException(status_code=400, detail="Modification request is empty.")
 
-    result = supabase.table("team").update(update_data).eq("id", member_id).execute()
+    result = await db.table("team").update(update_data).eq("id", member_id).execute()
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Target member not found.")
@@ -89,11 +104,22 @@ async def delete_team_member(member_id: int, admin: AdminUser):
     DELETE: Remove a member from the database.
     SECURE: High-level admin action.
     """
-    # Existence check
-    check = supabase.table("team").select("id").eq("id", member_id).execute()
-    if not check.data:
+    # The delete echoes the removed row, so an empty result means nothing was there
+    result = await db.table("team").delete().eq("id", member_id).returning("id").execute()
+    if not result.data:
         raise HTTPException(status_code=404, detail="Member already removed or non-existent.")
 
-    supabase.table("team").delete().eq("id", member_id).execute()
     logger.warning(f"🗑️ Team Member {member_id} removed from ecosystem by {admin.email}")
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_team_members(batch: BulkIds, admin: AdminUser):
+    """
+    DELETE: Remove many members in a single upstream call.
+    SECURE: High-level admin action.
+    """
+    ids = unique_ids(batch.ids)
+    result = await bulk_query(db.table("team").delete(), ids).execute()
+    outcome = bulk_outcome(ids, result.data)
+    logger.warning(f"🗑️ {len(outcome['succeeded'])} Team Members removed from ecosystem by {admin.email}")
+    return outcome
@@ -2,6 +2,7 @@ from pydantic import BaseModel, EmailStr, Field, validator  # ADDED validator he
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+from core.config import settings
 
 # --- ENUMS FOR DATA INTEGRITY ---
 class InquiryStatus(str, Enum):
@@ -24,7 +25,8 @@ class UserCreate(UserBase):
 class UserRead(UserBase):
     id: str  
     is_active: bool = True
-    created_at: datetime
+    # None when the session was verified from the JWT alone (no account lookup)
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -42,7 +44,8 @@ class InquiryBase(BaseModel):
     message: str = Field(..., min_length=2, max_length=2000)
 
 class InquiryCreate(InquiryBase):
-    pass
+    # Honeypot: hidden on the contact form, so only bots fill it in (never stored)
+    website: Optional[str] = Field(None, max_length=500)
 
 class InquiryUpdate(BaseModel):
     status: Optional[InquiryStatus] = None
@@ -111,6 +114,18 @@ class TeamMemberRead(TeamMemberBase):
     class Config:
         from_attributes = True
 
+# --- BULK ADMIN SCHEMAS ---
+class BulkIds(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_IDS)
+
+class InquiryBulkUpdate(InquiryUpdate):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_IDS)
+
+class BulkResult(BaseModel):
+    requested: int
+    succeeded: List[int]
+    not_found: List[int]
+
 
 # --- Careers MODELS ---
 class JobType(str, Enum):
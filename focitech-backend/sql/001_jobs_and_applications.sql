@@ -0,0 +1,51 @@
+-- sql/001_jobs_and_applications.sql
+-- Base careers schema. Run once in the Supabase SQL editor.
+
+-- Create jobs table
+CREATE TABLE IF NOT EXISTS jobs (
+    id BIGSERIAL PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    department VARCHAR(100) NOT NULL,
+    location VARCHAR(100) NOT NULL,
+    job_type VARCHAR(50) NOT NULL,
+    salary_range VARCHAR(100),
+    experience_required VARCHAR(100) NOT NULL,
+    education_required TEXT,
+    description TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    benefits TEXT,
+    is_active BOOLEAN DEFAULT true,
+    application_deadline TIMESTAMP,
+    posted_date TIMESTAMP DEFAULT NOW(),
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Create job_applications table
+CREATE TABLE IF NOT EXISTS job_applications (
+    id BIGSERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    phone VARCHAR(50),
+    cover_letter TEXT,
+    portfolio_url VARCHAR(500),
+    resume_filename VARCHAR(255),
+    job_id BIGINT NOT NULL,
+    job_title VARCHAR(255),
+    job_department VARCHAR(100),
+    job_type VARCHAR(50),
+    status VARCHAR(50) DEFAULT 'pending',
+    internal_notes TEXT,
+    source VARCHAR(100) DEFAULT 'Company Website',
+    additional_info TEXT,
+    applied_at TIMESTAMP DEFAULT NOW(),
+    status_updated_at TIMESTAMP,
+    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+);
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_jobs_is_active ON jobs(is_active);
+CREATE INDEX IF NOT EXISTS idx_jobs_department ON jobs(department);
+CREATE INDEX IF NOT EXISTS idx_job_applications_status ON job_applications(status);
+CREATE INDEX IF NOT EXISTS idx_job_applications_job_id ON job_applications(job_id);
+CREATE INDEX IF NOT EXISTS idx_job_applications_applied_at ON job_applications(applied_at DESC);
@@ -0,0 +1,29 @@
+-- sql/002_jobs_applications_count.sql
+-- Denormalized per-job application counter for /careers/openings.
+-- Enable with APPLICATION_COUNT_SOURCE=column once this has been applied.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS applications_count INTEGER NOT NULL DEFAULT 0;
+
+-- Keep the counter current on every insert / delete / job change of an application
+CREATE OR REPLACE FUNCTION sync_jobs_applications_count() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE jobs SET applications_count = applications_count + 1 WHERE id = NEW.job_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE jobs SET applications_count = GREATEST(applications_count - 1, 0) WHERE id = OLD.job_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_job_applications_count ON job_applications;
+CREATE TRIGGER trg_job_applications_count
+    AFTER INSERT OR DELETE OR UPDATE OF job_id ON job_applications
+    FOR EACH ROW EXECUTE FUNCTION sync_jobs_applications_count();
+
+-- Backfill existing rows
+UPDATE jobs j
+SET applications_count = c.total
+FROM (SELECT job_id, COUNT(*) AS total FROM job_applications GROUP BY job_id) c
+WHERE j.id = c.job_id;
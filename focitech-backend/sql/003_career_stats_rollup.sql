@@ -0,0 +1,100 @@
+-- sql/003_career_stats_rollup.sql
+-- Incremental rollup behind GET /careers/stats.
+-- application_rollup keeps one row per (job, status) so the dashboard reads
+-- O(jobs x statuses) rows instead of scanning job_applications.
+
+CREATE TABLE IF NOT EXISTS application_rollup (
+    job_id BIGINT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    status VARCHAR(50) NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    -- Sum of (status_updated_at - applied_at) for rows with status = 'hired'
+    hire_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    -- Hires that have both timestamps, i.e. the rows hire_seconds is summed over
+    timed_hires INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, status)
+);
+-- Databases that ran an earlier version of this file
+ALTER TABLE application_rollup ADD COLUMN IF NOT EXISTS timed_hires INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION application_hire_seconds(row_status TEXT, applied TIMESTAMP, updated TIMESTAMP)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT CASE WHEN row_status = 'hired'
+        THEN COALESCE(GREATEST(EXTRACT(EPOCH FROM updated - applied), 0), 0)
+        ELSE 0 END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 1 for a hire whose time-to-hire is known; hires made before status_updated_at
+-- existed have none and must not pull the average towards zero
+CREATE OR REPLACE FUNCTION application_timed_hire(row_status TEXT, applied TIMESTAMP, updated TIMESTAMP)
+RETURNS INTEGER AS $$
+    SELECT CASE WHEN row_status = 'hired' AND applied IS NOT NULL AND updated IS NOT NULL
+        THEN 1 ELSE 0 END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION sync_application_rollup() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE application_rollup
+        SET total = GREATEST(total - 1, 0),
+            hire_seconds = GREATEST(hire_seconds - application_hire_seconds(OLD.status, OLD.applied_at, OLD.status_updated_at), 0),
+            timed_hires = GREATEST(timed_hires - application_timed_hire(OLD.status, OLD.applied_at, OLD.status_updated_at), 0)
+        WHERE job_id = OLD.job_id AND status = COALESCE(OLD.status, 'pending');
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO application_rollup (job_id, status, total, hire_seconds, timed_hires)
+        VALUES (NEW.job_id, COALESCE(NEW.status, 'pending'), 1,
+                application_hire_seconds(NEW.status, NEW.applied_at, NEW.status_updated_at),
+                application_timed_hire(NEW.status, NEW.applied_at, NEW.status_updated_at))
+        ON CONFLICT (job_id, status) DO UPDATE
+        SET total = application_rollup.total + 1,
+            hire_seconds = application_rollup.hire_seconds + EXCLUDED.hire_seconds,
+            timed_hires = application_rollup.timed_hires + EXCLUDED.timed_hires;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_application_rollup ON job_applications;
+CREATE TRIGGER trg_application_rollup
+    AFTER INSERT OR DELETE OR UPDATE OF status, job_id, status_updated_at ON job_applications
+    FOR EACH ROW EXECUTE FUNCTION sync_application_rollup();
+
+-- Backfill
+TRUNCATE application_rollup;
+INSERT INTO application_rollup (job_id, status, total, hire_seconds, timed_hires)
+SELECT job_id, COALESCE(status, 'pending'), COUNT(*),
+       SUM(application_hire_seconds(status, applied_at, status_updated_at)),
+       SUM(application_timed_hire(status, applied_at, status_updated_at))
+FROM job_applications
+GROUP BY job_id, COALESCE(status, 'pending');
+
+-- One call for the whole dashboard (shape matches routers/Careers.py CareerStats)
+CREATE OR REPLACE FUNCTION career_stats(top_n INTEGER DEFAULT 5) RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_active_jobs', (SELECT COUNT(*) FROM jobs WHERE is_active),
+        'total_applications', (SELECT COALESCE(SUM(total), 0) FROM application_rollup),
+        'applications_by_status', COALESCE((
+            SELECT json_object_agg(status, n) FROM (
+                SELECT status, SUM(total) AS n FROM application_rollup GROUP BY status HAVING SUM(total) > 0
+            ) s), '{}'::json),
+        'department_distribution', COALESCE((
+            SELECT json_object_agg(department, n) FROM (
+                SELECT department, COUNT(*) AS n FROM jobs WHERE is_active GROUP BY department
+            ) d), '{}'::json),
+        -- Days from application to hire, over hires with both timestamps
+        'average_time_to_hire', (
+            SELECT ROUND((SUM(hire_seconds) / NULLIF(SUM(timed_hires), 0) / 86400)::NUMERIC, 2)
+            FROM application_rollup WHERE status = 'hired'),
+        'top_performing_jobs', COALESCE((
+            SELECT json_agg(t) FROM (
+                SELECT r.job_id, j.title, j.department,
+                       SUM(r.total) AS applications,
+                       COALESCE(SUM(r.total) FILTER (WHERE r.status = 'hired'), 0) AS hired
+                FROM application_rollup r JOIN jobs j ON j.id = r.job_id
+                GROUP BY r.job_id, j.title, j.department
+                HAVING SUM(r.total) > 0
+                ORDER BY applications DESC, r.job_id
+                LIMIT top_n
+            ) t), '[]'::json)
+    );
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,5 @@
+-- sql/004_jobs_work_mode.sql
+-- work_mode is part of the JobCreate/JobRead schema and a careers facet.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS work_mode VARCHAR(20) NOT NULL DEFAULT 'remote';
+CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location);
@@ -0,0 +1,6 @@
+-- sql/005_keyset_indexes.sql
+-- Composite indexes backing cursor pagination on (sort column, id) DESC.
+
+CREATE INDEX IF NOT EXISTS idx_projects_created_at_id ON projects(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_inquiries_created_at_id ON inquiries(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_applications_applied_at_id ON job_applications(applied_at DESC, id DESC);
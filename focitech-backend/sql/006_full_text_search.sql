@@ -0,0 +1,53 @@
+-- sql/006_full_text_search.sql
+-- Ranked, prefix-matching full-text search for projects and jobs.
+--
+-- The tsvectors are GIN-indexed expressions over IMMUTABLE helper functions
+-- rather than stored generated columns, so `select=*` responses do not start
+-- shipping a tsvector column to every client. The search functions use the
+-- exact same expressions, which is what lets the planner use the indexes.
+
+-- "reac nat" -> 'reac':* & 'nat':*  (input is reduced to alphanumeric words first)
+CREATE OR REPLACE FUNCTION prefix_tsquery(q TEXT) RETURNS tsquery AS $$
+    SELECT to_tsquery('english', string_agg(word || ':*', ' & '))
+    FROM unnest(regexp_split_to_array(
+        trim(regexp_replace(lower(coalesce(q, '')), '[^[:alnum:]]+', ' ', 'g')), '\s+'
+    )) AS word
+    WHERE word <> '';
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION project_search_vector(title TEXT, description TEXT, tech_stack TEXT[])
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(array_to_string(tech_stack, ' '), '')), 'B')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION job_search_vector(title TEXT, department TEXT, location TEXT, description TEXT, requirements TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(department, '') || ' ' || coalesce(location, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(requirements, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE INDEX IF NOT EXISTS idx_projects_search
+    ON projects USING GIN (project_search_vector(title, description, tech_stack));
+CREATE INDEX IF NOT EXISTS idx_jobs_search
+    ON jobs USING GIN (job_search_vector(title, department, location, description, requirements));
+
+-- Called as GET /rest/v1/rpc/search_projects?q=... ; returning SETOF keeps
+-- PostgREST filters, select lists and embedding available on the result.
+CREATE OR REPLACE FUNCTION search_projects(q TEXT) RETURNS SETOF projects AS $$
+    SELECT p.*
+    FROM projects p, prefix_tsquery(q) query
+    WHERE project_search_vector(p.title, p.description, p.tech_stack) @@ query
+    ORDER BY ts_rank_cd(project_search_vector(p.title, p.description, p.tech_stack), query) DESC,
+             p.created_at DESC, p.id DESC;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION search_jobs(q TEXT) RETURNS SETOF jobs AS $$
+    SELECT j.*
+    FROM jobs j, prefix_tsquery(q) query
+    WHERE job_search_vector(j.title, j.department, j.location, j.description, j.requirements) @@ query
+    ORDER BY ts_rank_cd(job_search_vector(j.title, j.department, j.location, j.description, j.requirements), query) DESC,
+             j.created_at DESC, j.id DESC;
+$$ LANGUAGE sql STABLE;
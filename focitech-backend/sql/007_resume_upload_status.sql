@@ -0,0 +1,13 @@
+-- sql/007_resume_upload_status.sql
+-- Background resume uploads (RESUME_UPLOAD_MODE=async): the application row
+-- is written before the file reaches storage, so resume_url starts empty and
+-- resume_status tracks the upload.
+
+ALTER TABLE job_applications ADD COLUMN IF NOT EXISTS resume_url TEXT;
+ALTER TABLE job_applications
+    ADD COLUMN IF NOT EXISTS resume_status VARCHAR(20) NOT NULL DEFAULT 'uploaded'
+    CHECK (resume_status IN ('pending', 'uploaded', 'failed'));
+
+-- Admin view of stuck uploads stays cheap
+CREATE INDEX IF NOT EXISTS idx_job_applications_resume_pending
+    ON job_applications(applied_at) WHERE resume_status <> 'uploaded';
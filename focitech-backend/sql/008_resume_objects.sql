@@ -0,0 +1,12 @@
+-- sql/008_resume_objects.sql
+-- Content-addressed resumes: one stored object per distinct file, looked up by
+-- SHA-256 before uploading so repeat applications skip the storage upload.
+
+CREATE TABLE IF NOT EXISTS resume_objects (
+    sha256 CHAR(64) PRIMARY KEY,
+    storage_path TEXT NOT NULL,
+    public_url TEXT NOT NULL,
+    size_bytes BIGINT NOT NULL,
+    content_type VARCHAR(100),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
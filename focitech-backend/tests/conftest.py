@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time, so configure the environment before any `core` import
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-secret")
+os.environ.setdefault("TASK_QUEUE_PATH", str(Path(tempfile.mkdtemp()) / "tasks.sqlite3"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
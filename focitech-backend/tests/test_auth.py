@@ -0,0 +1,92 @@
+import asyncio
+import importlib
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from core.config import settings
+from core.session_cache import SessionCache, resolve_user, revoke_session, session_cache
+from core.tokens import AuthenticatedUser, TokenVerificationError
+
+# routers/__init__.py re-exports `auth` as the APIRouter itself
+auth = importlib.import_module("routers.auth")
+
+
+def make_client():
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/auth")
+    return TestClient(app)
+
+
+def make_token(sub: str = "user-1", ttl: int = 3600) -> str:
+    claims = {"sub": sub, "email": f"{sub}@example.com", "aud": settings.SUPABASE_JWT_AUDIENCE,
+              "exp": int(time.time()) + ttl}
+    return jwt.encode(claims, settings.SUPABASE_JWT_SECRET, algorithm="HS256")
+
+
+def test_logout_without_supabase_still_revokes_locally(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", "")
+    token = make_token("logout-local")
+    response = make_client().post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert session_cache.is_revoked(token)
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(resolve_user(token))
+
+
+def test_logout_succeeds_when_remote_sign_out_fails(monkeypatch):
+    def broken():
+        raise RuntimeError("auth upstream down")
+
+    class FakeClient:
+        class auth:
+            sign_out = staticmethod(broken)
+
+    monkeypatch.setattr(auth, "get_supabase", lambda: FakeClient)
+    response = make_client().post("/auth/logout")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Successfully logged out"}
+
+
+def test_junk_tokens_cannot_push_out_real_revocations():
+    token = make_token("flooded")
+
+    async def scenario():
+        assert await revoke_session(token)
+        results = await asyncio.gather(*(revoke_session(f"junk.{n}.token") for n in range(2100)))
+        assert not any(results)
+
+    asyncio.run(scenario())
+    assert session_cache.is_revoked(token)
+    assert session_cache.stats()["revoked"] < 2048
+
+
+def test_revocations_leave_only_when_they_expire():
+    cache = SessionCache(max_entries=2, expiry_skew=0, default_ttl=300)
+    now = time.time()
+    for n in range(5):
+        cache.revoke(f"token-{n}", AuthenticatedUser(id=str(n), email=None, role="authenticated",
+                                                    expires_at=int(now) + 3600))
+    assert all(cache.is_revoked(f"token-{n}") for n in range(5))
+
+    cache.revoke("short", AuthenticatedUser(id="s", email=None, role="authenticated", expires_at=int(now) + 1))
+    assert cache.stats()["revoked"] == 6
+    cache._prune_revoked(now + 2)
+    assert not cache.is_revoked("short")
+    assert cache.stats()["revoked"] == 5
+
+
+def test_me_does_not_report_token_issue_time_as_account_creation():
+    token = make_token("me-no-iat")
+    client = make_client()
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["created_at"] is None
+
+    issued = int(time.time())
+    user = AuthenticatedUser.from_claims({**jwt.get_unverified_claims(token), "iat": issued})
+    assert user.issued_at == issued
+    assert user.created_at is None
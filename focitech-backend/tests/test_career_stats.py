@@ -0,0 +1,31 @@
+from core.career_stats import CareerStatsRollup
+
+
+def snapshot():
+    return {
+        "total_applications": 3,
+        "applications_by_status": {"pending": 3},
+        "top_performing_jobs": [
+            {"job_id": 1, "title": "Engineer", "department": "Engineering", "applications": 3, "hired": 0},
+        ],
+    }
+
+
+def test_new_top_job_entry_carries_department():
+    rollup = CareerStatsRollup(ttl=60, top_n=5)
+    rollup.load(snapshot(), "rpc")
+    rollup.record_application(2, "Designer", "Design")
+    top = rollup.get()["top_performing_jobs"]
+    assert top[1] == {"job_id": 2, "title": "Designer", "department": "Design", "applications": 1, "hired": 0}
+    assert all(set(entry) == set(top[0]) for entry in top)
+
+
+def test_job_of_unknown_department_waits_for_reload():
+    rollup = CareerStatsRollup(ttl=60, top_n=5)
+    rollup.load(snapshot(), "rpc")
+    rollup.record_application(2, "Designer", None)
+    rollup.record_application(1, "Engineer", None)
+    stats = rollup.get()
+    assert [job["job_id"] for job in stats["top_performing_jobs"]] == [1]
+    assert stats["top_performing_jobs"][0]["applications"] == 4
+    assert stats["total_applications"] == 5
@@ -0,0 +1,102 @@
+"""career_stats() (sql/003 rollup) against legacy_career_stats() on a real PostgreSQL."""
+import asyncio
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pgserver = pytest.importorskip("pgserver")
+psycopg2 = pytest.importorskip("psycopg2")
+
+from core import career_stats  # noqa: E402
+
+SQL_DIR = Path(__file__).resolve().parent.parent / "sql"
+
+
+@pytest.fixture(scope="module")
+def conn():
+    server = pgserver.get_server(tempfile.mkdtemp(), cleanup_mode="stop")
+    connection = psycopg2.connect(server.get_uri())
+    connection.autocommit = True
+    with connection.cursor() as cur:
+        for name in ("001_jobs_and_applications.sql", "003_career_stats_rollup.sql"):
+            cur.execute((SQL_DIR / name).read_text())
+    yield connection
+    connection.close()
+    server.cleanup()
+
+
+class SQLQuery:
+    """Just enough of the repository Query for legacy_career_stats()."""
+
+    def __init__(self, conn, table):
+        self.conn, self.table, self.columns, self.filters = conn, table, "*", []
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    async def execute(self):
+        where = " AND ".join(f"{column} = %s" for column, _ in self.filters) or "TRUE"
+        with self.conn.cursor() as cur:
+            cur.execute(f"SELECT {self.columns} FROM {self.table} WHERE {where}", [v for _, v in self.filters])
+            names = [d[0] for d in cur.description]
+            rows = [dict(zip(names, row)) for row in cur.fetchall()]
+        for row in rows:
+            for key, value in row.items():
+                if isinstance(value, datetime):
+                    row[key] = value.isoformat()
+        return SimpleNamespace(data=rows)
+
+
+def add_job(cur, title, department):
+    cur.execute(
+        "INSERT INTO jobs (title, department, location, job_type, experience_required, description, requirements)"
+        " VALUES (%s, %s, 'Remote', 'Full-time', '2 years', 'd', 'r') RETURNING id",
+        (title, department),
+    )
+    return cur.fetchone()[0]
+
+
+def add_application(cur, job_id, title, status, applied, decided=None):
+    cur.execute(
+        "INSERT INTO job_applications (name, email, job_id, job_title, status, applied_at, status_updated_at)"
+        " VALUES ('A', 'a@example.com', %s, %s, %s, %s, %s) RETURNING id",
+        (job_id, title, status, applied, decided),
+    )
+    return cur.fetchone()[0]
+
+
+def test_rollup_and_legacy_scan_agree_on_time_to_hire(conn, monkeypatch):
+    base = datetime(2026, 1, 1)
+    with conn.cursor() as cur:
+        engineer = add_job(cur, "Engineer", "Engineering")
+        designer = add_job(cur, "Designer", "Design")
+        # Hires from before status_updated_at existed: no time-to-hire
+        add_application(cur, engineer, "Engineer", "hired", base)
+        add_application(cur, designer, "Designer", "hired", base)
+        add_application(cur, engineer, "Engineer", "hired", base, base + timedelta(days=10))
+        add_application(cur, engineer, "Engineer", "pending", base)
+        promoted = add_application(cur, designer, "Designer", "reviewing", base)
+        cur.execute("UPDATE job_applications SET status = 'hired', status_updated_at = %s WHERE id = %s",
+                    (base + timedelta(days=5), promoted))
+        cur.execute("SELECT career_stats(5)")
+        rollup = cur.fetchone()[0]
+    rollup = rollup if isinstance(rollup, dict) else json.loads(rollup)
+
+    monkeypatch.setattr(career_stats, "db", SimpleNamespace(table=lambda name: SQLQuery(conn, name)))
+    legacy = asyncio.run(career_stats.legacy_career_stats())
+
+    assert legacy["average_time_to_hire"] == 7.5
+    assert float(rollup["average_time_to_hire"]) == legacy["average_time_to_hire"]
+    for key in ("total_active_jobs", "total_applications", "applications_by_status", "department_distribution"):
+        assert rollup[key] == legacy[key], key
+    strip = lambda jobs: [{k: j[k] for k in ("job_id", "department", "applications", "hired")} for j in jobs]
+    assert strip(rollup["top_performing_jobs"]) == strip(legacy["top_performing_jobs"])
@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+from core.export import _encode
+
+
+async def failing_pages():
+    yield [{"id": 2, "name": "b"}]
+    raise RuntimeError("connection reset")
+
+
+async def good_pages():
+    yield [{"id": 2, "name": "b"}]
+    yield [{"id": 1, "name": "a"}]
+
+
+def collect(fmt, pages):
+    chunks = []
+
+    async def run():
+        async for chunk in _encode(fmt, pages):
+            chunks.append(chunk)
+
+    return chunks, run
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_mid_stream_failure_aborts_the_body(fmt):
+    chunks, run = collect(fmt, failing_pages())
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    body = "".join(chunks)
+    assert body
+    if fmt == "json":
+        assert not body.rstrip().endswith("]")
+        with pytest.raises(ValueError):
+            json.loads(body)
+
+
+def test_complete_json_export_is_closed():
+    chunks, run = collect("json", good_pages())
+    asyncio.run(run())
+    assert [row["id"] for row in json.loads("".join(chunks))] == [2, 1]
@@ -0,0 +1,55 @@
+import asyncio
+
+from starlette.requests import Request
+
+from core import idempotency
+from core.config import settings
+from core.idempotency import IdempotencyStore, REPLAY_HEADER, idempotency_key
+
+
+def make_request(headers=None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": raw})
+
+
+def submit(store, key, calls):
+    async def work():
+        calls.append(key)
+        return {"status": "success"}
+    return asyncio.run(store.run(key, work, 201))
+
+
+def test_contact_messages_with_same_subject_are_not_replayed():
+    store, calls = IdempotencyStore(100, 1), []
+    first = idempotency_key(make_request(), "contact", "a@x.io", "New Project Inquiry", "Need a website")
+    second = idempotency_key(make_request(), "contact", "a@x.io", "New Project Inquiry", "Also an app")
+    submit(store, first, calls)
+    response = submit(store, second, calls)
+    assert len(calls) == 2
+    assert not hasattr(response, "headers")
+
+
+def test_retry_across_a_clock_boundary_is_replayed(monkeypatch):
+    store, calls = IdempotencyStore(100, 1), []
+    window = settings.IDEMPOTENCY_WINDOW
+    # Original just before a multiple of the window, retry just after it
+    clock = [window * 1000 - 1.0]
+    monkeypatch.setattr(idempotency.time, "time", lambda: clock[0])
+    key = idempotency_key(make_request(), "contact", "a@x.io", "Hello", "Same message")
+    submit(store, key, calls)
+
+    clock[0] += 2
+    retry = idempotency_key(make_request(), "contact", "a@x.io", "Hello", "Same message")
+    response = submit(store, retry, calls)
+    assert len(calls) == 1
+    assert response.headers[REPLAY_HEADER] == "true"
+
+    # Past the window the same content counts as a new submission
+    clock[0] += window
+    submit(store, idempotency_key(make_request(), "contact", "a@x.io", "Hello", "Same message"), calls)
+    assert len(calls) == 2
+
+
+def test_client_key_uses_long_ttl():
+    key = idempotency_key(make_request({"Idempotency-Key": "abc"}), "contact", "a@x.io")
+    assert key.ttl == settings.IDEMPOTENCY_TTL
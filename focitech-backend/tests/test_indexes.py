@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+from core import reloadable_index
+from core.facets import FacetIndex
+from core.suggest import SuggestIndex
+
+JOBS = [
+    {"id": 1, "title": "Backend Engineer", "department": "Engineering", "is_active": True},
+    {"id": 2, "title": "Product Designer", "department": "Design", "is_active": True},
+    {"id": 3, "title": "Data Engineer", "department": "Engineering", "is_active": True},
+]
+
+
+class FakeQuery:
+    def __init__(self, rows, calls):
+        self.rows, self.calls = rows, calls
+
+    def select(self, columns):
+        self.calls.append(columns)
+        return self
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row.get(column) == value]
+        return self
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        return SimpleNamespace(data=list(self.rows))
+
+
+def fake_db(monkeypatch, rows):
+    calls = []
+    monkeypatch.setattr(reloadable_index, "db", SimpleNamespace(table=lambda name: FakeQuery(rows, calls)))
+    return calls
+
+
+def test_indexes_reload_once_for_concurrent_readers(monkeypatch):
+    calls = fake_db(monkeypatch, JOBS)
+    facets = FacetIndex("jobs", ("department",), refresh_seconds=60)
+    suggest = SuggestIndex("jobs", {"title": "title"}, refresh_seconds=60, active_only=True)
+
+    async def readers():
+        await asyncio.gather(*(index.ensure() for index in (facets, suggest) for _ in range(5)))
+
+    asyncio.run(readers())
+    assert calls == ["id, department, is_active", "id, title, is_active"]
+    assert facets.ranked("department")[0] == {"value": "Engineering", "count": 2}
+    assert [hit["text"] for hit in suggest.suggest("eng")] == ["Backend Engineer", "Data Engineer"]
+    assert facets.stats()["documents"] == suggest.stats()["documents"] == 3
+
+
+def test_upsert_and_remove_share_active_only_rules():
+    for index in (FacetIndex("jobs", ("department",), 60), SuggestIndex("jobs", {"department": "department"}, 60, True)):
+        index.rebuild(JOBS)
+        index.upsert({**JOBS[1], "is_active": False})
+        index.remove(3)
+        stats = index.stats()
+        assert stats["documents"] == 1 and stats["reloads"] == 1
+    assert FacetIndex("jobs", ("department",), 60).stale
@@ -0,0 +1,125 @@
+import asyncio
+import smtplib
+import socket
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from core import notifications  # noqa: E402
+from core.config import settings  # noqa: E402
+from core.mailer import Mailer, SMTPPool, build_message  # noqa: E402
+
+
+class Sink:
+    """Records delivered messages per client connection; can hang up after N messages."""
+
+    def __init__(self):
+        self.received = []
+        self.hang_up_after = None
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        delivered = sum(1 for peer, _ in self.received if peer == session.peer)
+        if self.hang_up_after is not None and delivered >= self.hang_up_after:
+            server.transport.close()
+            return "421 closing connection"
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.append((session.peer, envelope.content.decode()))
+        return "250 Message accepted"
+
+    def sessions(self):
+        return len({peer for peer, _ in self.received})
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    sink = Sink()
+    controller = Controller(sink, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield sink, controller
+    controller.stop()
+
+
+def make_pool(port: int, max_messages: int = 100) -> SMTPPool:
+    return SMTPPool("127.0.0.1", port, "", "", starttls=False, use_ssl=False, timeout=5,
+                    size=1, idle_seconds=60, max_messages=max_messages)
+
+
+def messages(count: int, start: int = 0):
+    return [build_message([f"user{i}@example.com"], f"Message {i}", "Hello") for i in range(start, start + count)]
+
+
+def test_batches_reuse_one_connection(smtp_server):
+    sink, controller = smtp_server
+    pool = make_pool(controller.port)
+    assert pool.send_batch(messages(3)) == 3
+    assert pool.send_batch(messages(2, start=3)) == 2
+    pool.close()
+
+    assert len(sink.received) == 5
+    assert sink.sessions() == 1
+    assert pool.stats() == {"idle": 0, "opened": 1, "reused": 1, "sent": 5, "refused": 0}
+
+
+def test_connection_recycled_after_max_messages(smtp_server):
+    sink, controller = smtp_server
+    pool = make_pool(controller.port, max_messages=2)
+    assert pool.send_batch(messages(5)) == 5
+    pool.close()
+    assert sink.sessions() == 3
+
+
+def test_dropped_connection_reconnects_once_without_resending(smtp_server):
+    sink, controller = smtp_server
+    sink.hang_up_after = 2
+    pool = make_pool(controller.port)
+    assert pool.send_batch(messages(3)) == 3
+    pool.close()
+
+    subjects = [content.split("Subject: ")[1].split("\n")[0].strip() for _, content in sink.received]
+    assert subjects == ["Message 0", "Message 1", "Message 2"]
+    assert pool.opened == 2
+
+
+def test_batch_fails_when_server_is_gone():
+    controller = Controller(Sink(), hostname="127.0.0.1", port=free_port())
+    controller.start()
+    pool = make_pool(controller.port)
+    assert pool.send_batch(messages(1)) == 1
+    controller.stop()
+    with pytest.raises((smtplib.SMTPException, OSError)):
+        pool.send_batch(messages(2, start=1))
+    # The broken session is discarded, not handed back to the pool
+    assert pool.stats()["idle"] == 0
+    assert pool.sent == 1
+
+
+def test_digest_is_mailed_over_smtp(smtp_server, tmp_path, monkeypatch):
+    from core.task_queue import SQLiteTaskBackend
+
+    sink, controller = smtp_server
+    backend = SQLiteTaskBackend(tmp_path / "tasks.sqlite3")
+    monkeypatch.setattr(notifications, "task_backend", backend)
+    monkeypatch.setattr(notifications, "mailer", Mailer(make_pool(controller.port)))
+    monkeypatch.setattr(settings, "NOTIFY_ADMIN_EMAILS", "ops@example.com,hr@example.com")
+    for n in range(4):
+        backend.add_to_batch("admin_digest", {"kind": "inquiry", "line": f"NEW INQUIRY {n}"},
+                             "notify.digest", delay=0, max_attempts=3)
+
+    asyncio.run(notifications.send_admin_digest({"batch": "admin_digest"}))
+    notifications.mailer.close()
+
+    [(_, content)] = sink.received
+    assert "Subject: Focitech digest: 4 new events" in content
+    assert "New inquiries (4):" in content
+    assert backend.batch_items("admin_digest") == []
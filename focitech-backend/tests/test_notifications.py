@@ -0,0 +1,96 @@
+import asyncio
+import sqlite3
+
+from core import notifications
+from core.config import settings
+
+
+def test_status_change_queues_one_job_per_applicant(monkeypatch):
+    queued = []
+
+    async def fake_enqueue(name, payload, delay=0):
+        queued.append((name, payload))
+
+    monkeypatch.setattr(notifications, "enqueue", fake_enqueue)
+    monkeypatch.setattr(settings, "APPLICANT_STATUS_EMAILS", "shortlisted")
+    rows = [
+        {"id": 1, "name": "Asha", "email": "asha@example.com", "job_title": "Engineer"},
+        {"id": 2, "name": "Ravi", "email": "", "job_title": "Engineer"},
+        {"id": 3, "name": "Meera", "email": "meera@example.com", "job_title": "Designer"},
+    ]
+    asyncio.run(notifications.notify_applicants("shortlisted", rows))
+    assert [(name, payload["applicant"]["id"]) for name, payload in queued] == [
+        ("application.status_changed", 1),
+        ("application.status_changed", 3),
+    ]
+
+    queued.clear()
+    asyncio.run(notifications.notify_applicants("reviewing", rows))
+    assert queued == []
+
+
+def test_digest_lines_are_stored_in_the_queue_and_sent_once(tmp_path, monkeypatch):
+    from core.task_queue import SQLiteTaskBackend
+
+    backend = SQLiteTaskBackend(tmp_path / "tasks.sqlite3")
+    monkeypatch.setattr(notifications, "task_backend", backend)
+    monkeypatch.setattr("core.task_queue.task_backend", backend)
+    monkeypatch.setattr(settings, "NOTIFY_ADMIN_EMAILS", "ops@example.com")
+    monkeypatch.setattr(settings, "NOTIFY_DIGEST_SECONDS", 300)
+    sent = []
+
+    async def fake_send(messages):
+        sent.extend(messages)
+        return len(messages)
+
+    monkeypatch.setattr(notifications.mailer, "send", fake_send)
+
+    async def scenario():
+        await notifications.notify_admin_of_inquiry({"name": "Asha", "email": "a@x.io", "subject": "Hi"})
+        await notifications.notify_hr_of_application(
+            {"application_id": 7, "name": "Ravi", "email": "r@x.io", "job_title": "Engineer"})
+        await notifications.notify_admin_of_inquiry({"name": "Meera", "email": "m@x.io"})
+
+    asyncio.run(scenario())
+    # Nothing mailed yet; one delayed digest job for all three lines
+    assert sent == []
+    stats = backend.stats()
+    assert stats["queued"] == 1 and stats["batched"] == {"admin_digest": 3}
+    assert backend.claim("w", 10, 60) == []
+
+    with sqlite3.connect(backend.path) as conn:
+        conn.execute("UPDATE tasks SET run_at = 0")
+    [job] = backend.claim("w", 10, 60)
+    assert job.name == "notify.digest"
+
+    asyncio.run(notifications.send_admin_digest(job.payload))
+    assert len(sent) == 1
+    assert sent[0]["Subject"] == "Focitech digest: 3 new events"
+    assert "NEW APPLICATION #7" in sent[0].get_content()
+    assert backend.stats()["batched"] == {}
+
+
+def test_crlf_in_user_text_does_not_break_alert_headers(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFY_ADMIN_EMAILS", "ops@example.com")
+    monkeypatch.setattr(settings, "NOTIFY_DIGEST_SECONDS", 0)
+    sent = []
+
+    async def fake_send(messages):
+        sent.extend(messages)
+        return len(messages)
+
+    monkeypatch.setattr(notifications.mailer, "send", fake_send)
+
+    async def scenario():
+        await notifications.notify_admin_of_inquiry(
+            {"name": "Asha", "email": "a@x.io", "subject": "Quote\r\nBcc: victim@example.com\r\n\r\nhi"})
+        await notifications.notify_hr_of_application(
+            {"application_id": 9, "name": "Ravi", "email": "r@x.io", "job_title": "Engineer\n" + "x" * 400})
+
+    asyncio.run(scenario())
+    inquiry, application = sent
+    assert inquiry["Subject"] == "New inquiry: Quote Bcc: victim@example.com hi"
+    assert inquiry["Bcc"] is None
+    assert "\n" not in application["Subject"]
+    assert len(application["Subject"]) <= 150
+    assert application.as_string()
@@ -0,0 +1,58 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from core.uploads import RequestSizeLimit
+
+LIMIT = 64 * 1024
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimit, max_bytes=LIMIT)
+    app.state.handled = 0
+
+    @app.post("/upload")
+    async def upload(resume: UploadFile = File(...)):
+        app.state.handled += 1
+        return {"size": len(await resume.read())}
+
+    return app, TestClient(app)
+
+
+def multipart(size: int):
+    boundary = "x" * 16
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"resume\"; filename=\"cv.pdf\"\r\n"
+            "Content-Type: application/pdf\r\n\r\n").encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    body = head + b"%PDF-" + b"a" * (size - 5) + tail
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def chunks(body: bytes, size: int = 8192):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def test_declared_length_over_cap_is_rejected_up_front():
+    app, client = make_client()
+    body, headers = multipart(LIMIT * 2)
+    response = client.post("/upload", content=body, headers=headers)
+    assert response.status_code == 413
+    assert app.state.handled == 0
+
+
+def test_chunked_body_over_cap_is_rejected_while_streaming():
+    app, client = make_client()
+    body, headers = multipart(LIMIT * 2)
+    response = client.post("/upload", content=chunks(body), headers=headers)
+    assert response.status_code == 413
+    assert response.json() == {"detail": f"Request body exceeds {LIMIT} bytes."}
+    assert app.state.handled == 0
+
+
+def test_chunked_body_under_cap_passes():
+    app, client = make_client()
+    body, headers = multipart(LIMIT // 2)
+    response = client.post("/upload", content=chunks(body), headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"size": LIMIT // 2}
@@ -0,0 +1,80 @@
+import asyncio
+import tempfile
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from storage3 import SyncStorageClient
+from storage3.utils import SyncClient
+
+from core import repository
+from core.config import settings
+from core.supabase import http_clients
+
+PDF = b"%PDF-1.4\n" + b"0" * 8192
+OBJECT_PATH = "applications/ab/ab12.pdf"
+
+
+def spooled_upload(rolled: bool) -> tempfile.SpooledTemporaryFile:
+    """What Starlette hands us for a multipart part: in memory, or rolled to disk."""
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(PDF)
+    if rolled:
+        spool.rollover()
+    spool.seek(0)
+    return spool
+
+
+@pytest.mark.parametrize("rolled", [False, True], ids=["in-memory", "on-disk"])
+def test_threadpool_backend_uploads_spooled_file(monkeypatch, rolled):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        requests.append(request)
+        return httpx.Response(200, json={"Key": f"resumes/{OBJECT_PATH}"})
+
+    class RecordingStorage(SyncStorageClient):
+        def _create_session(self, base_url, headers, timeout, verify=True):
+            return SyncClient(base_url=base_url, headers=headers, transport=httpx.MockTransport(handler))
+
+    storage = RecordingStorage("https://example.supabase.co/storage/v1", {})
+    monkeypatch.setattr(settings, "DATA_BACKEND", "threadpool")
+    monkeypatch.setattr(repository, "_sync_client", lambda: SimpleNamespace(storage=storage))
+
+    asyncio.run(repository.db.storage("resumes").upload(
+        path=OBJECT_PATH, file=spooled_upload(rolled), content_type="application/pdf", size=len(PDF), upsert=True,
+    ))
+
+    assert len(requests) == 1
+    assert requests[0].url.path.endswith(f"/object/resumes/{OBJECT_PATH}")
+    assert PDF in requests[0].content
+
+
+@pytest.mark.parametrize("rolled", [False, True], ids=["in-memory", "on-disk"])
+def test_async_backend_streams_spooled_file(monkeypatch, rolled):
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        requests.append(request)
+        return httpx.Response(200, json={"Key": f"resumes/{OBJECT_PATH}"})
+
+    async def upload():
+        client = httpx.AsyncClient(base_url="https://example.supabase.co", transport=httpx.MockTransport(handler))
+        monkeypatch.setitem(http_clients, "storage", client)
+        try:
+            await repository.db.storage("resumes").upload(
+                path=OBJECT_PATH, file=spooled_upload(rolled), content_type="application/pdf",
+                size=len(PDF), upsert=True,
+            )
+        finally:
+            await client.aclose()
+
+    monkeypatch.setattr(settings, "DATA_BACKEND", "async")
+    asyncio.run(upload())
+
+    assert len(requests) == 1
+    assert requests[0].url.path == f"/storage/v1/object/resumes/{OBJECT_PATH}"
+    assert requests[0].headers["x-upsert"] == "true"
+    assert requests[0].content == PDF
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from core.task_queue import SQLiteTaskBackend, TASK_HANDLERS, TaskWorker
+
+
+def make_backend(tmp_path):
+    return SQLiteTaskBackend(tmp_path / "tasks.sqlite3")
+
+
+def test_stale_claim_cannot_finish_a_reclaimed_job(tmp_path):
+    backend = make_backend(tmp_path)
+    backend.push("demo", {"n": 1}, max_attempts=3)
+    [stale] = backend.claim("worker-a", 1, lease_seconds=-1)  # lease already over
+    [fresh] = backend.claim("worker-b", 1, lease_seconds=60)
+    assert fresh.id == stale.id and fresh.attempts == 2
+
+    assert not backend.complete(stale)
+    assert not backend.fail(stale, "boom", retry_in=None)
+    assert not backend.release(stale)
+    assert not backend.extend(stale, 60)
+    assert backend.stats()["running"] == 1
+
+    assert backend.complete(fresh)
+    assert backend.stats()["running"] == 0
+
+
+def test_same_worker_old_claim_is_told_apart_by_attempt(tmp_path):
+    backend = make_backend(tmp_path)
+    backend.push("demo", {}, max_attempts=3)
+    [first] = backend.claim("worker-a", 1, lease_seconds=-1)
+    [second] = backend.claim("worker-a", 1, lease_seconds=60)
+    assert not backend.complete(first)
+    assert backend.complete(second)
+
+
+def test_worker_renews_lease_while_handler_runs(tmp_path, monkeypatch):
+    backend = make_backend(tmp_path)
+    backend.push("slow", {}, max_attempts=3)
+    worker = TaskWorker(backend, concurrency=1, poll_interval=0.05, lease_seconds=0.3, drain_seconds=1)
+
+    async def slow(payload):
+        await asyncio.sleep(0.6)
+        # Lease would have run out twice by now without renewal
+        assert backend.claim("intruder", 1, lease_seconds=60) == []
+
+    monkeypatch.setitem(TASK_HANDLERS, "slow", slow)
+
+    async def run():
+        runner = asyncio.create_task(worker.run())
+        deadline = time.monotonic() + 3
+        while worker.completed + worker.retried == 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        worker.stop()
+        await runner
+
+    asyncio.run(run())
+    assert worker.completed == 1
+    assert backend.stats() == {"backend": "sqlite", "queued": 0, "running": 0, "dead": 0, "batched": {}}
+
+
+def test_failed_job_is_retried_then_dead_lettered(tmp_path):
+    backend = make_backend(tmp_path)
+    backend.push("demo", {}, max_attempts=2)
+    [task] = backend.claim("w", 1, 60)
+    assert backend.fail(task, "first", retry_in=0)
+    [task] = backend.claim("w", 1, 60)
+    assert task.attempts == 2
+    assert backend.fail(task, "second", retry_in=None)
+    [dead] = backend.dead_letters()
+    assert dead["last_error"] == "second"
+    assert backend.requeue_dead() == 1
+
+
+def test_processes_sharing_a_queue_feed_one_batch_job(tmp_path):
+    api, worker = make_backend(tmp_path), make_backend(tmp_path)
+    api.add_to_batch("digest", {"line": 1}, "flush", delay=0, max_attempts=3)
+    worker.add_to_batch("digest", {"line": 2}, "flush", delay=0, max_attempts=3)
+    [job] = api.claim("w", 10, 60)
+    assert job.name == "flush" and job.payload == {"batch": "digest"}
+
+    items = worker.batch_items("digest")
+    assert [item for _, item in items] == [{"line": 1}, {"line": 2}]
+    # A line added while the flush job runs queues the next one
+    api.add_to_batch("digest", {"line": 3}, "flush", delay=0, max_attempts=3)
+    assert api.drop_batch_items("digest", items[-1][0]) == 2
+    assert [item for _, item in api.batch_items("digest")] == [{"line": 3}]
+    assert api.stats()["queued"] == 1
+
+
+def test_job_that_keeps_losing_its_worker_is_dead_lettered(tmp_path):
+    backend = make_backend(tmp_path)
+    backend.push("crashy", {}, max_attempts=2)
+    [first] = backend.claim("w1", 1, lease_seconds=-1)   # worker dies, lease runs out
+    [second] = backend.claim("w2", 1, lease_seconds=-1)  # last attempt, dies again
+    assert (first.attempts, second.attempts) == (1, 2)
+
+    assert backend.claim("w3", 1, lease_seconds=60) == []
+    [dead] = backend.dead_letters()
+    assert dead["attempts"] == 2 and "lease expired" in dead["last_error"]
+    assert backend.stats()["running"] == 0
@@ -0,0 +1,38 @@
+import signal
+import asyncio
+import logging
+
+from core.config import settings
+from core.repository import db
+from core.executor import shutdown_bulkheads
+from core.task_queue import task_worker
+import core.notifications  # noqa: F401  (registers the job handlers)
+
+
+# --- Setup Production Logging ---
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("focitech_api")
+
+
+async def main():
+    """
+    Standalone task worker: `python worker.py` (with TASK_WORKER_EMBEDDED=false on the API).
+    SIGTERM/SIGINT stop claiming new jobs and drain the in-flight ones.
+    """
+    logger.info(f"🛠️ {settings.PROJECT_NAME} task worker booting (queue: {settings.TASK_QUEUE_BACKEND})")
+    await db.connect()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, task_worker.stop)
+    try:
+        await task_worker.run()
+    finally:
+        await db.close()
+        shutdown_bulkheads()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
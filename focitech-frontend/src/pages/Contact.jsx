@@ -12,7 +12,8 @@ const Contact = () => {
     name: '',
     email: '',
     subject: 'New Project Inquiry',
-    message: ''
+    message: '',
+    website: '' // Honeypot: hidden from people, bots fill it in
   });
 
   const [status, setStatus] = useState({ loading: false, success: false, error: null });
@@ -25,7 +26,7 @@ const Contact = () => {
       // Data is sent including the subject field required by your new schema
       await api.post('/contact/', formData);
       setStatus({ loading: false, success: true, error: null });
-      setFormData({ name: '', email: '', subject: 'New Project Inquiry', message: '' });
+      setFormData({ name: '', email: '', subject: 'New Project Inquiry', message: '', website: '' });
       
       // Success state remains for 5 seconds
       setTimeout(() => setStatus(prev => ({ ...prev, success: false })), 5000);
@@ -132,6 +133,12 @@ const Contact = () => {
                   </motion.div>
                 ) : (
                   <form onSubmit={handleSubmit} className="space-y-8">
+                    <input
+                      type="text" name="website" tabIndex={-1} autoComplete="off" aria-hidden="true"
+                      className="absolute -left-[9999px] w-px h-px opacity-0"
+                      value={formData.website}
+                      onChange={(e) => setFormData({...formData, website: e.target.value})}
+                    />
                     <div className="space-y-6">
                       <div className="space-y-3">
                         <label className="text-[10px] font-black text-slate-500 uppercase tracking-[0.3em] ml-2">Your Name</label>